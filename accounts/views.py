@@ -10,7 +10,7 @@ def register(request):
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
             user = form.save()
-            login(request, user)
+            login(request, user, backend="rentals.auth.ProfileBackend")
             messages.success(request, f"Welcome {user.username}! You’re registered as {user.profile.role}.")
             # Redirect based on role
             if user.profile.role == "LANDLORD":
@@ -46,12 +46,18 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
 
     # WhiteNoise must come RIGHT after SecurityMiddleware
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # (async-capable subclass so ASGI requests stay on the event loop)
+    'rentals.middleware.WhiteNoiseMiddleware',
+
+    # Per-view query/latency metrics and budgets (after WhiteNoise so static files skip it).
+    'rentals.middleware.QueryInstrumentationMiddleware',
 
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Sends read-only views to the read replicas (rentals.routers).
+    'rentals.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -93,6 +99,33 @@ DATABASES = {
 }
 }
 
+# Read replicas: comma-separated host[:port] list, same database name and
+# credentials as the primary. See rentals.routers for what reads go there.
+for i, replica in enumerate(h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()):
+    host, _, port = replica.partition(":")
+    DATABASES[f"replica_{i}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        # Tests run everything against the primary's test database.
+        "TEST": {"MIRROR": "default"},
+    }
+READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["rentals.routers.ReplicaRouter"]
+# Views whose GET/HEAD reads may be served by a replica.
+REPLICA_READ_VIEWS = [
+    "rentals:listings",
+    "rentals:listings_search",
+    "rentals:property_detail",
+    "rentals:export",
+    "rentals:api_properties",
+    "rentals:api_property_detail",
+    "rentals:api_property_availability",
+    "rentals:api_leases",
+]
+# After a write, that client's reads stay on the primary this long (replication lag).
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -130,12 +163,100 @@ DEFAULT_LEASE_MONTHS = int(os.getenv("DEFAULT_LEASE_MONTHS", 12))
 LATE_FEE_PERCENT = int(os.getenv("LATE_FEE_PERCENT", 5))
 PAYMENT_GRACE_DAYS = int(os.getenv("PAYMENT_GRACE_DAYS", 5))
 
+# Per-view query budgets checked by rentals.middleware.QueryInstrumentationMiddleware.
+# Limits: "queries" (count), "duplicates" (repeated statements), "db_ms".
+# "log" only warns; the test suite switches this to "raise".
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "log")
+QUERY_BUDGETS = {
+    "rentals:listings": {"queries": 8, "duplicates": 0},
+    "rentals:listings_search": {"queries": 3, "duplicates": 0},
+    "rentals:property_detail": {"queries": 8, "duplicates": 0},
+    "rentals:applications": {"queries": 8, "duplicates": 0},
+    "rentals:lease_dashboard": {"queries": 8, "duplicates": 0},
+    "rentals:payments": {"queries": 10, "duplicates": 0},
+    "rentals:maintenance_list": {"queries": 8, "duplicates": 0},
+    "rentals:admin_dashboard": {"queries": 6, "duplicates": 0},
+    "rentals:api_properties": {"queries": 3, "duplicates": 0},
+    "rentals:api_property_detail": {"queries": 3, "duplicates": 0},
+    "rentals:api_property_availability": {"queries": 2, "duplicates": 0},
+    "rentals:api_leases": {"queries": 4, "duplicates": 0},
+}
+
+# Admin changelists show the planner's row estimate instead of an exact
+# COUNT(*) once a result is larger than this (Postgres only).
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv("ADMIN_EXACT_COUNT_LIMIT", 10000))
+
+# Keyset pagination for list views (?page_size= is capped at the max).
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", 25))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", 100))
+
+# ProfileBackend loads request.user together with its Profile. ModelBackend
+# stays listed so sessions created before the switch remain valid.
+AUTHENTICATION_BACKENDS = [
+    "rentals.auth.ProfileBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+# Sessions hit the database on every request by default. Set SESSION_ENGINE to
+# "django.contrib.sessions.backends.signed_cookies" (no server-side storage) or
+# "django.contrib.sessions.backends.cached_db" with a shared CACHE_BACKEND
+# (e.g. django.core.cache.backends.redis.RedisCache) to skip that query.
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.db")
+# Backends: django.core.cache.backends.locmem.LocMemCache (per process),
+# ...filebased.FileBasedCache (LOCATION=/var/tmp/rentals-cache, per host) or
+# ...redis.RedisCache (LOCATION=redis://host:6379/0, shared; needs redis-py).
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    },
+    # Property read models (rentals.object_cache); defaults to the same backend.
+    # Entries are keyed by the property's updated_at, so a per-process backend
+    # never serves another worker's stale copy, it just caches less.
+    "objects": {
+        "BACKEND": os.getenv("OBJECT_CACHE_BACKEND", os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")),
+        "LOCATION": os.getenv("OBJECT_CACHE_LOCATION", os.getenv("CACHE_LOCATION", "")),
+        "TIMEOUT": int(os.getenv("OBJECT_CACHE_SECONDS", 600)),
+    },
+}
+# A miss takes a lock so only one worker rebuilds an entry; the others wait
+# up to OBJECT_CACHE_LOCK_WAIT seconds for it before building their own copy.
+OBJECT_CACHE_LOCK_SECONDS = int(os.getenv("OBJECT_CACHE_LOCK_SECONDS", 10))
+OBJECT_CACHE_LOCK_WAIT = float(os.getenv("OBJECT_CACHE_LOCK_WAIT", 2.0))
+
+# Serve listings, property detail and the JSON API from rentals.async_views.
+# rental_portal/asgi.py turns this on; leave it off under WSGI/gunicorn.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "0") == "1"
+
+# Anonymous listings/property pages: Cache-Control max-age for browsers/CDNs,
+# and how long rendered copies stay in the server-side cache.
+PAGE_MAX_AGE = int(os.getenv("PAGE_MAX_AGE", 60))
+PAGE_CACHE_SECONDS = int(os.getenv("PAGE_CACHE_SECONDS", 300))
+
 LOGOUT_REDIRECT_URL = "rentals:listings"
 LOGIN_REDIRECT_URL = "rentals:listings"
 LOGIN_URL = "accounts:login"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Default parallelism of the backfill_image_variants command.
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", 2))
+# Background job queue (rentals.jobs), processed by `manage.py run_jobs`.
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", 4))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+# Retry n waits about base * 2**(n-1) seconds, capped at the max.
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", 10))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", 3600))
+# A job RUNNING for longer than this is assumed orphaned and requeued.
+JOB_LOCK_TIMEOUT = int(os.getenv("JOB_LOCK_TIMEOUT", 600))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", 7))
+# Max parallel storage writes when a property form uploads several images.
+IMAGE_UPLOAD_WORKERS = int(os.getenv("IMAGE_UPLOAD_WORKERS", 4))
+# Deleted properties are purged by a job, this many rows per DELETE/transaction.
+DELETE_CHUNK_SIZE = int(os.getenv("DELETE_CHUNK_SIZE", 1000))
+# Parallel storage deletes for a purged property's image files.
+STORAGE_DELETE_WORKERS = int(os.getenv("STORAGE_DELETE_WORKERS", 8))
     
 
 
@@ -1,41 +1,159 @@
+import json
+
+from django.conf import settings
 from django.contrib import admin
-from .models import Profile, Property, Application, Lease, Payment, MaintenanceTicket
+from django.core.paginator import Paginator
+from django.db import connections
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from .models import Profile, Property, Application, Lease, Payment, MaintenanceTicket, Job
+
+
+def estimated_count(qs):
+    """The Postgres planner's row estimate for qs, or None on other backends."""
+    connection = connections[qs.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = qs.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist paginator for big tables: past ADMIN_EXACT_COUNT_LIMIT rows the
+    planner's estimate is shown instead of running an exact COUNT(*). Smaller
+    (usually filtered) results are still counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is None or estimate < int(getattr(settings, "ADMIN_EXACT_COUNT_LIMIT", 10000)):
+            return super().count
+        return estimate
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    # No second COUNT(*) over the unfiltered table ("x of y selected") and no
+    # per-filter facet counts.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "role")
     list_filter = ("role",)
+    list_select_related = ("user",)
     search_fields = ("user__username", "user__email")
+    autocomplete_fields = ("user",)
 
 
 @admin.register(Property)
 class PropertyAdmin(admin.ModelAdmin):
-    list_display = ("title", "landlord", "monthly_rent", "is_active", "created_at")
+    list_display = ("title", "landlord", "monthly_rent", "is_active", "created_at", "deleted_at")
     list_filter = ("is_active",)
+    list_select_related = ("landlord",)
     search_fields = ("title", "address", "landlord__username")
+    autocomplete_fields = ("landlord",)
 
 
 @admin.register(Application)
-class ApplicationAdmin(admin.ModelAdmin):
+class ApplicationAdmin(LargeTableAdmin):
     list_display = ("rental_property", "tenant", "status", "submitted_at")
     list_filter = ("status",)
+    list_select_related = ("rental_property", "tenant")
     search_fields = ("rental_property__title", "tenant__username")
+    autocomplete_fields = ("rental_property", "tenant")
+    date_hierarchy = "submitted_at"  # application_submitted_idx
+    ordering = ("-submitted_at", "-id")
+
+
+class RecentPaymentsFormSet(BaseInlineFormSet):
+    def get_queryset(self):
+        if not hasattr(self, "_queryset"):
+            # Only the newest rows; the rest are one click away in the Payment changelist.
+            self._queryset = super().get_queryset().order_by("-due_date", "-id")[:PaymentInline.max_rows]
+        return self._queryset
 
 
 class PaymentInline(admin.TabularInline):
     model = Payment
+    formset = RecentPaymentsFormSet
+    max_rows = 24
+    fields = readonly_fields = ("due_date", "amount", "status", "paid_on", "method", "late_fee_applied")
     extra = 0
+    max_num = 0
+    can_delete = False
+    show_change_link = True
+    verbose_name_plural = f"Latest {max_rows} payments"
 
 
 @admin.register(Lease)
-class LeaseAdmin(admin.ModelAdmin):
-    list_display = ("rental_property", "tenant", "start_date", "end_date", "monthly_rent", "is_active")
+class LeaseAdmin(LargeTableAdmin):
+    list_display = ("rental_property", "tenant", "start_date", "end_date", "monthly_rent", "is_active", "auto_renew")
+    list_filter = ("is_active", "auto_renew")
+    list_select_related = ("rental_property", "tenant")
+    search_fields = ("rental_property__title", "tenant__username")
+    autocomplete_fields = ("application", "tenant", "rental_property")
+    readonly_fields = ("all_payments",)
+    date_hierarchy = "start_date"  # lease_start_idx
+    ordering = ("-start_date", "-id")
     inlines = [PaymentInline]
 
+    @admin.display(description="Payments")
+    def all_payments(self, obj):
+        if obj.pk is None:
+            return "-"
+        url = reverse("admin:rentals_payment_changelist")
+        return format_html('<a href="{}?lease__id__exact={}">All payments for this lease</a>', url, obj.pk)
+
+
+@admin.register(Payment)
+class PaymentAdmin(LargeTableAdmin):
+    list_display = ("id", "lease", "due_date", "amount", "status", "paid_on")
+    list_filter = ("status",)
+    list_select_related = ("lease__rental_property", "lease__tenant")
+    # Exact username match: resolved through the user and lease FK indexes
+    # rather than a substring scan over every payment.
+    search_fields = ("=lease__tenant__username",)
+    autocomplete_fields = ("lease",)
+    date_hierarchy = "due_date"  # payment_due_idx
+    ordering = ("-due_date", "-id")
+    sortable_by = ("id", "due_date")
+
 
 @admin.register(MaintenanceTicket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(LargeTableAdmin):
     list_display = ("id", "lease", "title", "status", "created_at")
     list_filter = ("status",)
+    list_select_related = ("lease__rental_property", "lease__tenant")
     search_fields = ("title", "lease__tenant__username")
+    autocomplete_fields = ("lease", "created_by")
+    date_hierarchy = "created_at"  # ticket_created_idx
+    ordering = ("-created_at", "-id")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "run_at", "locked_by", "finished_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", "key")
+    readonly_fields = ("attempts", "locked_at", "locked_by", "last_error", "progress", "created_at", "finished_at")
+    actions = ["retry_now"]
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_now(self, request, queryset):
+        updated = queryset.filter(status="FAILED").update(
+            status="QUEUED", attempts=0, run_at=timezone.now(), finished_at=None,
+        )
+        self.message_user(request, f"{updated} job(s) requeued.")
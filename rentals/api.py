@@ -0,0 +1,183 @@
+"""
+Read-only JSON API (v1) for property listings, detail and vacancy calendars,
+plus the signed-in user's leases with their balances.
+
+Rows are serialized from only()/values() querysets rather than full model
+instances. Both endpoints answer conditional requests: the list validator is
+the global properties version (rentals.versions) and the querystring, so an
+unchanged list costs one primary-key lookup and returns 304. Detail payloads
+come from rentals.object_cache (built from the primary) and are validated by
+the property's updated_at (bumped on image and variant changes too), which
+also keys the cache entry, so a cached one costs that primary-key lookup.
+
+rentals.async_views serves the same property payloads from the async ORM.
+Lease data is per-user, so that endpoint skips the validators and is private.
+"""
+from django.core.exceptions import BadRequest
+from django.core.files.storage import default_storage
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+
+from . import object_cache
+from .conditional import conditional_response, data_version, make_etag
+from .availability import vacancy_calendar
+from .forms import AvailabilityForm, PropertySearchForm
+from .models import LeaseBalance, Property, PropertyImage
+from .pagination import paginate
+from .search import search_properties
+from .views import _scoped_leases
+
+
+API_VERSION = "v1"
+
+LIST_FIELDS = (
+    "id", "title", "address", "monthly_rent", "bedrooms", "bathrooms", "sqft",
+    "cover_image", "image_count", "created_at", "updated_at",
+)
+DETAIL_FIELDS = LIST_FIELDS + ("description",)
+IMAGE_FIELDS = ("id", "image", "variants")
+LEASE_FIELDS = ("id", "start_date", "end_date", "monthly_rent", "security_deposit", "is_active", "auto_renew")
+BALANCE_FIELDS = ("total_scheduled", "paid", "outstanding", "overdue", "late_fees", "next_due_date")
+
+
+def _media_url(name):
+    return default_storage.url(name) if name else None
+
+
+def list_queryset(form):
+    return search_properties(Property.objects.filter(is_active=True), form.cleaned_data)
+
+
+def list_payload(page):
+    # Storage URLs may need the remote backend; async views call this in a thread.
+    base = reverse("rentals:api_properties")
+    results = []
+    for p in page.items:
+        row = {name: getattr(p, name) for name in LIST_FIELDS}
+        row["cover_image"] = _media_url(p.cover_image.name)
+        row["url"] = f"{base}{p.pk}/"
+        results.append(row)
+    return {"results": results, "next": page.next_url}
+
+
+def detail_etag(pk, row):
+    return make_etag(API_VERSION, pk, row["updated_at"].isoformat())
+
+
+def detail_payload(row, images):
+    row["cover_image"] = _media_url(row["cover_image"])
+    row["images"] = [
+        {"id": img["id"], "url": _media_url(img["image"]), "variants": img["variants"]}
+        for img in images
+    ]
+    return row
+
+
+def errors_response(errors):
+    return JsonResponse({"errors": errors}, status=400)
+
+
+def not_found():
+    return JsonResponse({"detail": "Not found."}, status=404)
+
+
+@require_GET
+def property_list(request):
+    form = PropertySearchForm(request.GET)
+    if not form.is_valid():
+        return errors_response(form.errors)
+
+    qs = list_queryset(form)
+    etag, last_modified = data_version(API_VERSION, request.GET.urlencode(), leases=form.filters_availability())
+
+    def build():
+        try:
+            page = paginate(request, qs.only(*LIST_FIELDS))
+        except BadRequest as exc:
+            return errors_response({"cursor": [str(exc)]})
+        return JsonResponse(list_payload(page))
+
+    return conditional_response(request, etag, last_modified, build)
+
+
+def build_payload(pk):
+    """The detail payload of an active property (None otherwise)."""
+    row = Property.objects.filter(pk=pk, is_active=True).values(*DETAIL_FIELDS).first()
+    if row is None:
+        return None
+    return detail_payload(row, PropertyImage.objects.filter(property_id=pk).order_by("pk").values(*IMAGE_FIELDS))
+
+
+def cached_payload(pk):
+    """build_payload(pk), from the object cache."""
+    return object_cache.cached("property_api", pk, lambda: build_payload(pk))
+
+
+async def acached_payload(pk):
+    return await object_cache.acached("property_api", pk, lambda: build_payload(pk))
+
+
+@require_GET
+def property_detail(request, pk):
+    payload = cached_payload(pk)
+    if payload is None:
+        return not_found()
+    return conditional_response(request, detail_etag(pk, payload), payload["updated_at"], lambda: JsonResponse(payload))
+
+
+@require_GET
+def property_availability(request, pk):
+    if not Property.objects.filter(pk=pk, is_active=True).exists():
+        return not_found()
+    form = AvailabilityForm(request.GET)
+    if not form.is_valid():
+        return errors_response(form.errors)
+
+    start, end = form.cleaned_data["start"], form.cleaned_data["end"]
+    stretches = [
+        {"start": s["start"], "end": s["end"], "available": s["lease"] is None}
+        for s in vacancy_calendar(pk, start, end)
+    ]
+    return JsonResponse({"property": pk, "start": start, "end": end, "calendar": stretches})
+
+
+def _balance(lease):
+    try:
+        balance = lease.balance
+    except LeaseBalance.DoesNotExist:
+        return None
+    return {name: getattr(balance, name) for name in BALANCE_FIELDS}
+
+
+@require_GET
+def lease_list(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required."}, status=401)
+
+    qs = (
+        _scoped_leases(request.user)
+        .select_related("balance")
+        .only(
+            *LEASE_FIELDS, "created_at", "tenant__username", "rental_property__title",
+            *(f"balance__{name}" for name in BALANCE_FIELDS),
+        )
+        .order_by("-created_at")
+    )
+    try:
+        page = paginate(request, qs)
+    except BadRequest as exc:
+        return errors_response({"cursor": [str(exc)]})
+
+    results = []
+    for lease in page.items:
+        row = {name: getattr(lease, name) for name in LEASE_FIELDS}
+        row["property"] = {"id": lease.rental_property_id, "title": lease.rental_property.title}
+        row["tenant"] = lease.tenant.username
+        row["balance"] = _balance(lease)
+        results.append(row)
+
+    response = JsonResponse({"results": results, "next": page.next_url})
+    patch_cache_control(response, private=True)
+    return response
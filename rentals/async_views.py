@@ -0,0 +1,100 @@
+"""
+Async versions of the read-heavy public views.
+
+rentals/urls.py routes these instead of their sync counterparts when
+ASYNC_VIEWS is on, which rental_portal/asgi.py does by default. Queries go
+through the async ORM. Template rendering, storage URL resolution (which
+can call out to a remote backend such as Cloudinary) and object cache lookups
+run via sync_to_async, so none of them blocks the event loop; object cache
+waits use asyncio.sleep (object_cache.acached). Responses, caching headers
+and query counts match rentals.views and rentals.api.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import BadRequest
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from . import api
+from .conditional import acache_anonymous_page, aconditional_response, adata_version
+from .forms import PropertySearchForm
+from .models import Property
+from .pagination import apaginate, render_page
+from .search import search_properties
+from .views import (
+    SEARCH_JSON_FIELDS, SEARCH_JSON_LIMIT,
+    acached_detail, detail_version, listing_context, listing_queryset, search_results, with_images,
+)
+
+
+async def listings(request):
+    form = PropertySearchForm(request.GET or None)
+    qs = listing_queryset(form)
+
+    async def version():
+        return await adata_version("listings", request.GET.urlencode(), leases=form.filters_availability())
+
+    async def build():
+        page = await apaginate(request, with_images(qs))
+        return await sync_to_async(render_page)(
+            request, "listings.html", "partials/listing_cards.html", listing_context(form, page),
+        )
+
+    return await acache_anonymous_page(request, version, build)
+
+
+async def listings_search(request):
+    form = PropertySearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    qs = search_properties(Property.objects.filter(is_active=True), form.cleaned_data)
+    rows = [row async for row in qs.values(*SEARCH_JSON_FIELDS)[:SEARCH_JSON_LIMIT].aiterator()]
+    return JsonResponse(await sync_to_async(search_results)(rows))
+
+
+async def property_detail(request, pk):
+    obj = await acached_detail(pk)
+    if obj is None:
+        raise Http404("No Property matches the given query.")
+
+    async def version():
+        return detail_version(pk, obj["updated_at"])
+
+    async def build():
+        return await sync_to_async(render)(request, "property_detail.html", {"property": obj})
+
+    return await acache_anonymous_page(request, version, build)
+
+
+@require_GET
+async def api_property_list(request):
+    form = PropertySearchForm(request.GET)
+    if not form.is_valid():
+        return api.errors_response(form.errors)
+
+    qs = api.list_queryset(form)
+    etag, last_modified = await adata_version(
+        api.API_VERSION, request.GET.urlencode(), leases=form.filters_availability(),
+    )
+
+    async def build():
+        try:
+            page = await apaginate(request, qs.only(*api.LIST_FIELDS))
+        except BadRequest as exc:
+            return api.errors_response({"cursor": [str(exc)]})
+        return JsonResponse(await sync_to_async(api.list_payload)(page))
+
+    return await aconditional_response(request, etag, last_modified, build)
+
+
+@require_GET
+async def api_property_detail(request, pk):
+    payload = await api.acached_payload(pk)
+    if payload is None:
+        return api.not_found()
+
+    async def build():
+        return JsonResponse(payload)
+
+    return await aconditional_response(request, api.detail_etag(pk, payload), payload["updated_at"], build)
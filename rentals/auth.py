@@ -0,0 +1,24 @@
+"""
+Authentication backend that loads the session user and their Profile in one
+query.
+
+role_required, the scoped list views and base.html all read
+request.user.profile.role. With the stock ModelBackend that is a second query
+on every authenticated request; here the profile rides along on the user
+lookup via select_related. The role is read from the same row as the user, so
+a Profile save (e.g. a role change) applies from the next request on, with
+nothing cached that could go stale.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = (
+            get_user_model()._default_manager
+            .select_related("profile")
+            .filter(pk=user_id)
+            .first()
+        )
+        return user if user is not None and self.user_can_authenticate(user) else None
@@ -0,0 +1,99 @@
+"""
+Lease periods as date ranges.
+
+end_date is the lease's last due date, and that payment covers a whole
+month, so a lease occupies its property from start_date up to (not including)
+end_date + 1 month, the day a renewal would start. The database refuses two
+active leases on one property whose occupied ranges overlap (migration 0019):
+- Postgres: an exclusion constraint over (rental_property_id WITH =,
+  daterange(start_date, (end_date + interval '1 month')::date, '[)') WITH &&),
+  backed by a GiST index (btree_gist).
+- SQLite: two triggers with the same check, using date(end_date, '+1 month').
+Writers therefore don't scan for clashes first; they catch IntegrityError.
+
+Reads filter with PeriodOverlaps, which compiles to the constraint's own
+range expression so Postgres can answer them from that GiST index.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError
+from django.db.models import BooleanField, Exists, F, Func, OuterRef, Value
+
+from .models import Lease, add_months
+
+
+OVERLAP_CONSTRAINT = "lease_active_no_overlap"
+
+
+def occupied_until(end_date):
+    """First day a lease with this last due date no longer occupies (a renewal's start)."""
+    return add_months(end_date, 1)
+
+
+class PeriodOverlaps(Func):
+    """True when a lease's occupied range meets the given [start, end] (both days included)."""
+    output_field = BooleanField()
+
+    def __init__(self, start, end):
+        super().__init__(F("start_date"), F("end_date"), Value(start), Value(end))
+
+    def _compile(self, compiler):
+        return [compiler.compile(expression) for expression in self.get_source_expressions()]
+
+    @staticmethod
+    def _join(template, *parts):
+        # Params must follow the order the placeholders appear in the SQL.
+        return template.format(*(sql for sql, _ in parts)), [p for _, params in parts for p in params]
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # SQLite, matching the triggers.
+        lease_start, lease_end, start, end = self._compile(compiler)
+        return self._join("({} <= {} AND date({}, '+1 month') > {})", lease_start, end, lease_end, start)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        lease_start, lease_end, start, end = self._compile(compiler)
+        return self._join(
+            "daterange({}, ({} + interval '1 month')::date, '[)') && daterange({}, {}, '[]')",
+            lease_start, lease_end, start, end,
+        )
+
+
+def overlapping(start, end, qs=None):
+    """Active leases whose period meets [start, end]."""
+    qs = Lease.objects.all() if qs is None else qs
+    return qs.filter(PeriodOverlaps(start, end), is_active=True)
+
+
+def available_between(properties, start, end):
+    """Properties with no active lease anywhere in [start, end]."""
+    leased = overlapping(start, end).filter(rental_property=OuterRef("pk"))
+    return properties.exclude(Exists(leased))
+
+
+def is_overlap_error(exc):
+    return isinstance(exc, IntegrityError) and OVERLAP_CONSTRAINT in str(exc)
+
+
+def vacancy_calendar(property_id, start, end):
+    """
+    Splits [start, end] into consecutive leased and vacant stretches for one
+    property, from a single index-backed query. Active leases never overlap,
+    so walking them in start order is enough.
+    """
+    leases = (
+        overlapping(start, end)
+        .filter(rental_property_id=property_id)
+        .order_by("start_date")
+        .values("pk", "start_date", "end_date")
+    )
+    stretches = []
+    cursor = start
+    for lease in leases:
+        if lease["start_date"] > cursor:
+            stretches.append({"start": cursor, "end": lease["start_date"] - timedelta(days=1), "lease": None})
+        leased_until = min(occupied_until(lease["end_date"]) - timedelta(days=1), end)
+        stretches.append({"start": max(lease["start_date"], start), "end": leased_until, "lease": lease["pk"]})
+        cursor = leased_until + timedelta(days=1)
+    if cursor <= end:
+        stretches.append({"start": cursor, "end": end, "lease": None})
+    return stretches
@@ -0,0 +1,101 @@
+"""
+Per-lease balance summaries.
+
+Each lease has one LeaseBalance row: total scheduled, paid, outstanding,
+overdue, late fees and the next due date. Any write to a lease's payments
+refreshes that lease's row in the same transaction, so "how much does this
+tenant owe" is one row read instead of a SUM over Payment. The payment signals
+below cover single saves and deletes. Code that bypasses signals (bulk_create(),
+queryset.update()) calls refresh() with the lease ids it touched. verify()
+recomputes every lease with one grouped aggregate and reports drift.
+"""
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import DecimalField, F, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+
+from .models import Lease, LeaseBalance, Payment
+
+
+BALANCE_FIELDS = ("total_scheduled", "paid", "outstanding", "overdue", "late_fees", "next_due_date")
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _money(expression, condition=None):
+    return Coalesce(Sum(expression, filter=condition), Value(Decimal("0")), output_field=MONEY)
+
+
+def _aggregates():
+    unpaid = Q(payments__status__in=["DUE", "OVERDUE"])
+    return {
+        "total_scheduled": _money("payments__amount"),
+        "paid": _money("payments__amount", Q(payments__status="PAID")),
+        "outstanding": _money("payments__amount", unpaid),
+        "overdue": _money("payments__amount", Q(payments__status="OVERDUE")),
+        # Schedules charge the lease's monthly rent; anything above it is the late fee.
+        "late_fees": _money(F("payments__amount") - F("monthly_rent"), Q(payments__late_fee_applied=True)),
+        "next_due_date": Min("payments__due_date", filter=unpaid),
+    }
+
+
+def compute(lease_ids=None):
+    """{lease_id: {field: value}} from one grouped aggregate over the leases' payments."""
+    qs = Lease.objects.order_by()
+    if lease_ids is not None:
+        qs = qs.filter(pk__in=list(lease_ids))
+    return {row.pop("pk"): row for row in qs.values("pk").annotate(**_aggregates())}
+
+
+# Joins the caller's transaction; a savepoint would only add two round trips per write.
+@transaction.atomic(savepoint=False)
+def refresh(lease_ids=None):
+    """Rewrites the balance rows of the given leases (all leases when None)."""
+    totals = compute(lease_ids)
+    LeaseBalance.objects.bulk_create(
+        [LeaseBalance(lease_id=pk, **values) for pk, values in totals.items()],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["lease"],
+        update_fields=[*BALANCE_FIELDS, "updated_at"],
+    )
+    return totals
+
+
+def verify(fix=False):
+    """
+    Compares every stored balance with a fresh aggregate. Returns a list of
+    (lease_id, field, stored, actual); with fix=True the drifted rows are rewritten.
+    """
+    actual = compute()
+    stored = {row.pop("lease_id"): row for row in LeaseBalance.objects.values("lease_id", *BALANCE_FIELDS)}
+
+    mismatches = []
+    for lease_id, values in actual.items():
+        current = stored.get(lease_id)
+        for field in BALANCE_FIELDS:
+            have = current[field] if current else None
+            if have != values[field]:
+                mismatches.append((lease_id, field, have, values[field]))
+
+    if fix and mismatches:
+        refresh({lease_id for lease_id, *_ in mismatches})
+    return mismatches
+
+
+def payment_saved(sender, instance, **kwargs):
+    refresh([instance.lease_id])
+
+
+def payment_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting the lease (or its property or tenant) takes the balance row with it.
+    if isinstance(origin, models.Model) and not isinstance(origin, Payment):
+        return
+    if isinstance(origin, models.QuerySet) and origin.model is not Payment:
+        return
+    refresh([instance.lease_id])
+
+
+post_save.connect(payment_saved, sender=Payment, dispatch_uid="balances_payment_saved")
+post_delete.connect(payment_deleted, sender=Payment, dispatch_uid="balances_payment_deleted")
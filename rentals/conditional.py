@@ -0,0 +1,169 @@
+"""
+Conditional GET and page caching helpers.
+
+Views compute a cheap validator first (a global data version from
+rentals.versions, or one row's updated_at) and only build the real response when the client's If-None-Match /
+If-Modified-Since no longer matches. Otherwise a 304 goes back without running
+the page query, serializing or rendering anything.
+
+cache_anonymous_page() adds a server-side copy of anonymous HTML pages, keyed
+by that validator: a property or image write changes the validator, so pages
+rendered before it are never served again and simply expire.
+
+Each helper has an async twin (a-prefixed) for rentals.async_views.
+"""
+import hashlib
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from . import versions
+
+
+PAGE_CACHE_PREFIX = "rentals:page:"
+# Response headers worth keeping with a cached page body.
+CACHED_HEADERS = ("Content-Type", "X-Next-Url")
+
+
+def make_etag(*parts):
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+    return quote_etag(digest[:32])
+
+
+def _version_names(leases):
+    return (versions.PROPERTIES, versions.LEASES) if leases else (versions.PROPERTIES,)
+
+
+def _version_etag(parts, numbers, leases):
+    # Availability filters default to today, so the answer can change at midnight.
+    return make_etag(*parts, *numbers, *([date.today()] if leases else []))
+
+
+def data_version(*parts, leases=False):
+    """
+    (etag, last_modified) for pages built from property data: the global
+    version plus parts (page name, querystring), and with leases (an
+    availability filter) the leases version and today's date. One indexed
+    lookup, however many properties the page's filters match.
+    """
+    numbers, updated_at = versions.current(*_version_names(leases))
+    return _version_etag(parts, numbers, leases), updated_at
+
+
+async def adata_version(*parts, leases=False):
+    numbers, updated_at = await versions.acurrent(*_version_names(leases))
+    return _version_etag(parts, numbers, leases), updated_at
+
+
+def _timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def _add_validators(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response.headers.setdefault("ETag", etag)
+        if timestamp is not None:
+            response.headers.setdefault("Last-Modified", http_date(timestamp))
+    return response
+
+
+def conditional_response(request, etag, last_modified, build):
+    """
+    Returns a 304 when the validators still match, else build(). Successful
+    responses carry the ETag and Last-Modified headers either way.
+    """
+    timestamp = _timestamp(last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build()
+    return _add_validators(response, etag, timestamp)
+
+
+async def aconditional_response(request, etag, last_modified, build):
+    timestamp = _timestamp(last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = await build()
+    return _add_validators(response, etag, timestamp)
+
+
+def _page_key(etag):
+    return PAGE_CACHE_PREFIX + etag.strip('"')
+
+
+def _from_cache(cached):
+    content, headers = cached
+    return HttpResponse(content, headers=headers)
+
+
+def _cacheable(response):
+    if response.status_code == 200 and not response.streaming:
+        return response.content, {h: response[h] for h in CACHED_HEADERS if h in response}
+    return None
+
+
+def _cached_build(key, build):
+    cached = cache.get(key)
+    if cached is not None:
+        return _from_cache(cached)
+    response = build()
+    entry = _cacheable(response)
+    if entry is not None:
+        cache.set(key, entry, settings.PAGE_CACHE_SECONDS)
+    return response
+
+
+async def _acached_build(key, build):
+    cached = await cache.aget(key)
+    if cached is not None:
+        return _from_cache(cached)
+    response = await build()
+    entry = _cacheable(response)
+    if entry is not None:
+        await cache.aset(key, entry, settings.PAGE_CACHE_SECONDS)
+    return response
+
+
+def _private(response):
+    patch_cache_control(response, private=True)
+    return response
+
+
+def _public(response):
+    if response.status_code in (200, 304):
+        patch_cache_control(response, public=True, max_age=settings.PAGE_MAX_AGE)
+    patch_vary_headers(response, ["Cookie"])
+    return response
+
+
+def cache_anonymous_page(request, version, build):
+    """
+    Serves an HTML page that only depends on the data behind version().
+
+    Anonymous requests get conditional GET, a server-side page cache and
+    public Cache-Control with Vary: Cookie, so a CDN can hold the page but
+    never hands it to a logged-in user. Authenticated pages (nav, role-specific
+    actions) are built every time and marked private.
+    """
+    if request.user.is_authenticated:
+        return _private(build())
+
+    etag, last_modified = version()
+    return _public(conditional_response(
+        request, etag, last_modified, lambda: _cached_build(_page_key(etag), build),
+    ))
+
+
+async def acache_anonymous_page(request, version, build):
+    user = await request.auser()
+    if user.is_authenticated:
+        return _private(await build())
+
+    etag, last_modified = await version()
+    return _public(await aconditional_response(
+        request, etag, last_modified, lambda: _acached_build(_page_key(etag), build),
+    ))
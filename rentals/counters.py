@@ -0,0 +1,169 @@
+"""
+Incrementally maintained dashboard counters.
+
+Each landlord has one DashboardCounter row. Saves and deletes of the counted
+models adjust it through the signal handlers below, so the dashboard reads one
+row instead of running COUNT(*) over five tables. Code that bypasses signals
+(queryset.update(), bulk_create()) calls adjust() itself. reconcile() recomputes
+everything with grouped aggregates and fixes any drift.
+"""
+from types import SimpleNamespace
+
+from django.db import transaction
+from django.db.models import Count, F, Subquery
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from .models import (
+    Application, DashboardCounter, Lease, MaintenanceTicket, Payment, Property,
+)
+
+
+COUNTER_FIELDS = (
+    "total_properties",
+    "pending_applications",
+    "active_leases",
+    "due_payments",
+    "open_tickets",
+)
+
+# model -> (counter field, fields the contribution depends on, contribution)
+COUNTED = {
+    Property: ("total_properties", (), lambda obj: 1),
+    Application: ("pending_applications", ("status",), lambda obj: int(obj.status == "PENDING")),
+    Lease: ("active_leases", ("is_active",), lambda obj: int(obj.is_active)),
+    Payment: ("due_payments", ("status",), lambda obj: int(obj.status in ("DUE", "OVERDUE"))),
+    MaintenanceTicket: ("open_tickets", ("status",), lambda obj: int(obj.status in ("OPEN", "IN_PROGRESS"))),
+}
+
+
+def _landlord_of(instance):
+    # Plain id or a subquery, so resolving the landlord never costs an extra round trip.
+    # Rows of a property being deleted resolve to no landlord: its share was
+    # already taken off when it was soft-deleted (see rentals.deletion).
+    if isinstance(instance, Property):
+        return instance.landlord_id
+    if isinstance(instance, (Application, Lease)):
+        return Subquery(
+            Property.objects.filter(pk=instance.rental_property_id, deleted_at__isnull=True).values("landlord_id")[:1]
+        )
+    return Subquery(
+        Lease.objects.filter(pk=instance.lease_id, rental_property__deleted_at__isnull=True)
+        .values("rental_property__landlord_id")[:1]
+    )
+
+
+def adjust(landlord, **deltas):
+    """Adds deltas (e.g. pending_applications=-1) to a landlord's counters."""
+    changes = {name: F(name) + delta for name, delta in deltas.items() if delta}
+    if changes:
+        DashboardCounter.objects.filter(landlord_id=landlord).update(**changes)
+
+
+def _contribution(instance):
+    # Runs for every loaded row, so keep it to attribute lookups.
+    _, fields, func = COUNTED[type(instance)]
+    if instance.pk is None:
+        # Unsaved. If bulk_create() inserts it, pre_save later loads what it stored.
+        return None
+    if any(f not in instance.__dict__ for f in fields):
+        return None  # deferred; resolved in pre_save if it's ever needed
+    return func(instance)
+
+
+def record_initial(sender, instance, **kwargs):
+    instance._counted = _contribution(instance)
+
+
+def load_missing_initial(sender, instance, **kwargs):
+    if getattr(instance, "_counted", 0) is None and instance.pk is not None:
+        _, fields, func = COUNTED[sender]
+        stored = sender.objects.filter(pk=instance.pk).values(*fields).first()
+        instance._counted = func(SimpleNamespace(**stored)) if stored else 0
+
+
+def counted_saved(sender, instance, created, **kwargs):
+    field, _, func = COUNTED[sender]
+    if created and sender is Property:
+        DashboardCounter.objects.get_or_create(landlord_id=instance.landlord_id)
+    new = func(instance)
+    adjust(_landlord_of(instance), **{field: new - (0 if created else instance._counted or 0)})
+    instance._counted = new
+
+
+def counted_deleted(sender, instance, **kwargs):
+    field, _, _ = COUNTED[sender]
+    adjust(_landlord_of(instance), **{field: -(instance._counted or 0)})
+
+
+for model in COUNTED:
+    post_init.connect(record_initial, sender=model, dispatch_uid=f"counters_init_{model.__name__}")
+    pre_save.connect(load_missing_initial, sender=model, dispatch_uid=f"counters_pre_{model.__name__}")
+    post_save.connect(counted_saved, sender=model, dispatch_uid=f"counters_save_{model.__name__}")
+    post_delete.connect(counted_deleted, sender=model, dispatch_uid=f"counters_delete_{model.__name__}")
+
+
+def _counted_querysets():
+    # counter field -> (rows it counts, path to their property)
+    return {
+        "total_properties": (Property.objects.all(), "pk"),
+        "pending_applications": (Application.objects.filter(status="PENDING"), "rental_property"),
+        "active_leases": (Lease.objects.filter(is_active=True), "rental_property"),
+        "due_payments": (Payment.objects.filter(status__in=["DUE", "OVERDUE"]), "lease__rental_property"),
+        "open_tickets": (
+            MaintenanceTicket.objects.filter(status__in=["OPEN", "IN_PROGRESS"]), "lease__rental_property",
+        ),
+    }
+
+
+def for_property(property_id):
+    """One property's share of its landlord's counters."""
+    return {
+        field: qs.filter(**{property_path: property_id}).count()
+        for field, (qs, property_path) in _counted_querysets().items()
+    }
+
+
+def compute():
+    """Recomputes every landlord's counters with one grouped aggregate per table."""
+    totals = {}
+    for field, (qs, property_path) in _counted_querysets().items():
+        prefix = "" if property_path == "pk" else f"{property_path}__"
+        landlord_path = f"{prefix}landlord_id"
+        # Properties being deleted no longer count.
+        qs = qs.filter(**{f"{prefix}deleted_at__isnull": True})
+        grouped = qs.order_by().values(landlord_path).annotate(n=Count("pk")).values_list(landlord_path, "n")
+        for landlord_id, n in grouped:
+            totals.setdefault(landlord_id, dict.fromkeys(COUNTER_FIELDS, 0))[field] = n
+    return totals
+
+
+@transaction.atomic
+def reconcile():
+    """
+    Rewrites counters that drifted from the real counts. Returns a list of
+    (landlord_id, field, stored, actual) for every mismatch it fixed.
+    """
+    totals = compute()
+
+    # Every landlord with a property gets a row, even if all tallies are zero.
+    landlords = set(Property.objects.values_list("landlord_id", flat=True).distinct())
+    existing = {c.landlord_id: c for c in DashboardCounter.objects.select_for_update()}
+    missing = landlords - existing.keys()
+    DashboardCounter.objects.bulk_create([DashboardCounter(landlord_id=pk) for pk in missing])
+    existing.update({c.landlord_id: c for c in DashboardCounter.objects.filter(landlord_id__in=missing)})
+
+    mismatches = []
+    changed = []
+    for landlord_id, counter in existing.items():
+        actual = totals.get(landlord_id, dict.fromkeys(COUNTER_FIELDS, 0))
+        dirty = False
+        for field in COUNTER_FIELDS:
+            stored = getattr(counter, field)
+            if stored != actual[field]:
+                mismatches.append((landlord_id, field, stored, actual[field]))
+                setattr(counter, field, actual[field])
+                dirty = True
+        if dirty:
+            changed.append(counter)
+    DashboardCounter.objects.bulk_update(changed, COUNTER_FIELDS)
+    return mismatches
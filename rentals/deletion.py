@@ -0,0 +1,133 @@
+"""
+Property deletion in the background.
+
+property_delete only soft-deletes: one UPDATE sets deleted_at, which hides the
+property everywhere, its share comes off the landlord's dashboard counters, and
+a purge_property job is queued. The job removes the property's rows children
+first, DELETE_CHUNK_SIZE primary keys at a time. Each chunk is a raw DELETE (no
+collector loading rows into memory, no per-row signals) committed on its own, so
+no transaction holds many locks for long, and a retried job just carries on
+with what is left.
+
+Image files are removed from storage on a thread pool once their rows are
+committed. Each property stores its own uploads, but images uploaded before
+dedup was scoped to one property may share a file and its variants with
+another property's image, so files still referenced elsewhere are kept.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from . import versions
+from .jobs import enqueue, report_progress
+from .models import (
+    Application, Lease, LeaseBalance, MaintenanceTicket, Payment, Property, PropertyImage,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@transaction.atomic
+def soft_delete_property(prop):
+    """Hides the property and queues its purge. Returns the job (None if already deleted)."""
+    now = timezone.now()
+    marked = Property.objects.filter(pk=prop.pk, deleted_at__isnull=True).update(
+        deleted_at=now, is_active=False, updated_at=now,
+    )
+    if not marked:
+        return None
+
+    from .counters import adjust, for_property
+    adjust(prop.landlord_id, **{field: -n for field, n in for_property(prop.pk).items()})
+    versions.bump()
+    return enqueue(
+        "purge_property", {"property_id": prop.pk, "landlord_id": prop.landlord_id}, key=f"property:{prop.pk}",
+    )
+
+
+def _steps(property_id):
+    # Children before parents, so every chunk commits with valid foreign keys.
+    return [
+        ("payments", Payment.objects.filter(lease__rental_property_id=property_id)),
+        ("balances", LeaseBalance.objects.filter(lease__rental_property_id=property_id)),
+        ("tickets", MaintenanceTicket.objects.filter(lease__rental_property_id=property_id)),
+        ("leases", Lease.objects.filter(rental_property_id=property_id)),
+        ("applications", Application.objects.filter(rental_property_id=property_id)),
+        ("images", PropertyImage.objects.filter(property_id=property_id)),
+    ]
+
+
+def _delete_chunk(qs, chunk_size, fields=("pk",)):
+    """Deletes up to chunk_size rows of qs by primary key. Returns the deleted rows' values."""
+    with transaction.atomic():
+        rows = list(qs.order_by("pk").values_list(*fields)[:chunk_size])
+        if rows:
+            qs.model.objects.filter(pk__in=[row[0] for row in rows])._raw_delete(qs.db)
+    return rows
+
+
+def _unshared_files(property_id, images):
+    """Storage names of the deleted images that no other property's image uses."""
+    hashes = {content_hash for _, _, _, content_hash in images if content_hash}
+    in_use = set()
+    others = (
+        PropertyImage.objects.filter(content_hash__in=hashes).exclude(property_id=property_id)
+        .values_list("image", "variant_files")
+    )
+    for image, variant_files in others:
+        in_use.add(image)
+        in_use.update(variant_files)
+
+    names = set()
+    for _, image, variant_files, _ in images:
+        names.add(image)
+        names.update(variant_files)
+    return {name for name in names if name} - in_use
+
+
+def _delete_file(name):
+    try:
+        default_storage.delete(name)
+        return True
+    except Exception:
+        # An orphaned file only costs storage; don't fail the purge over it.
+        logger.warning("Could not delete %s from storage", name, exc_info=True)
+        return False
+
+
+def purge_property(property_id, chunk_size=None):
+    """
+    Removes a soft-deleted property and everything attached to it. Returns
+    {step: rows deleted}, plus "files" for storage objects removed.
+    """
+    if not Property.objects.filter(pk=property_id, deleted_at__isnull=False).exists():
+        return {}
+    chunk_size = chunk_size or int(getattr(settings, "DELETE_CHUNK_SIZE", 1000))
+    steps = _steps(property_id)
+    total = {label: qs.count() for label, qs in steps}
+    deleted = dict.fromkeys(total, 0)
+    files = []
+
+    # Renewals point at the lease they renew; unlink them before leases go.
+    Lease.objects.filter(renewal_of__rental_property_id=property_id).update(renewal_of=None)
+
+    workers = int(getattr(settings, "STORAGE_DELETE_WORKERS", 8))
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="storage-delete") as pool:
+        for label, qs in steps:
+            fields = ("pk", "image", "variant_files", "content_hash") if label == "images" else ("pk",)
+            while rows := _delete_chunk(qs, chunk_size, fields):
+                deleted[label] += len(rows)
+                if label == "images":
+                    files += [pool.submit(_delete_file, name) for name in _unshared_files(property_id, rows)]
+                report_progress(step=label, deleted=deleted, total=total)
+
+        Property.objects.filter(pk=property_id)._raw_delete(Property.objects.db)
+        deleted["files"] = sum(future.result() for future in files)
+
+    report_progress(step="done", deleted=deleted, total=total)
+    return deleted
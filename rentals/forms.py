@@ -1,4 +1,6 @@
 
+from datetime import date, timedelta
+
 from django import forms
 from .models import Property, Application, MaintenanceTicket, Payment
 
@@ -15,6 +17,24 @@ class ApplicationForm(forms.ModelForm):
         fields = ["message"]
 
 
+class ApplicationFilterForm(forms.Form):
+    status = forms.ChoiceField(
+        required=False,
+        choices=[("PENDING", "Pending"), ("APPROVED", "Approved"), ("REJECTED", "Rejected"), ("ALL", "All")],
+    )
+    # Scoping to the landlord's own properties happens in the view's queryset.
+    property = forms.IntegerField(required=False, min_value=1)
+
+    def filters(self):
+        # Pending applications are the default view of the inbox.
+        data = self.cleaned_data if self.is_valid() else {}
+        status = data.get("status") or "PENDING"
+        filters = {} if status == "ALL" else {"status": status}
+        if data.get("property"):
+            filters["rental_property_id"] = data["property"]
+        return filters
+
+
 class MaintenanceForm(forms.ModelForm):
     class Meta:
         model = MaintenanceTicket
@@ -38,4 +58,61 @@ class PaymentMarkPaidForm(forms.ModelForm):
 
     class Meta:
         model = Payment
-        fields = ['method']
\ No newline at end of file
+        fields = ['method']
+
+class PropertySearchForm(forms.Form):
+    q = forms.CharField(required=False, max_length=200, label="Search")
+    min_rent = forms.DecimalField(required=False, min_value=0, decimal_places=2)
+    max_rent = forms.DecimalField(required=False, min_value=0, decimal_places=2)
+    bedrooms = forms.IntegerField(required=False, min_value=0, label="Min bedrooms")
+    bathrooms = forms.IntegerField(required=False, min_value=0, label="Min bathrooms")
+    min_sqft = forms.IntegerField(required=False, min_value=0)
+    max_sqft = forms.IntegerField(required=False, min_value=0)
+    # Vacant for the whole period; "to" alone means from today, "from" alone that one day.
+    available_from = forms.DateField(required=False)
+    available_to = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get("available_from"), cleaned.get("available_to")
+        if end and (start or date.today()) > end:
+            raise forms.ValidationError("The availability period ends before it starts.")
+        return cleaned
+
+    def is_search(self):
+        # True when at least one filter was actually given.
+        return self.is_valid() and any(v not in (None, "") for v in self.cleaned_data.values())
+
+    def filters_availability(self):
+        # Availability depends on Lease rows, which list validators must then cover.
+        return self.is_valid() and bool(self.cleaned_data["available_from"] or self.cleaned_data["available_to"])
+
+
+class AvailabilityForm(forms.Form):
+    MAX_DAYS = 731
+
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        start = cleaned.get("start") or date.today()
+        end = cleaned.get("end") or start + timedelta(days=364)
+        if start > end:
+            raise forms.ValidationError("Start date must be before end date.")
+        if (end - start).days >= self.MAX_DAYS:
+            raise forms.ValidationError(f"The calendar covers at most {self.MAX_DAYS} days.")
+        cleaned["start"], cleaned["end"] = start, end
+        return cleaned
+
+
+class ExportFilterForm(forms.Form):
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get("start"), cleaned.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError("Start date must be before end date.")
+        return cleaned
@@ -0,0 +1,134 @@
+"""
+Resized image variants for PropertyImage.
+
+Every uploaded image gets a card-sized and a detail-sized version, each as JPEG
+and WebP. Uploads enqueue one background job per image (rentals.jobs), so
+property_create/property_update return without waiting on Pillow or the
+storage backend, and a failed render is retried. Until a variant exists,
+templates fall back to the original upload. A rerun (retry or
+backfill_image_variants --all) replaces the variant files and deletes the
+previous ones once the new ones are committed.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import Property, PropertyImage
+from . import versions
+
+
+logger = logging.getLogger(__name__)
+
+# name -> max width in pixels
+VARIANT_WIDTHS = {
+    "card": 480,
+    "detail": 1280,
+}
+
+FORMATS = {
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+}
+
+def _encode(img, fmt):
+    pil_format, options = FORMATS[fmt]
+    buf = BytesIO()
+    img.save(buf, pil_format, **options)
+    return buf.getvalue()
+
+
+def build_variants(image):
+    """
+    Renders and stores every variant of a PropertyImage. Returns the
+    (variants, variant_files) pair to store on the row.
+    """
+    storage = image.image.storage
+    stem = os.path.splitext(os.path.basename(image.image.name))[0]
+
+    with image.image.open("rb") as fh:
+        original = ImageOps.exif_transpose(Image.open(fh))
+        original = original.convert("RGB")
+
+    variants, files = {}, []
+    for name, width in VARIANT_WIDTHS.items():
+        resized = original.copy()
+        resized.thumbnail((width, width * 4))  # only ever shrinks
+        entry = {"width": resized.width, "height": resized.height}
+        for fmt in FORMATS:
+            path = storage.save(
+                f"property_images/variants/{stem}-{name}.{fmt}",
+                ContentFile(_encode(resized, fmt)),
+            )
+            files.append(path)
+            entry[fmt] = storage.url(path)
+        variants[name] = entry
+    return variants, files
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            # An orphaned file only costs storage; don't fail the job over it.
+            logger.warning("Could not delete %s from storage", name, exc_info=True)
+
+
+def _replaced_files(image):
+    """The image's current variant files that no other image points at."""
+    in_use = set()
+    if image.content_hash:
+        # Images uploaded before dedup was scoped to one property may share them.
+        others = PropertyImage.objects.filter(content_hash=image.content_hash).exclude(pk=image.pk)
+        for files in others.values_list("variant_files", flat=True):
+            in_use.update(files)
+    return [name for name in image.variant_files if name not in in_use]
+
+
+def generate_variants(image_id):
+    image = PropertyImage.objects.filter(pk=image_id).first()
+    if image is None:
+        return False
+    try:
+        variants, files = build_variants(image)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        logger.warning("Could not build variants for PropertyImage %s", image_id, exc_info=True)
+        return False
+    storage = image.image.storage
+    if not PropertyImage.objects.filter(pk=image_id).update(variants=variants, variant_files=files):
+        _delete_files(storage, files)  # the image was deleted meanwhile
+        return False
+    replaced = _replaced_files(image)
+    transaction.on_commit(lambda: _delete_files(storage, replaced))
+    # The detail payload now carries new URLs; this also moves its object cache generation.
+    Property.objects.filter(pk=image.property_id).update(updated_at=timezone.now())
+    versions.bump()
+    return True
+
+
+def _generate_in_worker(image_id):
+    try:
+        return generate_variants(image_id)
+    finally:
+        # Pool threads open their own connections; don't leak them.
+        connections.close_all()
+
+
+def schedule_variants(image_ids):
+    # The jobs commit (or roll back) together with the upload.
+    from .jobs import enqueue_many
+    enqueue_many("generate_image_variants", [{"image_id": image_id} for image_id in image_ids])
+
+
+def image_uploaded(sender, instance, created, **kwargs):
+    if created:
+        schedule_variants([instance.pk])
+
+
+post_save.connect(image_uploaded, sender=PropertyImage, dispatch_uid="image_variants_on_upload")
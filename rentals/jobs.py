@@ -0,0 +1,210 @@
+"""
+Database-backed background jobs.
+
+enqueue() inserts a Job row in the caller's transaction, so a job only becomes
+visible to workers once the request that queued it commits, and vanishes if it
+rolls back. `manage.py run_jobs` runs worker threads or processes that claim
+due jobs with SELECT ... FOR UPDATE SKIP LOCKED: any number of workers can
+poll the same table without blocking each other or running a job twice.
+
+A task that raises is retried with exponential backoff until max_attempts,
+then left FAILED with its traceback for the admin. Jobs whose worker died
+mid-run are requeued after JOB_LOCK_TIMEOUT without a heartbeat (see
+report_progress).
+
+Tasks are plain functions registered with @task (see rentals.tasks) and
+called with the job's JSON payload as keyword arguments. Delivery is at least
+once, so tasks must be safe to run twice.
+"""
+import logging
+import random
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from prometheus_client import Counter, Gauge, Histogram
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+_current = threading.local()
+
+JOB_WAIT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600)
+JOB_RUN_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+QUEUE_DEPTH = Gauge("rentals_job_queue_depth", "Jobs by status.", ["status"])
+QUEUE_OLDEST_SECONDS = Gauge("rentals_job_queue_oldest_seconds", "Age of the oldest due queued job.")
+JOB_WAIT_SECONDS = Histogram(
+    "rentals_job_wait_seconds", "Delay between a job becoming due and a worker starting it.", ["task"],
+    buckets=JOB_WAIT_BUCKETS,
+)
+JOB_RUN_SECONDS = Histogram(
+    "rentals_job_run_seconds", "Time spent running a job.", ["task"], buckets=JOB_RUN_BUCKETS,
+)
+JOB_RESULTS = Counter("rentals_job_results", "Finished job attempts.", ["task", "outcome"])
+
+
+def task(name):
+    """Registers a function as the handler for jobs with this task name."""
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def _job(name, payload, key, run_at, max_attempts):
+    if name not in TASKS:
+        raise ValueError(f"No task registered as {name!r}.")
+    return Job(
+        task=name,
+        payload=payload or {},
+        key=key,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or int(getattr(settings, "JOB_MAX_ATTEMPTS", 5)),
+    )
+
+
+def enqueue(name, payload=None, key="", run_at=None, max_attempts=None):
+    """
+    Queues one job. With a key, nothing new is queued while a job with the
+    same task and key is still queued or running; the queued one is returned
+    (None if it is already running).
+    """
+    job = _job(name, payload, key, run_at, max_attempts)
+    if not key:
+        job.save()
+        return job
+    Job.objects.bulk_create([job], ignore_conflicts=True)
+    return Job.objects.filter(task=name, key=key, status="QUEUED").first()
+
+
+def enqueue_many(name, payloads, run_at=None, max_attempts=None):
+    """Queues one job per payload with a single INSERT."""
+    return Job.objects.bulk_create([_job(name, payload, "", run_at, max_attempts) for payload in payloads])
+
+
+def claim(worker, limit=1):
+    """Locks up to limit due jobs for this worker and marks them RUNNING."""
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(status="QUEUED", run_at__lte=now)
+            .order_by("run_at", "id")[:limit]
+        )
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status="RUNNING", locked_at=now, locked_by=worker, attempts=F("attempts") + 1,
+            )
+    for job in jobs:
+        job.status, job.locked_at, job.locked_by = "RUNNING", now, worker
+        job.attempts += 1
+    return jobs
+
+
+def backoff(attempts):
+    """Seconds before retry number `attempts`: doubling from the base, capped, with jitter."""
+    base = float(getattr(settings, "JOB_RETRY_BASE_SECONDS", 10))
+    cap = float(getattr(settings, "JOB_RETRY_MAX_SECONDS", 3600))
+    return min(cap, base * 2 ** (attempts - 1)) * random.uniform(0.5, 1.5)
+
+
+def run(job):
+    """Runs a claimed job and records the outcome. Returns True on success."""
+    JOB_WAIT_SECONDS.labels(job.task).observe(max(0.0, (job.locked_at - job.run_at).total_seconds()))
+    mine = Job.objects.filter(pk=job.pk, status="RUNNING", locked_by=job.locked_by)
+    started = time.perf_counter()
+    try:
+        func = TASKS.get(job.task)
+        if func is None:
+            raise LookupError(f"No task registered as {job.task!r}.")
+        _current.job = job
+        func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()[-4000:]
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            logger.exception("Job %s (%s) failed for good after %s attempts", job.pk, job.task, job.attempts)
+            mine.update(status="FAILED", last_error=error, finished_at=now)
+            outcome = "failed"
+        else:
+            logger.warning("Job %s (%s) failed, will retry", job.pk, job.task, exc_info=True)
+            mine.update(
+                status="QUEUED", last_error=error, locked_at=None, locked_by="",
+                run_at=now + timedelta(seconds=backoff(job.attempts)),
+            )
+            outcome = "retry"
+        JOB_RESULTS.labels(job.task, outcome).inc()
+        return False
+    finally:
+        _current.job = None
+        JOB_RUN_SECONDS.labels(job.task).observe(time.perf_counter() - started)
+
+    mine.update(status="DONE", last_error="", finished_at=timezone.now())
+    JOB_RESULTS.labels(job.task, "done").inc()
+    return True
+
+
+def report_progress(**progress):
+    """
+    Stores progress on the job this thread is running; a no-op outside a
+    worker. It also refreshes locked_at, the worker's heartbeat: tasks that may
+    run longer than JOB_LOCK_TIMEOUT must call it regularly (at least with no
+    arguments) or requeue_stale() hands the job to another worker.
+    """
+    job = getattr(_current, "job", None)
+    if job is not None:
+        job.progress = {**job.progress, **progress}
+        job.locked_at = timezone.now()
+        Job.objects.filter(pk=job.pk, status="RUNNING", locked_by=job.locked_by).update(
+            progress=job.progress, locked_at=job.locked_at,
+        )
+
+
+def run_pending(worker="inline", limit=None):
+    """Runs due jobs one by one until none are left (or limit ran). Returns how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        jobs = claim(worker)
+        if not jobs:
+            break
+        run(jobs[0])
+        ran += 1
+    return ran
+
+
+def requeue_stale():
+    """Puts jobs whose worker stopped responding back in the queue (or fails them)."""
+    cutoff = timezone.now() - timedelta(seconds=int(getattr(settings, "JOB_LOCK_TIMEOUT", 600)))
+    stale = Job.objects.filter(status="RUNNING", locked_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status="FAILED", last_error="Worker stopped while running the job.", finished_at=timezone.now(),
+    )
+    requeued = stale.update(status="QUEUED", locked_at=None, locked_by="", run_at=timezone.now())
+    return requeued + failed
+
+
+def purge_finished():
+    """Deletes DONE jobs older than JOB_RETENTION_DAYS; FAILED ones stay for inspection."""
+    cutoff = timezone.now() - timedelta(days=int(getattr(settings, "JOB_RETENTION_DAYS", 7)))
+    deleted, _ = Job.objects.filter(status="DONE", finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def update_metrics():
+    counts = dict(Job.objects.order_by().values_list("status").annotate(n=Count("pk")))
+    for status, _ in Job._meta.get_field("status").choices:
+        QUEUE_DEPTH.labels(status).set(counts.get(status, 0))
+    now = timezone.now()
+    oldest = Job.objects.filter(status="QUEUED", run_at__lte=now).order_by("run_at").values_list("run_at", flat=True).first()
+    QUEUE_OLDEST_SECONDS.set((now - oldest).total_seconds() if oldest else 0)
+    return counts
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from rentals.images import _generate_in_worker, generate_variants
+from rentals.models import PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Generate card/detail JPEG and WebP variants for existing property images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Rebuild images that already have variants too.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=int(getattr(settings, "IMAGE_VARIANT_WORKERS", 2)),
+            help="Number of images processed in parallel.",
+        )
+
+    def handle(self, *args, **options):
+        qs = PropertyImage.objects.all()
+        if not options["all"]:
+            qs = qs.filter(variants={})
+        ids = list(qs.order_by("pk").values_list("pk", flat=True))
+
+        if options["workers"] <= 1:
+            results = [generate_variants(pk) for pk in ids]
+        else:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                results = list(pool.map(_generate_in_worker, ids))
+
+        done = sum(results)
+        self.stdout.write(self.style.SUCCESS(f"{done} image(s) processed, {len(ids) - done} skipped."))
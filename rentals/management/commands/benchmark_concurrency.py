@@ -0,0 +1,101 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rentals.management.commands.benchmark_views import percentile
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Load running servers with concurrent slow clients and compare throughput, "
+        "e.g. gunicorn (WSGI, sync views) against uvicorn (ASGI, async views)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", action="append", required=True, metavar="NAME=URL",
+            help="Server to load, e.g. sync=http://127.0.0.1:8000/rentals/. Repeat to compare.",
+        )
+        parser.add_argument("--clients", type=int, default=100, help="Concurrent connections.")
+        parser.add_argument("--duration", type=float, default=15, help="Seconds per target.")
+        parser.add_argument("--delay", type=float, default=0.01, help="Pause between slow writes/reads.")
+        parser.add_argument("--chunk", type=int, default=512, help="Bytes per slow write/read.")
+        parser.add_argument("--timeout", type=float, default=30)
+
+    async def request(self, url, opts):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, parts.port or 80), opts["timeout"],
+        )
+        try:
+            payload = (
+                f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                "User-Agent: benchmark_concurrency\r\nConnection: close\r\n\r\n"
+            ).encode()
+            # Trickle the request out and the response in, like a client on a slow link.
+            for i in range(0, len(payload), opts["chunk"]):
+                writer.write(payload[i:i + opts["chunk"]])
+                await writer.drain()
+                await asyncio.sleep(opts["delay"])
+            status_line = await asyncio.wait_for(reader.readline(), opts["timeout"])
+            while await asyncio.wait_for(reader.read(opts["chunk"]), opts["timeout"]):
+                await asyncio.sleep(opts["delay"])
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
+
+    async def client(self, url, deadline, opts, stats):
+        loop = asyncio.get_running_loop()
+        while loop.time() < deadline:
+            start = time.perf_counter()
+            try:
+                status = await self.request(url, opts)
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+                stats.errors += 1
+                continue
+            if status >= 400:
+                stats.errors += 1
+            else:
+                stats.latencies.append((time.perf_counter() - start) * 1000)
+
+    async def run_target(self, url, opts):
+        stats = Stats()
+        deadline = asyncio.get_running_loop().time() + opts["duration"]
+        await asyncio.gather(*(self.client(url, deadline, opts, stats) for _ in range(opts["clients"])))
+        return stats
+
+    def handle(self, *args, **opts):
+        targets = []
+        for target in opts["target"]:
+            name, sep, url = target.partition("=")
+            if not sep or urlsplit(url).scheme != "http":
+                raise CommandError(f"Expected NAME=http://host:port/path, got {target!r}")
+            targets.append((name, url))
+
+        self.stdout.write(
+            f"{opts['clients']} clients, {opts['duration']:g}s each, "
+            f"{opts['chunk']}B chunks every {opts['delay'] * 1000:g}ms"
+        )
+        self.stdout.write(f"{'target':16} {'ok':>7} {'errors':>7} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for name, url in targets:
+            stats = asyncio.run(self.run_target(url, opts))
+            ok = stats.latencies
+            if not ok:
+                self.stdout.write(f"{name:16} {0:>7} {stats.errors:>7}  no successful requests")
+                continue
+            self.stdout.write(
+                f"{name:16} {len(ok):>7} {stats.errors:>7} {len(ok) / opts['duration']:>8.1f} "
+                f"{statistics.median(ok):>7.1f}ms {percentile(ok, 95):>7.1f}ms {percentile(ok, 99):>7.1f}ms"
+            )
@@ -0,0 +1,131 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rentals.models import Property
+
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+# (name, url name, needs a property pk, roles allowed to view it)
+VIEWS = [
+    ("listings", "rentals:listings", False, ("anonymous", "tenant", "landlord", "staff")),
+    ("listings_filtered", "rentals:listings", False, ("anonymous", "tenant", "landlord", "staff")),
+    ("listings_search_json", "rentals:listings_search", False, ("anonymous", "tenant", "landlord", "staff")),
+    ("property_detail", "rentals:property_detail", True, ("anonymous", "tenant", "landlord", "staff")),
+    ("applications", "rentals:applications", False, ("landlord", "staff")),
+    ("lease_dashboard", "rentals:lease_dashboard", False, ("tenant", "landlord", "staff")),
+    ("payments", "rentals:payments", False, ("tenant", "landlord", "staff")),
+    ("maintenance_list", "rentals:maintenance_list", False, ("tenant", "landlord", "staff")),
+    ("admin_dashboard", "rentals:admin_dashboard", False, ("landlord", "staff")),
+]
+
+QUERY_PARAMS = {
+    "listings_filtered": {"min_rent": 800, "max_rent": 2500, "bedrooms": 2},
+    "listings_search_json": {"q": "modern", "bedrooms": 1},
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "Benchmark every list/detail view per role and compare latency and query counts with a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="seed", help="Username prefix used by seed_data.")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument("--write-baseline", action="store_true", help="Store these results as the new baseline.")
+        parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed p95 slowdown vs baseline (0.5 = +50%%).")
+
+    def users(self, prefix):
+        found = {
+            "tenant": User.objects.filter(username=f"{prefix}_tenant_0").first(),
+            "landlord": User.objects.filter(username=f"{prefix}_landlord_0").first(),
+            "staff": User.objects.filter(username=f"{prefix}_staff").first(),
+        }
+        missing = [role for role, user in found.items() if user is None]
+        if missing:
+            raise CommandError(f"No seeded users for {missing}; run 'manage.py seed_data --prefix {prefix}' first.")
+        return {"anonymous": None, **found}
+
+    def measure(self, client, url, params, iterations, warmup):
+        for _ in range(warmup):
+            client.get(url, params)
+        timings, queries = [], []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = client.get(url, params)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(ctx.captured_queries))
+        return {
+            "status": response.status_code,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "queries": max(queries),
+        }
+
+    def handle(self, *args, **opts):
+        users = self.users(opts["prefix"])
+        prop = Property.objects.filter(landlord=users["landlord"]).order_by("pk").first()
+
+        results = {}
+        for name, url_name, needs_pk, roles in VIEWS:
+            url = reverse(url_name, args=[prop.pk] if needs_pk else [])
+            for role in roles:
+                client = Client(HTTP_HOST="localhost")
+                if users[role] is not None:
+                    client.force_login(users[role])
+                key = f"{name}:{role}"
+                results[key] = self.measure(client, url, QUERY_PARAMS.get(name, {}), opts["iterations"], opts["warmup"])
+
+        baseline_path = Path(opts["baseline"])
+        baseline = json.loads(baseline_path.read_text())["results"] if baseline_path.exists() else {}
+
+        regressions = []
+        self.stdout.write(f"{'view:role':36} {'status':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}  vs baseline")
+        for key, r in results.items():
+            base = baseline.get(key)
+            note = ""
+            if base:
+                note = f"p95 {base['p95_ms']}ms, {base['queries']}q"
+                if r["queries"] > base["queries"]:
+                    regressions.append(f"{key}: {r['queries']} queries (baseline {base['queries']})")
+                if r["p95_ms"] > base["p95_ms"] * (1 + opts["tolerance"]):
+                    regressions.append(f"{key}: p95 {r['p95_ms']}ms (baseline {base['p95_ms']}ms)")
+            self.stdout.write(
+                f"{key:36} {r['status']:>6} {r['p50_ms']:>7}ms {r['p95_ms']:>7}ms {r['p99_ms']:>7}ms {r['queries']:>8}  {note}"
+            )
+
+        if opts["write_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps({
+                "database": connection.vendor,
+                "iterations": opts["iterations"],
+                "results": results,
+            }, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+        elif regressions:
+            for line in regressions:
+                self.stdout.write(self.style.WARNING(f"REGRESSION {line}"))
+            raise CommandError(f"{len(regressions)} regression(s) against {baseline_path}")
+        else:
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
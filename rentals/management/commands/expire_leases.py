@@ -0,0 +1,42 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from rentals.models import expire_leases
+
+
+class Command(BaseCommand):
+    help = (
+        "Deactivate leases past their end date and create renewals for auto-renewing ones. "
+        "Safe to run from several processes at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true", help="Keep running, checking every --interval seconds.")
+        parser.add_argument("--interval", type=int, default=3600)
+        parser.add_argument("--date", help="Treat this ISO date as today (e.g. for backfills).")
+
+    def run_once(self, today, batch_size):
+        expired, renewed = expire_leases(today=today, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"{expired} lease(s) expired, {renewed} renewed."))
+
+    def handle(self, *args, **opts):
+        try:
+            today = date.fromisoformat(opts["date"]) if opts["date"] else None
+        except ValueError:
+            raise CommandError(f"Invalid --date {opts['date']!r}; expected YYYY-MM-DD.")
+
+        if not opts["loop"]:
+            self.run_once(today, opts["batch_size"])
+            return
+
+        try:
+            while True:
+                close_old_connections()
+                self.run_once(today, opts["batch_size"])
+                time.sleep(opts["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from rentals.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard counters from the source tables and fix any drift."
+
+    def handle(self, *args, **options):
+        mismatches = reconcile()
+        for landlord_id, field, stored, actual in mismatches:
+            self.stdout.write(f"landlord {landlord_id}: {field} {stored} -> {actual}")
+        self.stdout.write(self.style.SUCCESS(f"{len(mismatches)} counter(s) corrected."))
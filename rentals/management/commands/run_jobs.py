@@ -0,0 +1,144 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+from prometheus_client import start_http_server
+
+from rentals import jobs
+
+
+logger = logging.getLogger("rentals.jobs")
+
+def work(name, stop, batch, poll_interval, once, housekeeping=None, housekeeping_interval=30.0):
+    """One worker loop: claim due jobs, run them, sleep when the queue is empty."""
+    last_housekeeping = time.monotonic()
+    while not stop.is_set():
+        if housekeeping and time.monotonic() - last_housekeeping >= housekeeping_interval:
+            housekeeping()
+            last_housekeeping = time.monotonic()
+        try:
+            claimed = jobs.claim(name, batch)
+            for job in claimed:
+                jobs.run(job)
+        except DatabaseError:
+            # Lost connection, failover, lock timeout: reconnect on the next poll.
+            # A claimed job left RUNNING is requeued by housekeeping.
+            logger.exception("Worker %s hit a database error", name)
+            connections.close_all()
+            stop.wait(poll_interval)
+            continue
+        if not claimed:
+            if once:
+                break
+            stop.wait(poll_interval)
+
+
+def _thread_main(*args):
+    try:
+        work(*args)
+    finally:
+        # Each thread opened its own connection.
+        connections.close_all()
+
+
+def _process_main(name, stop, batch, poll_interval, once, metrics_port):
+    # The parent handles Ctrl-C/SIGTERM and sets `stop`; finish the current job first.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    if metrics_port:
+        start_http_server(metrics_port)
+    _thread_main(name, stop, batch, poll_interval, once)
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the database queue until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=int(getattr(settings, "JOB_WORKER_CONCURRENCY", 4)),
+            help="Number of worker threads or processes.",
+        )
+        parser.add_argument(
+            "--mode", choices=["threads", "processes"], default="threads",
+            help="Threads suit I/O-bound tasks; processes sidestep the GIL for CPU-bound ones (image resizing).",
+        )
+        parser.add_argument("--batch", type=int, default=1, help="Jobs claimed per poll.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument(
+            "--housekeeping-interval", type=float, default=30.0,
+            help="Seconds between requeueing stale jobs, purging old ones and refreshing queue metrics.",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+        parser.add_argument(
+            "--metrics-port", type=int, default=0,
+            help="Serve Prometheus metrics on this port (worker processes use the following ports).",
+        )
+
+    def handle(self, *args, **opts):
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        names = [f"{prefix}:{i}" for i in range(max(1, opts["concurrency"]))]
+        loop_args = (opts["batch"], opts["poll_interval"], opts["once"])
+
+        if opts["metrics_port"]:
+            start_http_server(opts["metrics_port"])
+        self.housekeeping()
+
+        if opts["mode"] == "threads" and len(names) == 1:
+            # A single worker runs here, doing the housekeeping between polls.
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *args: stop.set())
+            try:
+                work(names[0], stop, *loop_args, self.housekeeping, opts["housekeeping_interval"])
+            except KeyboardInterrupt:
+                pass
+            self.stdout.write(f"Worker {names[0]} stopped.")
+            return
+
+        if opts["mode"] == "processes":
+            # Forked children must not share the parent's database connection.
+            connections.close_all()
+            context = multiprocessing.get_context("fork")
+            stop = context.Event()
+            port = opts["metrics_port"]
+            workers = [
+                context.Process(
+                    target=_process_main, name=name, args=(name, stop, *loop_args, port and port + i + 1),
+                )
+                for i, name in enumerate(names)
+            ]
+        else:
+            stop = threading.Event()
+            workers = [threading.Thread(target=_thread_main, name=name, args=(name, stop, *loop_args)) for name in names]
+
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"{len(workers)} worker {opts['mode']} started ({prefix}).")
+
+        signal.signal(signal.SIGTERM, lambda *args: stop.set())
+        next_housekeeping = time.monotonic() + opts["housekeeping_interval"]
+        try:
+            while any(worker.is_alive() for worker in workers) and not stop.wait(1.0):
+                if time.monotonic() >= next_housekeeping:
+                    self.housekeeping()
+                    next_housekeeping = time.monotonic() + opts["housekeeping_interval"]
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+        self.stdout.write("Workers stopped.")
+
+    def housekeeping(self):
+        requeued = jobs.requeue_stale()
+        purged = jobs.purge_finished()
+        jobs.update_metrics()
+        if requeued or purged:
+            self.stdout.write(f"Requeued {requeued} stale job(s), purged {purged} finished job(s).")
@@ -0,0 +1,168 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from PIL import Image
+
+from rentals import balances, versions
+from rentals.counters import reconcile
+from rentals.models import (
+    Application, Lease, MaintenanceTicket, Payment, Profile, Property, PropertyImage,
+    add_months, build_payment_schedule,
+)
+
+
+STREETS = ["Oak", "Maple", "Cedar", "Pine", "Elm", "Lake", "Hill", "River", "Park", "Sunset"]
+KINDS = ["Studio", "Apartment", "Loft", "Townhouse", "Cottage", "Duplex", "Villa", "Flat"]
+ADJECTIVES = ["Sunny", "Cozy", "Modern", "Spacious", "Quiet", "Bright", "Renovated", "Charming"]
+ISSUES = ["Leaking tap", "Broken heater", "Door lock stuck", "No hot water", "Mould in bathroom", "Power outage"]
+PASSWORD = "Seed123!"
+
+
+class Command(BaseCommand):
+    help = "Seed deterministic synthetic data (users, properties, applications, leases, payments, tickets) in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--landlords", type=int, default=20)
+        parser.add_argument("--tenants", type=int, default=200)
+        parser.add_argument("--properties", type=int, default=10, help="Properties per landlord.")
+        parser.add_argument("--images", type=int, default=3, help="Images per property.")
+        parser.add_argument("--applications", type=int, default=3, help="Applications per property.")
+        parser.add_argument("--lease-ratio", type=float, default=0.6, help="Share of properties with an approved lease.")
+        parser.add_argument("--tickets", type=int, default=1, help="Tickets per lease.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="seed", help="Username prefix for generated users.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    @transaction.atomic
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        prefix = opts["prefix"]
+        batch = opts["batch_size"]
+        today = date.today()
+
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            self.stderr.write(f"Users with prefix '{prefix}_' already exist; pick another --prefix.")
+            return
+
+        # Users and profiles. One hash for everyone keeps this fast.
+        password = make_password(PASSWORD)
+        specs = (
+            [(f"{prefix}_landlord_{i}", "LANDLORD", False) for i in range(opts["landlords"])]
+            + [(f"{prefix}_tenant_{i}", "TENANT", False) for i in range(opts["tenants"])]
+            + [(f"{prefix}_staff", "LANDLORD", True)]
+        )
+        users = User.objects.bulk_create(
+            [User(username=name, password=password, is_staff=staff, email=f"{name}@example.com") for name, _, staff in specs],
+            batch_size=batch,
+        )
+        Profile.objects.bulk_create(
+            [Profile(user=u, role=role) for u, (_, role, _) in zip(users, specs)],
+            batch_size=batch,
+        )
+        landlords = users[:opts["landlords"]]
+        tenants = users[opts["landlords"]:opts["landlords"] + opts["tenants"]]
+
+        # One real placeholder image shared by every PropertyImage row.
+        buf = BytesIO()
+        Image.new("RGB", (640, 400), (120, 160, 200)).save(buf, "JPEG")
+        field = PropertyImage._meta.get_field("image")
+        placeholder = field.storage.save(field.generate_filename(None, f"{prefix}-placeholder.jpg"), ContentFile(buf.getvalue()))
+
+        properties = []
+        for landlord in landlords:
+            for _ in range(opts["properties"]):
+                bedrooms = rng.randint(0, 5)
+                properties.append(Property(
+                    title=f"{rng.choice(ADJECTIVES)} {rng.choice(KINDS)}",
+                    address=f"{rng.randint(1, 999)} {rng.choice(STREETS)} Street",
+                    monthly_rent=Decimal(rng.randrange(400, 5000, 25)),
+                    bedrooms=bedrooms,
+                    bathrooms=max(1, bedrooms - rng.randint(0, 2)),
+                    sqft=300 + bedrooms * 250 + rng.randint(0, 400),
+                    description="Synthetic listing generated by seed_data.",
+                    landlord=landlord,
+                    is_active=rng.random() > 0.1,
+                    cover_image=placeholder if opts["images"] else "",
+                    image_count=opts["images"],
+                ))
+        properties = Property.objects.bulk_create(properties, batch_size=batch)
+
+        PropertyImage.objects.bulk_create(
+            [PropertyImage(property=p, image=placeholder) for p in properties for _ in range(opts["images"])],
+            batch_size=batch,
+        )
+
+        applications = []
+        for p in properties:
+            for tenant in rng.sample(tenants, min(opts["applications"], len(tenants))):
+                applications.append(Application(rental_property=p, tenant=tenant, message="I'd like to rent this place."))
+        applications = Application.objects.bulk_create(applications, batch_size=batch)
+
+        # Approve one application on a share of the properties; reject the rest there.
+        by_property = {}
+        for app in applications:
+            by_property.setdefault(app.rental_property_id, []).append(app)
+        rents = {p.pk: p.monthly_rent for p in properties}
+
+        leases, approved_ids, rejected_ids = [], [], []
+        for property_id, apps in by_property.items():
+            if rng.random() >= opts["lease_ratio"]:
+                continue
+            winner, *others = apps
+            approved_ids.append(winner.pk)
+            rejected_ids += [a.pk for a in others]
+            start = add_months(today, -rng.randint(0, 11))
+            leases.append(Lease(
+                application=winner,
+                tenant_id=winner.tenant_id,
+                rental_property_id=property_id,
+                start_date=start,
+                end_date=add_months(start, 11),
+                monthly_rent=rents[property_id],
+                security_deposit=rents[property_id],
+            ))
+        Application.objects.filter(pk__in=approved_ids).update(status="APPROVED")
+        Application.objects.filter(pk__in=rejected_ids).update(status="REJECTED")
+        leases = Lease.objects.bulk_create(leases, batch_size=batch)
+
+        payments = []
+        for lease in leases:
+            for payment in build_payment_schedule(lease):
+                if payment.due_date < today - timedelta(days=30) and rng.random() < 0.85:
+                    payment.status = "PAID"
+                    payment.paid_on = payment.due_date
+                    payment.method = rng.choice(["CASH", "BANK_TRANSFER", "CARD"])
+                payments.append(payment)
+        Payment.objects.bulk_create(payments, batch_size=batch)
+
+        tickets = [
+            MaintenanceTicket(
+                lease=lease,
+                created_by_id=lease.tenant_id,
+                title=rng.choice(ISSUES),
+                description="Synthetic ticket generated by seed_data.",
+                status=rng.choice(["OPEN", "IN_PROGRESS", "RESOLVED"]),
+            )
+            for lease in leases
+            for _ in range(opts["tickets"])
+        ]
+        MaintenanceTicket.objects.bulk_create(tickets, batch_size=batch)
+
+        # Bulk inserts skip the counter and balance signals.
+        reconcile()
+        balances.refresh([lease.pk for lease in leases])
+        versions.bump()
+        versions.bump(versions.LEASES)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users, {len(properties)} properties, {len(applications)} applications, "
+            f"{len(leases)} leases, {len(payments)} payments, {len(tickets)} tickets "
+            f"(password for all users: {PASSWORD})."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from rentals.models import sweep_overdue_payments
+
+
+class Command(BaseCommand):
+    help = "Mark payments past their grace period as overdue and apply the late fee."
+
+    def handle(self, *args, **options):
+        updated = sweep_overdue_payments()
+        self.stdout.write(self.style.SUCCESS(f"{updated} payment(s) marked overdue."))
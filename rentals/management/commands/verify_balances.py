@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from rentals.balances import verify
+
+
+class Command(BaseCommand):
+    help = "Recompute every lease balance with one grouped aggregate and report rows that drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Rewrite the balances that don't match.")
+
+    def handle(self, *args, **options):
+        mismatches = verify(fix=options["fix"])
+        for lease_id, field, stored, actual in mismatches:
+            self.stdout.write(f"lease {lease_id}: {field} {stored} -> {actual}")
+
+        leases = len({lease_id for lease_id, *_ in mismatches})
+        if options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"{leases} lease balance(s) corrected."))
+        elif mismatches:
+            raise CommandError(f"{leases} lease balance(s) out of date; rerun with --fix to correct them.")
+        else:
+            self.stdout.write(self.style.SUCCESS("All lease balances match."))
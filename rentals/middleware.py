@@ -0,0 +1,209 @@
+"""
+Per-view query and latency instrumentation.
+
+For every request QueryInstrumentationMiddleware records, under the resolved
+URL name (e.g. "rentals:listings"), the number of queries, total DB time,
+template render time and how many queries repeated an earlier SQL statement.
+These are exported as Prometheus metrics next to django_prometheus' own.
+
+QUERY_BUDGETS maps URL names to limits ({"queries": 8, "duplicates": 0,
+"db_ms": 50}). When a request goes over budget it is logged, or, with
+QUERY_BUDGET_MODE = "raise" (as the test suite uses), QueryBudgetExceeded is
+raised so regressions like an N+1 fail the test that hits them.
+
+Both middlewares here handle sync and async requests, so under ASGI the
+async views in rentals.async_views aren't pushed back into a thread.
+"""
+import contextvars
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template as DjangoTemplate
+from prometheus_client import Counter as PromCounter, Histogram
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 500)
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+VIEW_QUERIES = Histogram(
+    "rentals_view_queries", "SQL queries per request.", ["view"], buckets=QUERY_BUCKETS,
+)
+VIEW_DB_SECONDS = Histogram(
+    "rentals_view_db_seconds", "Time spent in SQL per request.", ["view"], buckets=SECONDS_BUCKETS,
+)
+VIEW_TEMPLATE_SECONDS = Histogram(
+    "rentals_view_template_seconds", "Time spent rendering templates per request.", ["view"], buckets=SECONDS_BUCKETS,
+)
+VIEW_DUPLICATE_QUERIES = Histogram(
+    "rentals_view_duplicate_queries", "Queries repeating an earlier statement per request.", ["view"],
+    buckets=QUERY_BUCKETS,
+)
+VIEW_BUDGET_EXCEEDED = PromCounter(
+    "rentals_view_budget_exceeded", "Requests that went over their query budget.", ["view", "limit"],
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.signatures = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+            self.signatures[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(n - 1 for n in self.signatures.values() if n > 1)
+
+    def top_duplicates(self, limit=3):
+        return [(sql, n) for sql, n in self.signatures.most_common(limit) if n > 1]
+
+
+_current = contextvars.ContextVar("rentals_request_stats", default=None)
+_original_render = DjangoTemplate.render
+
+
+def _timed_render(self, *args, **kwargs):
+    stats = _current.get()
+    if stats is None:
+        return _original_render(self, *args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return _original_render(self, *args, **kwargs)
+    finally:
+        stats.template_seconds += time.perf_counter() - start
+
+
+DjangoTemplate.render = _timed_render
+
+
+def current_stats():
+    return _current.get()
+
+
+def check_budget(view, stats):
+    budget = getattr(settings, "QUERY_BUDGETS", {}).get(view)
+    if not budget:
+        return
+    measured = {
+        "queries": stats.queries,
+        "duplicates": stats.duplicates,
+        "db_ms": stats.db_seconds * 1000,
+    }
+    over = {k: (measured[k], limit) for k, limit in budget.items() if measured.get(k, 0) > limit}
+    if not over:
+        return
+
+    for limit in over:
+        VIEW_BUDGET_EXCEEDED.labels(view, limit).inc()
+    details = ", ".join(f"{k}={v:g} (budget {limit})" for k, (v, limit) in over.items())
+    message = f"{view} over query budget: {details}. Repeated: {stats.top_duplicates()}"
+    if getattr(settings, "QUERY_BUDGET_MODE", "log") == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def _wrap_connections(stats):
+    stack = ExitStack()
+    for conn in connections.all():
+        stack.enter_context(conn.execute_wrapper(stats))
+    return stack
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            with _wrap_connections(stats):
+                response = self.get_response(request)
+                # Streaming bodies run their queries after this point; those are not counted.
+        finally:
+            _current.reset(token)
+        self.record(request, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            # The async ORM runs queries on the request's sync thread, whose
+            # connections differ from the event loop's; wrap those.
+            stack = await sync_to_async(_wrap_connections)(stats)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        self.record(request, stats)
+        return response
+
+    def record(self, request, stats):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "<unresolved>"
+        VIEW_QUERIES.labels(view).observe(stats.queries)
+        VIEW_DB_SECONDS.labels(view).observe(stats.db_seconds)
+        VIEW_TEMPLATE_SECONDS.labels(view).observe(stats.template_seconds)
+        VIEW_DUPLICATE_QUERIES.labels(view).observe(stats.duplicates)
+        check_budget(view, stats)
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise 6.6 is sync-only, which makes Django run everything below it
+    in a thread under ASGI. Non-static requests pass straight through here;
+    static files are still served by WhiteNoise, in a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
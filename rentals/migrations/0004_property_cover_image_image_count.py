@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:19
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_image_summary(apps, schema_editor):
+    Property = apps.get_model("rentals", "Property")
+    PropertyImage = apps.get_model("rentals", "PropertyImage")
+    images = PropertyImage.objects.filter(property=OuterRef("pk"))
+    Property.objects.update(
+        image_count=Coalesce(
+            Subquery(images.order_by().values("property").annotate(n=Count("pk")).values("n")),
+            Value(0),
+        ),
+        cover_image=Coalesce(
+            Subquery(images.order_by("pk").values("image")[:1]),
+            Value(""),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0003_remove_property_image_alter_property_bathrooms_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='cover_image',
+            field=models.ImageField(blank=True, editable=False, upload_to='property_images/'),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_image_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0004_property_cover_image_image_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'due_date'], name='payment_status_due_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:22
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+SEARCH_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION rentals_property_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.address, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER rentals_property_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, address, description ON rentals_property
+    FOR EACH ROW EXECUTE FUNCTION rentals_property_search_vector_update();
+
+UPDATE rentals_property SET title = title;
+
+CREATE INDEX property_search_vector_gin ON rentals_property USING gin (search_vector);
+"""
+
+DROP_SEARCH_TRIGGER_SQL = """
+DROP INDEX IF EXISTS property_search_vector_gin;
+DROP TRIGGER IF EXISTS rentals_property_search_vector_trigger ON rentals_property;
+DROP FUNCTION IF EXISTS rentals_property_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    # Full-text search is Postgres-only; SQLite falls back to icontains.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SEARCH_TRIGGER_SQL)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0005_payment_status_due_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='property_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['monthly_rent', 'bedrooms'], name='property_active_rent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['bedrooms', 'bathrooms', 'monthly_rent'], name='property_active_rooms_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['sqft', 'monthly_rent'], name='property_active_sqft_idx'),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# counter field -> (model, rows it counts, path to their property's fields)
+COUNTED = {
+    "total_properties": ("Property", {}, ""),
+    "pending_applications": ("Application", {"status": "PENDING"}, "rental_property__"),
+    "active_leases": ("Lease", {"is_active": True}, "rental_property__"),
+    "due_payments": ("Payment", {"status__in": ["DUE", "OVERDUE"]}, "lease__rental_property__"),
+    "open_tickets": ("MaintenanceTicket", {"status__in": ["OPEN", "IN_PROGRESS"]}, "lease__rental_property__"),
+}
+
+
+def backfill_counters(apps, schema_editor):
+    # Against the historical models only; rentals.counters moves on with the
+    # current schema. One grouped aggregate per table, one row per landlord.
+    Counter = apps.get_model("rentals", "DashboardCounter")
+    Property = apps.get_model("rentals", "Property")
+    totals = {pk: {} for pk in Property.objects.order_by().values_list("landlord_id", flat=True).distinct()}
+    for field, (model, filters, prefix) in COUNTED.items():
+        qs = apps.get_model("rentals", model).objects.filter(**filters).order_by()
+        landlord_path = f"{prefix}landlord_id"
+        for landlord_id, n in qs.values(landlord_path).annotate(n=Count("pk")).values_list(landlord_path, "n"):
+            totals[landlord_id][field] = n
+    Counter.objects.bulk_create(
+        [Counter(landlord_id=pk, **fields) for pk, fields in totals.items()], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0007_list_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_properties', models.IntegerField(default=0)),
+                ('pending_applications', models.IntegerField(default=0)),
+                ('active_leases', models.IntegerField(default=0)),
+                ('due_payments', models.IntegerField(default=0)),
+                ('open_tickets', models.IntegerField(default=0)),
+                ('landlord', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_counter', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0011_property_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['rental_property', 'status', '-submitted_at', '-id'], name='application_inbox_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0012_application_inbox_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lease',
+            name='auto_renew',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='lease',
+            name='renewal_of',
+            field=models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='renewal', to='rentals.lease'),
+        ),
+        migrations.AlterField(
+            model_name='lease',
+            name='application',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lease', to='rentals.application'),
+        ),
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['end_date', 'id'], name='lease_active_end_idx'),
+        ),
+    ]
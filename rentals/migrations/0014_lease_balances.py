@@ -0,0 +1,59 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:54
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import DecimalField, F, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _money(expression, condition=None):
+    return Coalesce(Sum(expression, filter=condition), Value(Decimal("0")), output_field=MONEY)
+
+
+def backfill_balances(apps, schema_editor):
+    # Against the historical models only (not rentals.balances, which moves on
+    # with the current schema): one grouped aggregate over every lease's payments.
+    Lease = apps.get_model("rentals", "Lease")
+    LeaseBalance = apps.get_model("rentals", "LeaseBalance")
+    unpaid = Q(payments__status__in=["DUE", "OVERDUE"])
+    rows = Lease.objects.order_by().values("pk").annotate(
+        total_scheduled=_money("payments__amount"),
+        paid=_money("payments__amount", Q(payments__status="PAID")),
+        outstanding=_money("payments__amount", unpaid),
+        overdue=_money("payments__amount", Q(payments__status="OVERDUE")),
+        late_fees=_money(F("payments__amount") - F("monthly_rent"), Q(payments__late_fee_applied=True)),
+        next_due_date=Min("payments__due_date", filter=unpaid),
+    )
+    LeaseBalance.objects.bulk_create(
+        [LeaseBalance(lease_id=row.pop("pk"), **row) for row in rows], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0013_lease_renewals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaseBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_scheduled', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('outstanding', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('overdue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('late_fees', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('next_due_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lease', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='balance', to='rentals.lease')),
+            ],
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+OVERLAPS_SQL = """
+SELECT a.id, b.id FROM rentals_lease a
+JOIN rentals_lease b
+  ON b.rental_property_id = a.rental_property_id AND b.id > a.id
+ AND a.is_active AND b.is_active
+ AND a.start_date <= b.end_date AND a.end_date >= b.start_date
+LIMIT 20
+"""
+
+POSTGRES_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """
+    ALTER TABLE rentals_lease ADD CONSTRAINT lease_active_no_overlap
+        EXCLUDE USING gist (rental_property_id WITH =, daterange(start_date, end_date, '[]') WITH &&)
+        WHERE (is_active)
+    """,
+]
+
+SQLITE_OVERLAP_CHECK = """
+WHEN NEW.is_active AND EXISTS (
+    SELECT 1 FROM rentals_lease
+    WHERE rental_property_id = NEW.rental_property_id AND is_active AND id IS NOT NEW.id
+      AND start_date <= NEW.end_date AND end_date >= NEW.start_date
+)
+BEGIN
+    SELECT RAISE(ABORT, 'lease_active_no_overlap');
+END
+"""
+
+SQLITE_SQL = [
+    "CREATE TRIGGER lease_active_no_overlap_insert BEFORE INSERT ON rentals_lease" + SQLITE_OVERLAP_CHECK,
+    "CREATE TRIGGER lease_active_no_overlap_update "
+    "BEFORE UPDATE OF rental_property_id, start_date, end_date, is_active ON rentals_lease" + SQLITE_OVERLAP_CHECK,
+]
+
+
+def add_overlap_constraint(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in ("postgresql", "sqlite"):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(OVERLAPS_SQL)
+        clashes = cursor.fetchall()
+    if clashes:
+        raise RuntimeError(
+            f"Active leases overlap on the same property: {clashes}. "
+            "Deactivate or shorten them before applying this migration."
+        )
+    for sql in POSTGRES_SQL if vendor == "postgresql" else SQLITE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("ALTER TABLE rentals_lease DROP CONSTRAINT IF EXISTS lease_active_no_overlap")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TRIGGER IF EXISTS lease_active_no_overlap_insert")
+        schema_editor.execute("DROP TRIGGER IF EXISTS lease_active_no_overlap_update")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0014_lease_balances'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='lease',
+            constraint=models.CheckConstraint(check=models.Q(('start_date__lte', models.F('end_date'))), name='lease_period_valid'),
+        ),
+        migrations.RunPython(add_overlap_constraint, drop_overlap_constraint),
+    ]
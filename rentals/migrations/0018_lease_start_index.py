@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0017_property_soft_delete'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(fields=['start_date', 'id'], name='lease_start_idx'),
+        ),
+    ]
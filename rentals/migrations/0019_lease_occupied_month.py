@@ -0,0 +1,95 @@
+"""
+Rebuilds the overlap check from migration 0015 so a lease occupies its
+property until end_date + 1 month (end_date is the last due date), see
+rentals.availability.
+"""
+import importlib
+
+from django.db import migrations
+
+
+previous = importlib.import_module("rentals.migrations.0015_lease_availability")
+
+
+OVERLAPS_SQL = {
+    "postgresql": """
+        SELECT a.id, b.id FROM rentals_lease a
+        JOIN rentals_lease b
+          ON b.rental_property_id = a.rental_property_id AND b.id > a.id
+         AND a.is_active AND b.is_active
+         AND a.start_date < (b.end_date + interval '1 month')::date
+         AND (a.end_date + interval '1 month')::date > b.start_date
+        LIMIT 20
+    """,
+    "sqlite": """
+        SELECT a.id, b.id FROM rentals_lease a
+        JOIN rentals_lease b
+          ON b.rental_property_id = a.rental_property_id AND b.id > a.id
+         AND a.is_active AND b.is_active
+         AND a.start_date < date(b.end_date, '+1 month')
+         AND date(a.end_date, '+1 month') > b.start_date
+        LIMIT 20
+    """,
+}
+
+POSTGRES_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """
+    ALTER TABLE rentals_lease ADD CONSTRAINT lease_active_no_overlap
+        EXCLUDE USING gist (
+            rental_property_id WITH =,
+            daterange(start_date, (end_date + interval '1 month')::date, '[)') WITH &&
+        )
+        WHERE (is_active)
+    """,
+]
+
+SQLITE_OVERLAP_CHECK = """
+WHEN NEW.is_active AND EXISTS (
+    SELECT 1 FROM rentals_lease
+    WHERE rental_property_id = NEW.rental_property_id AND is_active AND id IS NOT NEW.id
+      AND start_date < date(NEW.end_date, '+1 month') AND date(end_date, '+1 month') > NEW.start_date
+)
+BEGIN
+    SELECT RAISE(ABORT, 'lease_active_no_overlap');
+END
+"""
+
+SQLITE_SQL = [
+    "CREATE TRIGGER lease_active_no_overlap_insert BEFORE INSERT ON rentals_lease" + SQLITE_OVERLAP_CHECK,
+    "CREATE TRIGGER lease_active_no_overlap_update "
+    "BEFORE UPDATE OF rental_property_id, start_date, end_date, is_active ON rentals_lease" + SQLITE_OVERLAP_CHECK,
+]
+
+
+def occupy_last_month(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in ("postgresql", "sqlite"):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(OVERLAPS_SQL[vendor])
+        clashes = cursor.fetchall()
+    if clashes:
+        raise RuntimeError(
+            f"Active leases start within another lease's last month on the same property: {clashes}. "
+            "Deactivate or move them before applying this migration."
+        )
+    previous.drop_overlap_constraint(apps, schema_editor)
+    for sql in POSTGRES_SQL if vendor == "postgresql" else SQLITE_SQL:
+        schema_editor.execute(sql)
+
+
+def occupy_until_end_date(apps, schema_editor):
+    previous.drop_overlap_constraint(apps, schema_editor)
+    previous.add_overlap_constraint(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0018_lease_start_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(occupy_last_month, occupy_until_end_date),
+    ]
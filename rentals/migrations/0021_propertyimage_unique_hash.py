@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:38
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+
+
+def drop_duplicate_images(apps, schema_editor):
+    # Concurrent uploads could attach the same photo twice; keep the oldest row.
+    # The extra rows' files are left in storage.
+    Property = apps.get_model("rentals", "Property")
+    PropertyImage = apps.get_model("rentals", "PropertyImage")
+    duplicates = (
+        PropertyImage.objects.exclude(content_hash="").values("property", "content_hash")
+        .annotate(n=Count("pk"), keep=Min("pk")).filter(n__gt=1)
+    )
+    properties = set()
+    for row in duplicates:
+        PropertyImage.objects.filter(
+            property=row["property"], content_hash=row["content_hash"], pk__gt=row["keep"],
+        ).delete()
+        properties.add(row["property"])
+    images = PropertyImage.objects.filter(property=OuterRef("pk"))
+    Property.objects.filter(pk__in=properties).update(
+        image_count=Subquery(images.order_by().values("property").annotate(n=Count("pk")).values("n")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0020_data_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_images, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='propertyimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('content_hash', ''), _negated=True), fields=('property', 'content_hash'), name='image_property_hash_unique'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+NAMES = ("properties", "leases")
+
+
+def seed_versions(apps, schema_editor):
+    # rentals.versions.bump() then only ever UPDATEs its row.
+    DataVersion = apps.get_model("rentals", "DataVersion")
+    DataVersion.objects.bulk_create([DataVersion(name=name) for name in NAMES], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rentals', '0021_propertyimage_unique_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_versions, migrations.RunPython.noop),
+    ]
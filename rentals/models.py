@@ -1,9 +1,10 @@
 from django.conf import settings
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from datetime import date, timedelta
+from decimal import Decimal
 from django.core.validators import MinValueValidator
 from django.urls import reverse
 from django.contrib.auth.models import User
@@ -25,6 +26,7 @@ class Profile(models.Model):
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 
 
 class Property(models.Model):
@@ -38,10 +40,46 @@ class Property(models.Model):
     landlord = models.ForeignKey(User, on_delete=models.CASCADE)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the landlord deletes it; the rows are then purged by a
+    # background job (rentals.deletion) and the property is hidden meanwhile.
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Bumped on every save and whenever its images change; used as the
+    # Last-Modified/ETag validator for API responses.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Denormalized from PropertyImage so the listings grid doesn't have to
+    # query the images table for every card. Kept current by signals below.
+    cover_image = models.ImageField(upload_to="property_images/", blank=True, editable=False)
+    image_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Weighted tsvector over title/address/description. On Postgres it's kept
+    # current by a trigger and GIN indexed (see migration 0006); unused elsewhere.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], condition=models.Q(is_active=True), name="property_active_created_idx"),
+            models.Index(fields=["monthly_rent", "bedrooms"], condition=models.Q(is_active=True), name="property_active_rent_idx"),
+            models.Index(fields=["bedrooms", "bathrooms", "monthly_rent"], condition=models.Q(is_active=True), name="property_active_rooms_idx"),
+            models.Index(fields=["sqft", "monthly_rent"], condition=models.Q(is_active=True), name="property_active_sqft_idx"),
+        ]
 
     def first_image(self):
-        img = self.images.first()
-        return img.image.url if img else None
+        return self.cover_image.url if self.cover_image else None
+
+    def refresh_image_summary(self):
+        images = self.images.order_by("pk")
+        first = images.first()
+        self.image_count = images.count()
+        self.cover_image = first.image.name if first else ""
+        self.updated_at = timezone.now()
+        Property.objects.filter(pk=self.pk).update(
+            image_count=self.image_count,
+            cover_image=self.cover_image,
+            updated_at=self.updated_at,
+        )
+        from . import versions
+        versions.bump()
 
     def __str__(self):
         return self.title
@@ -50,6 +88,19 @@ class Property(models.Model):
 class PropertyImage(models.Model):
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="property_images/")
+    # sha256 of the uploaded bytes, used to skip duplicate uploads.
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
+    # Filled in by rentals.images after upload: {"card": {"width", "height", "jpeg", "webp"}, "detail": {...}}
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    variant_files = models.JSONField(default=list, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["property", "content_hash"], condition=~models.Q(content_hash=""),
+                name="image_property_hash_unique",
+            ),
+        ]
 
     def __str__(self):
         return f"Image of {self.property.title}"
@@ -70,13 +121,21 @@ class Application(models.Model):
     status = models.CharField(max_length=20, choices=APPLICATION_STATUS, default="PENDING")
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-submitted_at", "-id"], name="application_submitted_idx"),
+            # Inbox filtered by property and status, newest first.
+            models.Index(fields=["rental_property", "status", "-submitted_at", "-id"], name="application_inbox_idx"),
+        ]
+
     def __str__(self):
         return f"{self.tenant.username} -> {self.rental_property.title} ({self.status})"
 
 
 
 class Lease(models.Model):
-    application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name="lease")
+    # Renewal leases (created by expire_leases) have no application of their own.
+    application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name="lease", null=True, blank=True)
     tenant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="leases")
     rental_property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="leases")
     start_date = models.DateField()
@@ -85,6 +144,24 @@ class Lease(models.Model):
     security_deposit = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Renewed for another DEFAULT_LEASE_MONTHS when it expires.
+    auto_renew = models.BooleanField(default=False)
+    renewal_of = models.OneToOneField(
+        "self", on_delete=models.SET_NULL, null=True, blank=True, related_name="renewal", editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="lease_created_idx"),
+            # Admin date hierarchy and ordering.
+            models.Index(fields=["start_date", "id"], name="lease_start_idx"),
+            models.Index(fields=["end_date", "id"], condition=models.Q(is_active=True), name="lease_active_end_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(start_date__lte=models.F("end_date")), name="lease_period_valid"),
+            # Overlapping active leases are refused by a backend-specific
+            # exclusion constraint / trigger, see rentals.availability.
+        ]
 
     def __str__(self):
         return f"Lease: {self.rental_property.title} - {self.tenant.username}"
@@ -95,6 +172,22 @@ class Lease(models.Model):
 
 
 
+class LeaseBalance(models.Model):
+    # Payment totals for one lease, kept current by rentals.balances.
+    lease = models.OneToOneField(Lease, on_delete=models.CASCADE, related_name="balance")
+    total_scheduled = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    outstanding = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    overdue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    late_fees = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    next_due_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Balance for lease {self.lease_id}"
+
+
+
 PAYMENT_STATUS = (
     ("DUE", "Due"),
     ("PAID", "Paid"),
@@ -112,6 +205,10 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ["due_date"]
+        indexes = [
+            models.Index(fields=["status", "due_date"], name="payment_status_due_idx"),
+            models.Index(fields=["due_date", "id"], name="payment_due_idx"),
+        ]
 
     def __str__(self):
         return f"Payment {self.due_date} - {self.amount} ({self.status})"
@@ -129,6 +226,135 @@ class Payment(models.Model):
                 self.save()
 
 
+def overdue_candidates(queryset, today=None):
+    """DUE payments past their grace period, i.e. what the sweep would mark overdue."""
+    today = today or date.today()
+    grace = timedelta(days=int(getattr(settings, "PAYMENT_GRACE_DAYS", 5)))
+    return queryset.filter(status="DUE", due_date__lt=today - grace)
+
+
+def sweep_overdue_payments(queryset=None, today=None):
+    """
+    Set-based version of Payment.apply_overdue_logic.
+
+    Marks DUE payments past their grace period as OVERDUE and adds the late fee
+    once, using two UPDATEs. Only rows past their cutoff match, so it's safe to
+    call on every request, and re-running it (even from several workers at once)
+    can't charge the fee twice because the status check is part of the UPDATE.
+    The affected leases' balances are refreshed in the same transaction.
+    """
+    if queryset is None:
+        queryset = Payment.objects.all()
+    percent = Decimal(int(getattr(settings, "LATE_FEE_PERCENT", 5)))
+
+    late = overdue_candidates(queryset, today)
+    with transaction.atomic():
+        lease_ids = set(late.order_by().values_list("lease_id", flat=True).distinct())
+        if not lease_ids:
+            return 0
+        charged = late.filter(late_fee_applied=False).update(
+            status="OVERDUE",
+            amount=models.F("amount") + models.F("amount") * percent / Decimal(100),
+            late_fee_applied=True,
+        )
+        flagged = late.update(status="OVERDUE")
+
+        from .balances import refresh
+        refresh(lease_ids)
+    return charged + flagged
+
+
+def expire_leases(today=None, batch_size=500):
+    """
+    Deactivates active leases whose last paid month (end_date is its due
+    date) has ended, in batches, and
+    creates the renewal lease plus its payment schedule for those with
+    auto_renew. Each batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED
+    and committed on its own, so several workers can run this at once without
+    processing a lease twice. Returns (expired, renewed).
+    """
+    today = today or date.today()
+    months = int(getattr(settings, "DEFAULT_LEASE_MONTHS", 12))
+    # The renewal starts add_months(end_date, 1), so expire only once that day comes.
+    ended_by = add_months(today, -1)
+    expired = renewed = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Lease.objects
+                .select_for_update(skip_locked=True, of=("self",))
+                # Soft-deleted properties' leases were taken off the counters and await the purge.
+                .filter(is_active=True, end_date__lte=ended_by, rental_property__deleted_at__isnull=True)
+                .annotate(landlord_id=models.F("rental_property__landlord_id"))
+                .only("tenant_id", "rental_property_id", "end_date", "monthly_rent", "security_deposit", "auto_renew")
+                .order_by("end_date", "pk")[:batch_size]
+            )
+            if not batch:
+                break
+
+            Lease.objects.filter(pk__in=[lease.pk for lease in batch]).update(is_active=False)
+
+            renewals = []
+            for lease in batch:
+                if lease.auto_renew:
+                    start = add_months(lease.end_date, 1)
+                    renewals.append(Lease(
+                        renewal_of=lease,
+                        tenant_id=lease.tenant_id,
+                        rental_property_id=lease.rental_property_id,
+                        start_date=start,
+                        end_date=add_months(start, months - 1),
+                        monthly_rent=lease.monthly_rent,
+                        security_deposit=lease.security_deposit,
+                        auto_renew=True,
+                    ))
+            try:
+                with transaction.atomic():
+                    renewals = Lease.objects.bulk_create(renewals)
+            except IntegrityError as exc:
+                from .availability import is_overlap_error
+                if not is_overlap_error(exc):
+                    raise
+                # Some property is already booked after the old lease; renew the others.
+                renewals = [lease for lease in renewals if save_unless_overlapping(lease)]
+            Payment.objects.bulk_create([p for lease in renewals for p in build_payment_schedule(lease)])
+
+            # Bulk writes skip the counter and balance signals.
+            from .balances import refresh
+            from .counters import adjust
+            refresh([lease.pk for lease in renewals])
+            deltas = {}
+            for lease in batch:
+                d = deltas.setdefault(lease.landlord_id, {"active_leases": 0, "due_payments": 0})
+                d["active_leases"] -= 1
+            for new in renewals:
+                d = deltas[new.renewal_of.landlord_id]
+                d["active_leases"] += 1
+                d["due_payments"] += new.months
+            for landlord_id, d in deltas.items():
+                adjust(landlord_id, **d)
+            from . import versions
+            versions.bump(versions.LEASES)
+
+        expired += len(batch)
+        renewed += len(renewals)
+    return expired, renewed
+
+
+
+def save_unless_overlapping(lease):
+    """Saves the lease in a savepoint; returns False if it overlaps an active lease."""
+    from .availability import is_overlap_error
+    try:
+        with transaction.atomic():
+            lease.save()
+    except IntegrityError as exc:
+        if not is_overlap_error(exc):
+            raise
+        return False
+    return True
+
 
 MAINT_STATUS = (
     ("OPEN", "Open"),
@@ -145,29 +371,209 @@ class MaintenanceTicket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="ticket_created_idx"),
+        ]
+
     def __str__(self):
         return f"Ticket #{self.pk} - {self.title} ({self.status})"
 
 
 
+class DashboardCounter(models.Model):
+    # Per-landlord tallies for the dashboard, kept current by rentals.counters.
+    landlord = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="dashboard_counter")
+    total_properties = models.IntegerField(default=0)
+    pending_applications = models.IntegerField(default=0)
+    active_leases = models.IntegerField(default=0)
+    due_payments = models.IntegerField(default=0)
+    open_tickets = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Counters for {self.landlord_id}"
+
+
+class DataVersion(models.Model):
+    # Bumped on every write to the data behind a set of pages; the validator
+    # for listings and API list responses (see rentals.versions).
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance, role="TENANT")
 
 
+@receiver(post_save, sender=PropertyImage)
+def property_image_saved(sender, instance, created, **kwargs):
+    if created:
+        instance.property.refresh_image_summary()
 
-@transaction.atomic
-def generate_payment_schedule(lease: Lease):
-    start = lease.start_date
-    for i in range(lease.months):
-        month = (start.month - 1 + i) % 12 + 1
-        year = start.year + ((start.month - 1 + i) // 12)
-        day = min(start.day, 28)
-        due = date(year, month, day)
-        Payment.objects.create(
+
+@receiver(post_delete, sender=PropertyImage)
+def property_image_deleted(sender, instance, origin=None, **kwargs):
+    # Nothing to keep in sync when the property itself is being deleted.
+    if isinstance(origin, Property):
+        return
+    instance.property.refresh_image_summary()
+
+
+
+def add_months(start: date, months: int) -> date:
+    month = (start.month - 1 + months) % 12 + 1
+    year = start.year + ((start.month - 1 + months) // 12)
+    day = min(start.day, 28)  # avoiding 30/31 overflow
+    return date(year, month, day)
+
+
+def build_payment_schedule(lease: Lease):
+    # Unsaved Payment rows, one per month of the lease.
+    return [
+        Payment(
             lease=lease,
-            due_date=due,
+            due_date=add_months(lease.start_date, i),
             amount=lease.monthly_rent,
             status="DUE",
         )
+        for i in range(lease.months)
+    ]
+
+
+@transaction.atomic
+def generate_payment_schedule(lease: Lease):
+    payments = Payment.objects.bulk_create(build_payment_schedule(lease))
+    from .balances import refresh
+    refresh([lease.pk])
+    return payments
+
+
+@transaction.atomic
+def approve_applications(applications, start=None):
+    """
+    Approves already-validated PENDING applications and creates their leases
+    and payment schedules. Uses one UPDATE and two bulk INSERTs however many
+    applications are passed in.
+    """
+    if not applications:
+        return []
+
+    months = int(getattr(settings, "DEFAULT_LEASE_MONTHS", 12))
+    start = start or date.today()
+    end = add_months(start, months - 1)
+
+    Application.objects.filter(pk__in=[a.pk for a in applications]).update(status="APPROVED")
+    for app in applications:
+        app.status = "APPROVED"
+
+    leases = Lease.objects.bulk_create([
+        Lease(
+            application=app,
+            tenant_id=app.tenant_id,
+            rental_property_id=app.rental_property_id,
+            start_date=start,
+            end_date=end,
+            monthly_rent=app.rental_property.monthly_rent,
+            security_deposit=app.rental_property.monthly_rent,  # using same as rent
+            is_active=True,
+        )
+        for app in applications
+    ])
+
+    payments = Payment.objects.bulk_create([p for lease in leases for p in build_payment_schedule(lease)])
+
+    # Bulk writes skip the counter and balance signals, so update both here.
+    from .balances import refresh
+    from .counters import adjust
+    refresh([lease.pk for lease in leases])
+    per_landlord = {}
+    for app, lease in zip(applications, leases):
+        per_landlord.setdefault(app.rental_property.landlord_id, []).append(lease)
+    for landlord_id, landlord_leases in per_landlord.items():
+        adjust(
+            landlord_id,
+            pending_applications=-len(landlord_leases),
+            active_leases=len(landlord_leases),
+            due_payments=sum(lease.months for lease in landlord_leases),
+        )
+    from . import versions
+    versions.bump(versions.LEASES)
+    return leases
+
+
+@transaction.atomic
+def reject_competing_applications(property_ids, keep=()):
+    """
+    Rejects every PENDING application on the given properties (except the
+    keep ids) with a single UPDATE. Returns how many were rejected.
+    """
+    competing = (
+        Application.objects
+        .select_for_update(of=("self",))
+        .filter(rental_property_id__in=list(property_ids), status="PENDING")
+        .exclude(pk__in=list(keep))
+    )
+    rows = list(competing.values_list("pk", "rental_property__landlord_id"))
+    if not rows:
+        return 0
+    Application.objects.filter(pk__in=[pk for pk, _ in rows]).update(status="REJECTED")
+
+    # The UPDATE skips the counter signals.
+    from .counters import adjust
+    per_landlord = {}
+    for _, landlord_id in rows:
+        per_landlord[landlord_id] = per_landlord.get(landlord_id, 0) + 1
+    for landlord_id, count in per_landlord.items():
+        adjust(landlord_id, pending_applications=-count)
+    return len(rows)
+
+
+JOB_STATUS = (
+    ("QUEUED", "Queued"),
+    ("RUNNING", "Running"),
+    ("DONE", "Done"),
+    ("FAILED", "Failed"),
+)
+
+
+class Job(models.Model):
+    # Background work, run by `manage.py run_jobs` (see rentals.jobs).
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Optional dedupe key: at most one queued or running job per (task, key).
+    key = models.CharField(max_length=200, blank=True, default="")
+    status = models.CharField(max_length=10, choices=JOB_STATUS, default="QUEUED")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+    # Free-form status a long task reports through jobs.report_progress().
+    progress = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim the oldest due job first.
+            models.Index(fields=["run_at", "id"], condition=models.Q(status="QUEUED"), name="job_queued_idx"),
+            models.Index(fields=["locked_at"], condition=models.Q(status="RUNNING"), name="job_running_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "key"],
+                condition=models.Q(status__in=["QUEUED", "RUNNING"]) & ~models.Q(key=""),
+                name="job_active_key_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,139 @@
+"""
+Cache-aside store for property read models.
+
+cached(kind, pk, build) returns the cached value for one property, calling
+build() on a miss. Views keep two kinds: the HTML detail page's context and
+the JSON API's detail payload, both plain values rather than model instances.
+
+Keys are versioned twice:
+- SCHEMA_VERSION, bumped when a payload's shape changes, so a deploy never
+  reads entries written by the previous code;
+- the property's updated_at, read from the database on every lookup (one
+  primary-key query). Every write a read model depends on moves it: saves,
+  image and variant changes, soft deletes. Unlike a token kept in the cache
+  itself, every worker sees the new value as soon as the write commits, even
+  with a per-process cache backend; old entries just expire after TIMEOUT.
+An entry rebuilt from data read just after a write lands under the old
+generation, so it is never served stale.
+
+Entries are built from the primary (routers.primary_reads): a replica
+behind the write that moved the generation would otherwise have its old rows
+cached under the new one until TIMEOUT.
+
+On a miss only the worker that wins cache.add() on the key's lock rebuilds;
+the rest poll for its result instead of all querying the database at once.
+Async views use acached(), which polls with asyncio.sleep: a time.sleep in a
+sync_to_async call would hold up the one thread that every thread-sensitive
+call of the process shares.
+
+Lookups are counted in rentals_object_cache_requests{kind, result}, with
+result hit, miss or wait (served once another worker's rebuild landed).
+"""
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from prometheus_client import Counter, Histogram
+
+from .models import Property
+from .routers import primary_reads
+
+
+SCHEMA_VERSION = 2
+CACHE_ALIAS = "objects"
+KEY_PREFIX = f"rentals:obj:v{SCHEMA_VERSION}:"
+POLL_SECONDS = 0.05
+
+_MISSING = object()
+
+CACHE_REQUESTS = Counter("rentals_object_cache_requests", "Object cache lookups.", ["kind", "result"])
+CACHE_BUILD_SECONDS = Histogram(
+    "rentals_object_cache_build_seconds", "Time spent rebuilding an object cache entry.", ["kind"],
+)
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _generation(pk):
+    updated_at = Property.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+    return updated_at.isoformat() if updated_at else "none"
+
+
+def _build(kind, key, build, cache):
+    started = time.perf_counter()
+    with primary_reads():
+        value = build()
+    CACHE_BUILD_SECONDS.labels(kind).observe(time.perf_counter() - started)
+    # None (no such property) is cached too; creating it invalidates.
+    cache.set(key, value)
+    return value
+
+
+def _lookup(kind, pk, cache):
+    """(key, cached value or _MISSING, whether this worker took the rebuild lock)."""
+    key = f"{KEY_PREFIX}{kind}:{pk}:{_generation(pk)}"
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        CACHE_REQUESTS.labels(kind, "hit").inc()
+        return key, value, False
+    return key, value, cache.add(f"{key}:lock", 1, int(getattr(settings, "OBJECT_CACHE_LOCK_SECONDS", 10)))
+
+
+def _deadline():
+    return time.monotonic() + float(getattr(settings, "OBJECT_CACHE_LOCK_WAIT", 2.0))
+
+
+def cached(kind, pk, build):
+    """The cached `kind` read model of property pk, built with build() on a miss."""
+    cache = _cache()
+    key, value, locked = _lookup(kind, pk, cache)
+    if value is not _MISSING:
+        return value
+
+    if locked:
+        CACHE_REQUESTS.labels(kind, "miss").inc()
+        try:
+            return _build(kind, key, build, cache)
+        finally:
+            cache.delete(f"{key}:lock")
+
+    # Another worker is rebuilding this entry; wait for it rather than pile on.
+    deadline = _deadline()
+    while time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            CACHE_REQUESTS.labels(kind, "wait").inc()
+            return value
+    CACHE_REQUESTS.labels(kind, "miss").inc()
+    return _build(kind, key, build, cache)
+
+
+async def acached(kind, pk, build):
+    """cached() for async views; build() is sync and runs via sync_to_async."""
+    cache = _cache()
+    key, value, locked = await sync_to_async(_lookup)(kind, pk, cache)
+    if value is not _MISSING:
+        return value
+
+    if locked:
+        CACHE_REQUESTS.labels(kind, "miss").inc()
+        try:
+            return await sync_to_async(_build)(kind, key, build, cache)
+        finally:
+            await cache.adelete(f"{key}:lock")
+
+    deadline = _deadline()
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_SECONDS)
+        value = await cache.aget(key, _MISSING)
+        if value is not _MISSING:
+            CACHE_REQUESTS.labels(kind, "wait").inc()
+            return value
+    CACHE_REQUESTS.labels(kind, "miss").inc()
+    return await sync_to_async(_build)(kind, key, build, cache)
+
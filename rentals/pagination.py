@@ -0,0 +1,154 @@
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import BadRequest, FieldDoesNotExist
+from django.db.models import Q
+from django.shortcuts import render
+
+
+CURSOR_SALT = "rentals.pagination.cursor"
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, next_url):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.next_url = next_url
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def get_page_size(request, default=None):
+    size = default or int(getattr(settings, "LIST_PAGE_SIZE", 25))
+    maximum = int(getattr(settings, "LIST_MAX_PAGE_SIZE", 100))
+    try:
+        size = int(request.GET.get("page_size", size))
+    except ValueError:
+        pass
+    return max(1, min(size, maximum))
+
+
+def _ordering(qs):
+    # Uses the queryset's own order_by and always ends on pk so ties are stable.
+    ordering = list(qs.query.order_by) or list(qs.model._meta.ordering)
+    names = [o.lstrip("-") for o in ordering]
+    if "pk" not in names and "id" not in names:
+        desc = ordering[-1].startswith("-") if ordering else False
+        ordering.append("-pk" if desc else "pk")
+    return [(o.lstrip("-"), o.startswith("-")) for o in ordering]
+
+
+def _field(model, name):
+    if name == "pk":
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None  # annotation, e.g. search rank
+
+
+def _encode(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(obj, ordering):
+    values = []
+    for name, _ in ordering:
+        field = _field(type(obj), name)
+        values.append(_encode(getattr(obj, field.attname if field else name)))
+    return signing.dumps(values, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token, model, ordering):
+    try:
+        values = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise BadRequest("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise BadRequest("Invalid cursor.")
+
+    decoded = []
+    for (name, _), value in zip(ordering, values):
+        field = _field(model, name)
+        decoded.append(field.to_python(value) if field else value)
+    return decoded
+
+
+def _after(ordering, values):
+    # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y), with per-column direction.
+    condition = Q()
+    equal = Q()
+    for (name, desc), value in zip(ordering, values):
+        lookup = f"{name}__lt" if desc else f"{name}__gt"
+        condition |= equal & Q(**{lookup: value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def _window(request, qs, page_size):
+    ordering = _ordering(qs)
+    qs = qs.order_by(*[f"-{name}" if desc else name for name, desc in ordering])
+
+    token = request.GET.get("cursor")
+    if token:
+        qs = qs.filter(_after(ordering, decode_cursor(token, qs.model, ordering)))
+
+    size = get_page_size(request, page_size)
+    return qs[:size + 1], ordering, size
+
+
+def _page(request, items, ordering, size):
+    next_cursor = next_url = None
+    if len(items) > size:
+        items = items[:size]
+        next_cursor = encode_cursor(items[-1], ordering)
+        params = request.GET.copy()
+        params.pop("fragment", None)
+        params["cursor"] = next_cursor
+        next_url = f"{request.path}?{params.urlencode()}"
+
+    return KeysetPage(items, next_cursor, next_url)
+
+
+def paginate(request, qs, page_size=None):
+    """
+    Keyset (cursor) pagination over an ordered queryset.
+
+    Fetches one extra row to know whether there's a next page, so there is no
+    OFFSET scan and no COUNT(*). The ``cursor`` query parameter is an opaque,
+    signed token holding the ordering values of the last row of the previous page.
+    """
+    window, ordering, size = _window(request, qs, page_size)
+    return _page(request, list(window), ordering, size)
+
+
+async def apaginate(request, qs, page_size=None):
+    """Async version of paginate() for async views."""
+    window, ordering, size = _window(request, qs, page_size)
+    return _page(request, [obj async for obj in window], ordering, size)
+
+
+def render_page(request, template, fragment, context):
+    """
+    Renders the full page, or only the items fragment for "load more"
+    requests (``?fragment=1``). The next page URL travels in a header.
+    """
+    if request.GET.get("fragment"):
+        response = render(request, fragment, context)
+        response["X-Next-Url"] = context["page"].next_url or ""
+        return response
+    return render(request, template, context)
@@ -0,0 +1,158 @@
+"""
+Read-replica routing.
+
+ReplicaRouter sends writes to "default" (the primary). Reads go to a random
+READ_REPLICAS alias only while ReplicaRoutingMiddleware is handling a GET/HEAD
+request for one of REPLICA_READ_VIEWS (listings, property detail, exports,
+the JSON API); everything else (other views, jobs, management commands)
+reads from the primary.
+
+Replicas lag behind, so a client that just wrote would not see its own
+change there. Reads fall back to the primary:
+- for the rest of a request once it has written, or inside a transaction;
+- for REPLICA_STICKY_SECONDS afterwards, through a cookie set on the
+  response of any request that wrote;
+- inside primary_reads(), which rentals.object_cache uses so a lagging
+  replica's rows never get cached as current.
+
+Every decision is counted in rentals_db_routes{operation, database, reason}.
+"""
+import contextlib
+import contextvars
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import StreamingHttpResponse
+from django.urls import Resolver404, resolve
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from prometheus_client import Counter
+
+
+STICKY_COOKIE = "primary_reads"
+
+DB_ROUTES = Counter("rentals_db_routes", "Database routing decisions.", ["operation", "database", "reason"])
+
+
+class RouteState:
+    def __init__(self, replica_ok=False, sticky=False):
+        self.replica_ok = replica_ok
+        self.sticky = sticky
+        self.wrote = False
+
+
+_state = contextvars.ContextVar("rentals_db_route", default=None)
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """Sends every read inside the block to the primary."""
+    token = _state.set(RouteState())
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def replicas():
+    return list(getattr(settings, "READ_REPLICAS", []))
+
+
+def _read_target():
+    state = _state.get()
+    if state is None or not state.replica_ok:
+        return DEFAULT_DB_ALIAS, "primary"
+    if state.wrote:
+        return DEFAULT_DB_ALIAS, "wrote"
+    if state.sticky:
+        return DEFAULT_DB_ALIAS, "sticky"
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS, "atomic"
+    aliases = replicas()
+    if not aliases:
+        return DEFAULT_DB_ALIAS, "primary"
+    return random.choice(aliases), "replica"
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias, reason = _read_target()
+        DB_ROUTES.labels("read", alias, reason).inc()
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        DB_ROUTES.labels("write", DEFAULT_DB_ALIAS, "write").inc()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        pool = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+
+def _in_context(context, iterator):
+    # Streaming bodies (exports) are read after the middleware returned.
+    iterator = iter(iterator)
+    while True:
+        try:
+            chunk = context.run(next, iterator)
+        except StopIteration:
+            return
+        yield chunk
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.route(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+            context = contextvars.copy_context()
+        finally:
+            _state.reset(token)
+        return self.finish(state, context, response)
+
+    async def __acall__(self, request):
+        state = self.route(request)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+            context = contextvars.copy_context()
+        finally:
+            _state.reset(token)
+        return self.finish(state, context, response)
+
+    def route(self, request):
+        sticky = STICKY_COOKIE in request.COOKIES
+        if request.method not in ("GET", "HEAD") or not replicas():
+            return RouteState(sticky=sticky)
+        try:
+            view = resolve(request.path_info).view_name
+        except Resolver404:
+            return RouteState(sticky=sticky)
+        return RouteState(replica_ok=view in getattr(settings, "REPLICA_READ_VIEWS", ()), sticky=sticky)
+
+    def finish(self, state, context, response):
+        if isinstance(response, StreamingHttpResponse) and not response.is_async:
+            response.streaming_content = _in_context(context, response.streaming_content)
+        if state.wrote:
+            response.set_cookie(
+                STICKY_COOKIE, "1", max_age=int(getattr(settings, "REPLICA_STICKY_SECONDS", 10)),
+                httponly=True, samesite="Lax",
+            )
+        return response
@@ -0,0 +1,55 @@
+from datetime import date
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
+
+from .availability import available_between
+
+
+SEARCH_CONFIG = "english"
+
+
+def search_properties(qs, params):
+    """
+    Applies PropertySearchForm.cleaned_data to a Property queryset.
+
+    On Postgres the text query runs against the trigger-maintained
+    ``search_vector`` column (GIN indexed) and results are ranked. Other
+    backends (SQLite in local tests) fall back to icontains matching.
+    """
+    if params.get("min_rent") is not None:
+        qs = qs.filter(monthly_rent__gte=params["min_rent"])
+    if params.get("max_rent") is not None:
+        qs = qs.filter(monthly_rent__lte=params["max_rent"])
+    if params.get("bedrooms") is not None:
+        qs = qs.filter(bedrooms__gte=params["bedrooms"])
+    if params.get("bathrooms") is not None:
+        qs = qs.filter(bathrooms__gte=params["bathrooms"])
+    if params.get("min_sqft") is not None:
+        qs = qs.filter(sqft__gte=params["min_sqft"])
+    if params.get("max_sqft") is not None:
+        qs = qs.filter(sqft__lte=params["max_sqft"])
+    if params.get("available_from") or params.get("available_to"):
+        start = params.get("available_from") or date.today()
+        qs = available_between(qs, start, params.get("available_to") or start)
+
+    text = (params.get("q") or "").strip()
+    if not text:
+        return qs.order_by("-created_at")
+
+    if connection.vendor == "postgresql":
+        query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            qs.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-created_at")
+        )
+
+    for term in text.split():
+        qs = qs.filter(
+            Q(title__icontains=term)
+            | Q(address__icontains=term)
+            | Q(description__icontains=term)
+        )
+    return qs.order_by("-created_at")
@@ -0,0 +1,24 @@
+"""
+Handlers for background jobs (rentals.jobs). Imported from AppConfig.ready so
+web processes can enqueue them and workers can run them.
+"""
+from .deletion import purge_property
+from .images import generate_variants
+from .jobs import task
+from .models import sweep_overdue_payments
+
+
+@task("generate_image_variants")
+def generate_image_variants(image_id):
+    generate_variants(image_id)
+
+
+@task("sweep_overdue_payments")
+def sweep_overdue():
+    sweep_overdue_payments()
+
+
+@task("purge_property")
+def purge(property_id, landlord_id=None):
+    # landlord_id is only there so the owner can follow progress (views.property_deletion).
+    purge_property(property_id)
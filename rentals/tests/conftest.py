@@ -0,0 +1,21 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    # Going over a view's QUERY_BUDGETS entry fails the test instead of logging.
+    settings.QUERY_BUDGET_MODE = "raise"
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Uploads and image variants go to a per-test directory, not BASE_DIR/media.
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached pages and objects are keyed by data versions that can repeat across tests.
+    for cache in caches.all():
+        cache.clear()
@@ -0,0 +1,49 @@
+import pytest
+from datetime import date
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.admin import EstimatedCountPaginator, PaymentInline
+from rentals.models import Application, Payment, Property, approve_applications
+
+
+@pytest.fixture
+def lease(db):
+    landlord = User.objects.create_user("l", password="x")
+    tenant = User.objects.create_user("tenant", password="x")
+    prop = Property.objects.create(
+        title="Harbour View", address="X", monthly_rent=1000, bedrooms=2, bathrooms=1, sqft=900, landlord=landlord,
+    )
+    app = Application.objects.create(rental_property=prop, tenant=tenant, message="m")
+    [lease] = approve_applications([app], start=date(2024, 1, 1))
+    return lease
+
+
+@pytest.mark.django_db
+def test_lease_page_shows_only_recent_payments(admin_client, lease, monkeypatch):
+    monkeypatch.setattr(PaymentInline, "max_rows", 5)
+    resp = admin_client.get(reverse("admin:rentals_lease_change", args=[lease.pk]))
+    assert resp.status_code == 200
+    formset = resp.context["inline_admin_formsets"][0].formset
+    newest = Payment.objects.filter(lease=lease).order_by("-due_date", "-id")[:5]
+    assert [form.instance for form in formset.forms] == list(newest)
+    assert f"lease__id__exact={lease.pk}" in resp.content.decode()
+
+
+@pytest.mark.django_db
+def test_payment_changelist_and_autocomplete(admin_client, lease, django_assert_max_num_queries):
+    url = reverse("admin:rentals_payment_changelist")
+    # Joins instead of a query per row's lease, tenant and property.
+    with django_assert_max_num_queries(10):
+        resp = admin_client.get(url, {"lease__id__exact": lease.pk})
+    assert resp.context["cl"].result_count == lease.months
+    assert isinstance(resp.context["cl"].paginator, EstimatedCountPaginator)
+
+    resp = admin_client.get(url, {"due_date__year": 2024, "due_date__month": 3})
+    assert [p.due_date for p in resp.context["cl"].result_list] == [date(2024, 3, 1)]
+    resp = admin_client.get(url, {"q": "TENANT"})
+    assert resp.context["cl"].result_count == lease.months
+
+    resp = admin_client.get(reverse("admin:autocomplete"), {
+        "app_label": "rentals", "model_name": "payment", "field_name": "lease", "term": "Harbour",
+    })
+    assert [r["id"] for r in resp.json()["results"]] == [str(lease.pk)]
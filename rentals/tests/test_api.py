@@ -0,0 +1,70 @@
+import pytest
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.tests.test_listings import add_image, make_property
+
+
+@pytest.mark.django_db
+def test_property_list_filters_and_paginates(client):
+    landlord = User.objects.create_user("l", password="x")
+    for i in range(3):
+        make_property(landlord, title=f"P{i}")
+    cheap = make_property(landlord, title="Cheap")
+    cheap.monthly_rent = 300
+    cheap.save()
+
+    data = client.get(reverse("rentals:api_properties"), {"page_size": 2}).json()
+    assert [r["title"] for r in data["results"]] == ["Cheap", "P2"]
+    assert data["results"][0]["url"] == reverse("rentals:api_property_detail", args=[cheap.pk])
+
+    rest = client.get(data["next"]).json()
+    assert [r["title"] for r in rest["results"]] == ["P1", "P0"]
+    assert rest["next"] is None
+
+    filtered = client.get(reverse("rentals:api_properties"), {"max_rent": 500}).json()
+    assert [r["title"] for r in filtered["results"]] == ["Cheap"]
+
+    assert client.get(reverse("rentals:api_properties"), {"cursor": "junk"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_property_list_etag_tracks_changes(client):
+    landlord = User.objects.create_user("l", password="x")
+    other = make_property(landlord, title="Other")
+    prop = make_property(landlord)
+    url = reverse("rentals:api_properties")
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    prop.title = "Renamed"
+    prop.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert changed.status_code == 200
+    assert changed.json()["results"][0]["title"] == "Renamed"
+
+    # Deleting a row keeps MAX(updated_at) but must still change the ETag.
+    other.delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=changed["ETag"]).status_code == 200
+
+
+@pytest.mark.django_db
+def test_property_detail_includes_images_and_revalidates(client):
+    landlord = User.objects.create_user("l", password="x")
+    prop = make_property(landlord)
+    url = reverse("rentals:api_property_detail", args=[prop.pk])
+
+    first = client.get(url)
+    assert first.json()["images"] == []
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code == 304
+
+    add_image(prop)
+    resp = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert resp.status_code == 200
+    assert len(resp.json()["images"]) == 1
+    assert resp["ETag"] != first["ETag"]
+
+    prop.is_active = False
+    prop.save()
+    assert client.get(url).status_code == 404
@@ -0,0 +1,112 @@
+import importlib
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import clear_url_caches, resolve, reverse
+from rentals.middleware import QueryBudgetExceeded
+from rentals.tests.test_listings import add_image, make_property
+
+
+def reload_urls():
+    import rental_portal.urls
+    import rentals.urls
+    importlib.reload(rentals.urls)
+    importlib.reload(rental_portal.urls)
+    clear_url_caches()
+
+
+@contextmanager
+def async_routes(settings):
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    try:
+        yield
+    finally:
+        settings.ASYNC_VIEWS = False
+        reload_urls()
+
+
+@pytest.mark.django_db
+def test_async_api_matches_sync(client, async_client, settings):
+    landlord = User.objects.create_user("l", password="x")
+    prop = make_property(landlord)
+    add_image(prop)
+    list_url = reverse("rentals:api_properties")
+    detail_url = reverse("rentals:api_property_detail", args=[prop.pk])
+    sync_list, sync_detail = client.get(list_url), client.get(detail_url)
+
+    with async_routes(settings):
+        assert iscoroutinefunction(resolve(list_url).func)
+        get = async_to_sync(async_client.get)
+        async_list, async_detail = get(list_url), get(detail_url)
+
+        assert async_list.json() == sync_list.json()
+        assert async_detail.json() == sync_detail.json()
+        assert async_list["ETag"] == sync_list["ETag"]
+        assert get(detail_url, headers={"if-none-match": sync_detail["ETag"]}).status_code == 304
+        assert get(reverse("rentals:api_property_detail", args=[prop.pk + 1])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_pages_render_and_cache(async_client, settings):
+    landlord = User.objects.create_user("l", password="x")
+    prop = make_property(landlord, title="Async flat")
+
+    with async_routes(settings):
+        get = async_to_sync(async_client.get)
+        listing = get(reverse("rentals:listings"))
+        assert listing.status_code == 200
+        assert b"Async flat" in listing.content
+        assert "public" in listing["Cache-Control"]
+        assert get(reverse("rentals:listings"), headers={"if-none-match": listing["ETag"]}).status_code == 304
+
+        detail = get(reverse("rentals:property_detail", args=[prop.pk]))
+        assert b"Async flat" in detail.content
+        assert get(reverse("rentals:property_detail", args=[prop.pk + 1])).status_code == 404
+
+        results = get(reverse("rentals:listings_search"), {"q": "async"}).json()["results"]
+        assert [r["id"] for r in results] == [prop.pk]
+
+
+@pytest.mark.django_db
+def test_async_requests_are_instrumented(async_client, settings):
+    landlord = User.objects.create_user("l", password="x")
+    make_property(landlord)
+    settings.QUERY_BUDGETS = {"rentals:api_properties": {"queries": 1}}
+
+    with async_routes(settings):
+        with pytest.raises(QueryBudgetExceeded):
+            async_to_sync(async_client.get)(reverse("rentals:api_properties"))
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_benchmark_concurrency_reports_each_target():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    out = StringIO()
+    try:
+        call_command(
+            "benchmark_concurrency", target=[f"local={url}"], clients=2, duration=0.3, delay=0, stdout=out,
+        )
+    finally:
+        server.shutdown()
+    line = next(l for l in out.getvalue().splitlines() if l.startswith("local"))
+    assert int(line.split()[1]) > 0
+    assert int(line.split()[2]) == 0
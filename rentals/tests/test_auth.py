@@ -0,0 +1,41 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+@pytest.mark.django_db
+def test_profile_is_loaded_with_the_user(client):
+    User.objects.create_user("t", password="x")
+    client.login(username="t", password="x")
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(reverse("rentals:payments")).status_code == 200
+
+    profile_lookups = [q["sql"] for q in ctx.captured_queries if 'FROM "rentals_profile"' in q["sql"]]
+    assert profile_lookups == []
+
+
+@pytest.mark.django_db
+def test_role_change_applies_on_next_request(client):
+    user = User.objects.create_user("t", password="x")
+    client.login(username="t", password="x")
+    assert client.get(reverse("rentals:property_create")).status_code == 403
+
+    user.profile.role = "LANDLORD"
+    user.profile.save()
+    assert client.get(reverse("rentals:property_create")).status_code == 200
+
+
+@pytest.mark.django_db
+def test_register_logs_the_user_in(client):
+    resp = client.post(reverse("accounts:register"), {
+        "username": "new",
+        "email": "new@example.com",
+        "password1": "Sup3r-secret-pw",
+        "password2": "Sup3r-secret-pw",
+        "role": "TENANT",
+    })
+    assert resp.status_code == 302
+    assert client.get(reverse("rentals:payments")).status_code == 200
@@ -0,0 +1,110 @@
+import pytest
+from datetime import date, timedelta
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.availability import available_between, vacancy_calendar
+from rentals.models import Application, Lease, Property, add_months, approve_applications, expire_leases
+
+
+def make_property(landlord, title="A"):
+    return Property.objects.create(
+        title=title, address="X", monthly_rent=1000, bedrooms=2, bathrooms=1, sqft=500, landlord=landlord,
+    )
+
+
+def lease_on(prop, tenant, start, end, **extra):
+    return Lease.objects.create(
+        tenant=tenant, rental_property=prop, start_date=start, end_date=end, monthly_rent=1000, **extra,
+    )
+
+
+@pytest.mark.django_db
+def test_database_refuses_overlapping_active_leases(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+    prop = make_property(landlord)
+
+    today = date.today()
+    start = add_months(today.replace(day=1), -1)
+    first = lease_on(prop, tenant, start, add_months(start, 11))
+    with pytest.raises(IntegrityError), transaction.atomic():
+        lease_on(prop, tenant, add_months(start, 11), add_months(start, 14))
+
+    # Adjacent periods (the next lease starts when the last paid month ends)
+    # and inactive leases don't clash.
+    later = lease_on(prop, tenant, add_months(start, 12), add_months(start, 14))
+    lease_on(prop, tenant, add_months(start, -4), add_months(start, -3), is_active=False)
+
+    later.start_date = add_months(start, 6)
+    with pytest.raises(IntegrityError), transaction.atomic():
+        later.save()
+
+    # Approving starts a lease today, inside the first one.
+    app = Application.objects.create(rental_property=prop, tenant=tenant, message="m")
+    client.login(username="l", password="x")
+    client.post(reverse("rentals:application_approve", args=[app.pk]))
+    app.refresh_from_db()
+    assert app.status == "PENDING"
+    assert prop.leases.count() == 3
+
+    # The auto-renewal would run into the lease already booked after it.
+    first.auto_renew = True
+    first.save()
+    assert expire_leases(today=add_months(start, 11), batch_size=1) == (0, 0)  # last month not over
+    assert expire_leases(today=add_months(start, 12), batch_size=1) == (1, 0)
+    assert not Lease.objects.filter(renewal_of=first).exists()
+
+
+@pytest.mark.django_db
+def test_available_between_and_vacancy_calendar(client):
+    landlord = User.objects.create_user("l", password="x")
+    tenant = User.objects.create_user("t", password="x")
+    leased = make_property(landlord, "Leased")
+    free = make_property(landlord, "Free")
+    # Due dates March 1 to May 1: occupied through May 31.
+    lease = lease_on(leased, tenant, date(2025, 3, 1), date(2025, 5, 1))
+
+    qs = Property.objects.filter(is_active=True)
+    assert list(available_between(qs, date(2025, 5, 31), date(2025, 7, 1))) == [free]
+    assert set(available_between(qs, date(2025, 6, 1), date(2025, 7, 1))) == {leased, free}
+
+    resp = client.get(reverse("rentals:listings"), {"available_from": "2025-04-01", "available_to": "2025-04-30"})
+    assert [p.title for p in resp.context["properties"]] == ["Free"]
+    assert client.get(reverse("rentals:listings"), {"available_to": "2000-01-01"}).status_code == 200
+
+    assert vacancy_calendar(leased.pk, date(2025, 1, 1), date(2025, 12, 31)) == [
+        {"start": date(2025, 1, 1), "end": date(2025, 2, 28), "lease": None},
+        {"start": date(2025, 3, 1), "end": date(2025, 5, 31), "lease": lease.pk},
+        {"start": date(2025, 6, 1), "end": date(2025, 12, 31), "lease": None},
+    ]
+
+    url = reverse("rentals:api_property_availability", args=[leased.pk])
+    data = client.get(url, {"start": "2025-04-01", "end": "2025-06-30"}).json()
+    assert data["calendar"] == [
+        {"start": "2025-04-01", "end": "2025-05-31", "available": False},
+        {"start": "2025-06-01", "end": "2025-06-30", "available": True},
+    ]
+    assert client.get(url, {"start": "2025-06-30", "end": "2025-04-01"}).status_code == 400
+    assert client.get(reverse("rentals:api_property_availability", args=[9999])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_last_paid_month_stays_occupied():
+    landlord = User.objects.create_user("l", password="x")
+    tenant = User.objects.create_user("t", password="x")
+    prop = make_property(landlord)
+    app = Application.objects.create(rental_property=prop, tenant=tenant, message="m")
+    [lease] = approve_applications([app], start=date(2026, 1, 15))
+    assert lease.end_date == date(2026, 12, 15)
+
+    qs = Property.objects.filter(is_active=True)
+    assert not available_between(qs, date(2026, 12, 20), date(2027, 1, 10)).exists()
+    assert available_between(qs, date(2027, 1, 15), date(2027, 2, 1)).exists()
+    with pytest.raises(IntegrityError), transaction.atomic():
+        lease_on(prop, tenant, date(2026, 12, 20), date(2027, 6, 20))
+    assert vacancy_calendar(prop.pk, date(2026, 12, 1), date(2027, 1, 31))[0] == {
+        "start": date(2026, 12, 1), "end": date(2027, 1, 14), "lease": lease.pk,
+    }
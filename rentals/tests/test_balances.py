@@ -0,0 +1,83 @@
+import pytest
+from datetime import date, timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.balances import BALANCE_FIELDS, compute
+from rentals.models import (
+    Application, LeaseBalance, Payment, Property, approve_applications, sweep_overdue_payments,
+)
+
+
+def balance_for(lease):
+    return LeaseBalance.objects.filter(lease=lease).values(*BALANCE_FIELDS).get()
+
+
+def make_lease(tenant_name="t"):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user(tenant_name, password="x")
+    prop = Property.objects.create(
+        title="A",
+        address="X",
+        monthly_rent=1000,
+        bedrooms=2,
+        bathrooms=1,
+        sqft=500,
+        landlord=landlord
+    )
+    app = Application.objects.create(rental_property=prop, tenant=tenant, message="a")
+    [lease] = approve_applications([app], start=date.today() - timedelta(days=40))
+    return lease
+
+
+@pytest.mark.django_db
+def test_balance_follows_payment_writes(client):
+    lease = make_lease()
+    months = lease.months
+    first, second = lease.payments.order_by("due_date")[:2]
+
+    assert balance_for(lease)["total_scheduled"] == 1000 * months
+    assert balance_for(lease)["next_due_date"] == first.due_date
+
+    client.login(username="t", password="x")
+    resp = client.post(reverse("rentals:payment_mark_paid", args=[first.pk]), {"method": "CARD"})
+    assert resp.status_code == 302
+    assert balance_for(lease)["paid"] == 1000
+    assert balance_for(lease)["next_due_date"] == second.due_date
+
+    # The second payment is ten days late: the sweep charges the fee and flags it.
+    sweep_overdue_payments(today=second.due_date + timedelta(days=10))
+    balance = balance_for(lease)
+    assert balance["overdue"] == 1050
+    assert balance["late_fees"] == 50
+    assert balance["outstanding"] == 1000 * (months - 1) + 50
+    assert balance == compute([lease.pk])[lease.pk]
+
+    data = client.get(reverse("rentals:api_leases")).json()
+    assert data["results"][0]["balance"]["late_fees"] == "50.00"
+    assert client.get(reverse("rentals:lease_dashboard")).context["leases"][0].balance.paid == 1000
+
+    second.delete()
+    assert balance_for(lease)["overdue"] == 0
+
+    client.logout()
+    assert client.get(reverse("rentals:api_leases")).status_code == 401
+
+
+@pytest.mark.django_db
+def test_verify_balances_reports_and_fixes_drift():
+    lease = make_lease()
+    call_command("verify_balances")
+
+    # Bulk updates skip the signals, so the stored balance drifts.
+    Payment.objects.filter(lease=lease).update(status="PAID")
+    with pytest.raises(CommandError):
+        call_command("verify_balances")
+
+    call_command("verify_balances", "--fix")
+    assert balance_for(lease)["paid"] == 1000 * lease.months
+    assert balance_for(lease)["next_due_date"] is None
+    call_command("verify_balances")
@@ -0,0 +1,94 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rentals import versions
+from rentals.models import Application, DataVersion, approve_applications
+from rentals.tests.test_listings import add_image, make_property
+
+
+@pytest.mark.django_db
+def test_anonymous_listings_are_cacheable_and_revalidate(client):
+    landlord = User.objects.create_user("l", password="x")
+    prop = make_property(landlord, title="Before")
+    url = reverse("rentals:listings")
+
+    first = client.get(url)
+    assert "public" in first["Cache-Control"]
+    assert "Cookie" in first["Vary"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    # A repeat without validators is served from the page cache: only the version query runs.
+    with CaptureQueriesContext(connection) as ctx:
+        again = client.get(url)
+    assert len(ctx.captured_queries) == 1
+    assert "rentals_dataversion" in ctx.captured_queries[0]["sql"]  # not a scan of the properties
+    assert again.content == first.content
+
+    prop.title = "After"
+    prop.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert changed.status_code == 200
+    assert b"After" in changed.content
+
+
+@pytest.mark.django_db
+def test_availability_filtered_lists_change_with_leases(client):
+    landlord = User.objects.create_user("l", password="x")
+    tenant = User.objects.create_user("t", password="x")
+    prop = make_property(landlord, title="Vacant")
+    params = {"available_from": date.today().isoformat()}
+    page_url, api_url = reverse("rentals:listings"), reverse("rentals:api_properties")
+
+    page, api = client.get(page_url, params), client.get(api_url, params)
+    assert b"Vacant" in page.content and len(api.json()["results"]) == 1
+
+    app = Application.objects.create(rental_property=prop, tenant=tenant, message="m")
+    approve_applications([app])
+
+    assert client.get(page_url, params, HTTP_IF_NONE_MATCH=page["ETag"]).status_code == 200
+    assert b"Vacant" not in client.get(page_url, params).content
+    assert client.get(api_url, params, HTTP_IF_NONE_MATCH=api["ETag"]).status_code == 200
+    assert client.get(api_url, params).json()["results"] == []
+
+
+@pytest.mark.django_db
+def test_property_detail_changes_with_images(client):
+    landlord = User.objects.create_user("l", password="x")
+    prop = make_property(landlord)
+    url = reverse("rentals:property_detail", args=[prop.pk])
+
+    first = client.get(url)
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code == 304
+
+    add_image(prop)
+    assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
+    assert client.get(reverse("rentals:property_detail", args=[prop.pk + 1])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_authenticated_pages_are_private(client):
+    landlord = User.objects.create_user("l", password="x")
+    make_property(landlord)
+    client.login(username="l", password="x")
+
+    resp = client.get(reverse("rentals:listings"))
+    assert "private" in resp["Cache-Control"]
+    assert not resp.has_header("ETag")
+
+
+@pytest.mark.django_db
+def test_data_versions_are_seeded_and_bumped_in_place():
+    assert set(DataVersion.objects.values_list("name", flat=True)) >= {versions.PROPERTIES, versions.LEASES}
+    before, _ = versions.current(versions.LEASES)
+    with CaptureQueriesContext(connection) as ctx:
+        versions.bump(versions.LEASES)
+    assert len(ctx.captured_queries) == 1 and ctx.captured_queries[0]["sql"].startswith("UPDATE")
+    assert versions.current(versions.LEASES)[0] == (before[0] + 1,)
+
+    # A missing row (e.g. after a table flush) is recreated and still counts the write.
+    DataVersion.objects.all().delete()
+    versions.bump()
+    assert versions.current()[0] == (1,)
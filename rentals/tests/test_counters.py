@@ -0,0 +1,75 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.counters import COUNTER_FIELDS, compute, reconcile
+from rentals.models import (
+    Application, DashboardCounter, MaintenanceTicket, Property, approve_applications,
+)
+
+
+def counters_for(user):
+    return DashboardCounter.objects.filter(landlord=user).values(*COUNTER_FIELDS).get()
+
+
+@pytest.mark.django_db
+def test_counters_follow_writes(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+
+    prop = Property.objects.create(
+        title="A",
+        address="X",
+        monthly_rent=1000,
+        bedrooms=2,
+        bathrooms=1,
+        sqft=500,
+        landlord=landlord
+    )
+    first = Application.objects.create(rental_property=prop, tenant=tenant, message="a")
+    Application.objects.create(rental_property=prop, tenant=tenant, message="b")
+    [lease] = approve_applications([first])
+
+    # Saving a row bulk_create() returned doesn't count it a second time.
+    lease.auto_renew = True
+    lease.save()
+
+    ticket = MaintenanceTicket.objects.create(lease=lease, created_by=tenant, title="t", description="d")
+    payment = lease.payments.first()
+    payment.status = "PAID"
+    payment.save()
+    ticket.status = "RESOLVED"
+    ticket.save()
+
+    assert counters_for(landlord) == compute()[landlord.pk]
+    assert counters_for(landlord)["pending_applications"] == 1
+    assert counters_for(landlord)["due_payments"] == lease.months - 1
+
+    client.login(username="l", password="x")
+    resp = client.get(reverse("rentals:admin_dashboard"))
+    assert resp.context["due_payments"] == lease.months - 1
+
+    prop.delete()
+    assert set(counters_for(landlord).values()) == {0}
+
+
+@pytest.mark.django_db
+def test_reconcile_fixes_drift():
+    landlord = User.objects.create_user("l", password="x")
+    Property.objects.create(
+        title="A",
+        address="X",
+        monthly_rent=1000,
+        bedrooms=2,
+        bathrooms=1,
+        sqft=500,
+        landlord=landlord
+    )
+    DashboardCounter.objects.filter(landlord=landlord).update(total_properties=7, open_tickets=3)
+
+    assert len(reconcile()) == 2
+    call_command("reconcile_counters")
+    assert counters_for(landlord)["total_properties"] == 1
+    assert reconcile() == []
@@ -0,0 +1,121 @@
+import pytest
+from datetime import date, timedelta
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals import jobs
+from rentals.counters import COUNTER_FIELDS, compute
+from rentals.models import (
+    Application, DashboardCounter, Job, Lease, LeaseBalance, MaintenanceTicket, Payment, Property,
+    PropertyImage, approve_applications, expire_leases,
+)
+from rentals.tests.test_file_uploads import make_jpeg
+from rentals.uploads import ingest_images
+
+
+def make_property(landlord, title):
+    return Property.objects.create(
+        title=title, address="X", monthly_rent=1000, bedrooms=2, bathrooms=1, sqft=900, landlord=landlord,
+    )
+
+
+@pytest.mark.django_db
+def test_delete_hides_property_then_purges_it_in_chunks(client, settings):
+    settings.DELETE_CHUNK_SIZE = 2
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+
+    doomed, kept = make_property(landlord, "Doomed"), make_property(landlord, "Kept")
+    ingest_images(doomed, [make_jpeg(), make_jpeg(800, 400)])
+    jobs.run_pending()
+    ingest_images(kept, [make_jpeg()])  # the same photo, stored again for this property
+    jobs.run_pending()
+    shared = PropertyImage.objects.get(property=kept)
+    doomed_images = list(PropertyImage.objects.filter(property=doomed))
+    doomed_files = [name for img in doomed_images for name in [img.image.name, *img.variant_files]]
+    assert shared.image.name not in doomed_files
+
+    app = Application.objects.create(rental_property=doomed, tenant=tenant, message="m")
+    [lease] = approve_applications([app], start=date.today() - timedelta(days=60))
+    MaintenanceTicket.objects.create(lease=lease, created_by=tenant, title="t", description="d")
+    Application.objects.create(rental_property=doomed, tenant=tenant, message="again")
+
+    client.login(username="l", password="x")
+    resp = client.post(reverse("rentals:property_delete", args=[doomed.pk]))
+    assert resp.status_code == 302
+
+    # Hidden and uncounted straight away; the rows are still there.
+    assert client.get(reverse("rentals:property_detail", args=[doomed.pk])).status_code == 404
+    counters = DashboardCounter.objects.filter(landlord=landlord).values(*COUNTER_FIELDS).get()
+    assert counters == compute()[landlord.pk]
+    assert counters["total_properties"] == 1
+    assert Payment.objects.filter(lease=lease).exists()
+    status = client.get(reverse("rentals:property_deletion", args=[doomed.pk])).json()
+    assert status == {"status": "QUEUED", "progress": {}}
+
+    assert jobs.run_pending() == 1
+
+    assert not Property.objects.filter(pk=doomed.pk).exists()
+    for model in (Lease, Payment, LeaseBalance, MaintenanceTicket, Application):
+        assert not model.objects.exists()
+    assert list(PropertyImage.objects.all()) == [shared]
+    assert all(default_storage.exists(name) for name in [shared.image.name, *shared.variant_files])
+    assert not any(default_storage.exists(name) for name in doomed_files)
+
+    status = client.get(reverse("rentals:property_deletion", args=[doomed.pk])).json()
+    progress = status["progress"]
+    assert status["status"] == "DONE" and progress["step"] == "done"
+    assert progress["deleted"] == {**progress["total"], "files": len(doomed_files)}
+    assert progress["total"]["payments"] == lease.months
+    assert Job.objects.get(task="purge_property").payload["landlord_id"] == landlord.pk
+
+
+@pytest.mark.django_db
+def test_applications_of_a_deleted_property_cannot_be_approved(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+    doomed, kept = make_property(landlord, "Doomed"), make_property(landlord, "Kept")
+    apps = [Application.objects.create(rental_property=doomed, tenant=tenant, message=str(i)) for i in range(3)]
+    Application.objects.create(rental_property=kept, tenant=tenant, message="kept")
+
+    client.login(username="l", password="x")
+    client.post(reverse("rentals:property_delete", args=[doomed.pk]))
+
+    inbox = client.get(reverse("rentals:applications")).content
+    assert b"Doomed" not in inbox and b"Kept" in inbox
+    assert client.post(reverse("rentals:application_approve", args=[apps[0].pk])).status_code == 404
+    assert client.post(reverse("rentals:application_reject", args=[apps[1].pk])).status_code == 404
+    body = client.post(
+        reverse("rentals:applications_bulk_approve"), data={"ids": [apps[2].pk]}, content_type="application/json",
+    ).json()
+    assert body["failed"] == {str(apps[2].pk): "Not found."}
+
+    assert not Lease.objects.exists()
+    assert not Application.objects.filter(rental_property=doomed).exclude(status="PENDING").exists()
+    counters = DashboardCounter.objects.filter(landlord=landlord).values(*COUNTER_FIELDS).get()
+    assert counters == compute()[landlord.pk]
+
+
+@pytest.mark.django_db
+def test_expiry_skips_leases_of_deleted_properties(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+    doomed, kept = make_property(landlord, "Doomed"), make_property(landlord, "Kept")
+    app = Application.objects.create(rental_property=doomed, tenant=tenant, message="m")
+    [lease] = approve_applications([app], start=date.today() - timedelta(days=800))
+    Lease.objects.filter(pk=lease.pk).update(auto_renew=True)
+
+    client.login(username="l", password="x")
+    client.post(reverse("rentals:property_delete", args=[doomed.pk]))
+
+    assert expire_leases() == (0, 0)
+    lease.refresh_from_db()
+    assert lease.is_active
+    counters = DashboardCounter.objects.filter(landlord=landlord).values(*COUNTER_FIELDS).get()
+    assert counters == compute()[landlord.pk]
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+import pytest
+from datetime import date
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.models import Application, Property, approve_applications
+
+
+@pytest.fixture
+def leases(db):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+
+    made = []
+    for name in ("t1", "t2"):
+        tenant = User.objects.create_user(name, password="x")
+        prop = Property.objects.create(
+            title=f"Home of {name}",
+            address="X",
+            monthly_rent=1000,
+            bedrooms=2,
+            bathrooms=1,
+            sqft=500,
+            landlord=landlord
+        )
+        app = Application.objects.create(rental_property=prop, tenant=tenant, message="m")
+        made += approve_applications([app], start=date(2024, 1, 1))
+    return made
+
+
+def test_payments_csv_is_scoped_to_tenant(client, leases):
+    client.login(username="t1", password="x")
+    resp = client.get(reverse("rentals:export", args=["payments", "csv"]))
+
+    assert resp.streaming
+    rows = list(csv.DictReader(io.StringIO(b"".join(resp.streaming_content).decode())))
+    assert len(rows) == leases[0].months
+    assert {r["tenant"] for r in rows} == {"t1"}
+
+
+def test_payments_jsonl_date_range(client, leases):
+    client.login(username="l", password="x")
+    resp = client.get(
+        reverse("rentals:export", args=["payments", "jsonl"]),
+        {"start": "2024-02-01", "end": "2024-03-31"},
+    )
+
+    rows = [json.loads(line) for line in b"".join(resp.streaming_content).splitlines()]
+    assert len(rows) == 4  # two months for each of the landlord's two leases
+    assert all("2024-02-01" <= r["due_date"] <= "2024-03-31" for r in rows)
+
+
+def test_unknown_export_is_404(client, leases):
+    client.login(username="l", password="x")
+    assert client.get(reverse("rentals:export", args=["users", "csv"])).status_code == 404
+    assert client.get(reverse("rentals:export", args=["leases", "xml"])).status_code == 404
@@ -2,6 +2,8 @@ import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from rentals import uploads
 from rentals.models import Property, PropertyImage
 
 
@@ -32,3 +34,135 @@ def test_property_file_upload(client):
 
     prop = Property.objects.first()
     assert PropertyImage.objects.filter(property=prop).exists()
+
+
+def make_jpeg(width=2000, height=1000):
+    from io import BytesIO
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.new("RGB", (width, height), "teal").save(buf, "JPEG")
+    return SimpleUploadedFile("big.jpg", buf.getvalue(), content_type="image/jpeg")
+
+
+@pytest.mark.django_db
+def test_generate_variants_stores_resized_copies(django_capture_on_commit_callbacks):
+    from rentals.images import VARIANT_WIDTHS, generate_variants
+
+    landlord = User.objects.create_user("l", password="x")
+    prop = Property.objects.create(
+        title="House", address="X", monthly_rent=1000,
+        bedrooms=2, bathrooms=1, sqft=900, landlord=landlord,
+    )
+    img = PropertyImage.objects.create(property=prop, image=make_jpeg())
+
+    assert generate_variants(img.pk)
+    img.refresh_from_db()
+
+    assert set(img.variants) == set(VARIANT_WIDTHS)
+    assert img.variants["card"]["width"] == VARIANT_WIDTHS["card"]
+    assert img.variants["card"]["webp"].endswith(".webp")
+    assert len(img.variant_files) == 2 * len(VARIANT_WIDTHS)
+    for name in img.variant_files:
+        assert img.image.storage.exists(name)
+
+    # A rerun replaces the files rather than leaving the old ones behind.
+    previous = img.variant_files
+    with django_capture_on_commit_callbacks(execute=True):
+        assert generate_variants(img.pk)
+    img.refresh_from_db()
+    assert not set(previous) & set(img.variant_files)
+    assert not any(img.image.storage.exists(name) for name in previous)
+    assert all(img.image.storage.exists(name) for name in img.variant_files)
+
+
+@pytest.mark.django_db
+def test_generate_variants_skips_unreadable_files():
+    from rentals.images import generate_variants
+
+    landlord = User.objects.create_user("l", password="x")
+    prop = Property.objects.create(
+        title="House", address="X", monthly_rent=1000,
+        bedrooms=2, bathrooms=1, sqft=900, landlord=landlord,
+    )
+    img = PropertyImage.objects.create(
+        property=prop,
+        image=SimpleUploadedFile("bad.jpg", b"filecontent", content_type="image/jpeg"),
+    )
+
+    assert not generate_variants(img.pk)
+    img.refresh_from_db()
+    assert img.variants == {}
+
+
+@pytest.mark.django_db
+def test_generate_variants_skips_decompression_bombs(monkeypatch):
+    from PIL import Image
+    from rentals.images import generate_variants
+
+    landlord = User.objects.create_user("l", password="x")
+    prop = Property.objects.create(
+        title="House", address="X", monthly_rent=1000,
+        bedrooms=2, bathrooms=1, sqft=900, landlord=landlord,
+    )
+    img = PropertyImage.objects.create(property=prop, image=make_jpeg())
+    # Over twice the limit, so Pillow raises instead of warning.
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 2000 * 1000 // 3)
+
+    assert not generate_variants(img.pk)
+    img.refresh_from_db()
+    assert img.variants == {}
+
+
+@pytest.mark.django_db
+def test_duplicate_uploads_are_stored_once(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    client.login(username="l", password="x")
+
+    def photo(name, content=b"same-bytes"):
+        return SimpleUploadedFile(name, content, content_type="image/jpeg")
+
+    form = {
+        "title": "House", "address": "X", "monthly_rent": 1000,
+        "bedrooms": 2, "bathrooms": 1, "sqft": 900, "description": "Nice",
+    }
+    client.post(reverse("rentals:property_create"), {
+        **form, "images": [photo("a.jpg"), photo("b.jpg"), photo("c.jpg", b"other")],
+    })
+    first = Property.objects.get()
+    assert first.images.count() == 2
+    assert first.image_count == 2
+
+    # Re-uploading to the same property adds nothing.
+    client.post(reverse("rentals:property_update", args=[first.pk]), {**form, "images": photo("again.jpg")})
+    assert first.images.count() == 2
+
+    # Another property keeps its own copy, so deleting either leaves the other intact.
+    client.post(reverse("rentals:property_create"), {**form, "images": photo("copy.jpg")})
+    second = Property.objects.exclude(pk=first.pk).get()
+    original = first.images.get(content_hash=second.images.get().content_hash)
+    assert second.images.get().image.name != original.image.name
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_upload_of_the_same_photo_keeps_one_row(monkeypatch):
+    landlord = User.objects.create_user("l", password="x")
+    prop = Property.objects.create(
+        title="House", address="X", monthly_rent=1000, bedrooms=2, bathrooms=1, sqft=900, landlord=landlord,
+    )
+    photo = SimpleUploadedFile("a.jpg", b"same-bytes", content_type="image/jpeg")
+    store = uploads._store
+
+    def racing_store(f):
+        # Another request attaches the photo while this one writes its copy.
+        PropertyImage.objects.bulk_create([
+            PropertyImage(property=prop, image="property_images/theirs.jpg", content_hash=uploads.content_hash(f)),
+        ])
+        return store(f)
+
+    monkeypatch.setattr(uploads, "_store", racing_store)
+    assert uploads.ingest_images(prop, [photo]) == []
+    assert list(prop.images.values_list("image", flat=True)) == ["property_images/theirs.jpg"]
+    assert default_storage.listdir("property_images")[1] == []
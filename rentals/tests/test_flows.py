@@ -1,8 +1,10 @@
+import re
+
 import pytest
 from datetime import date
 from django.urls import reverse
 from django.contrib.auth.models import User
-from rentals.models import Property, Application, Lease, Payment
+from rentals.models import Property, Application, Lease, MaintenanceTicket, Payment, approve_applications
 
 
 @pytest.mark.django_db
@@ -47,3 +49,166 @@ def test_application_to_lease_flow(client):
 
     # payments created
     assert Payment.objects.filter(lease=lease).count() > 0
+
+
+@pytest.mark.django_db
+def test_bulk_approve_reports_failures(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+
+    other = User.objects.create_user("o", password="x")
+    tenant = User.objects.create_user("t", password="x")
+
+    def make_property(owner):
+        return Property.objects.create(
+            title="A",
+            address="X",
+            monthly_rent=1200,
+            bedrooms=2,
+            bathrooms=1,
+            sqft=500,
+            landlord=owner
+        )
+
+    mine = make_property(landlord)
+    mine2 = make_property(landlord)
+    theirs = make_property(other)
+    ok1 = Application.objects.create(rental_property=mine, tenant=tenant, message="a")
+    ok2 = Application.objects.create(rental_property=mine2, tenant=tenant, message="b")
+    clash = Application.objects.create(rental_property=mine, tenant=tenant, message="e")
+    rejected = Application.objects.create(rental_property=mine, tenant=tenant, message="c", status="REJECTED")
+    foreign = Application.objects.create(rental_property=theirs, tenant=tenant, message="d")
+
+    client.login(username="l", password="x")
+    resp = client.post(
+        reverse("rentals:applications_bulk_approve"),
+        data={"ids": [ok1.pk, ok2.pk, clash.pk, rejected.pk, foreign.pk, 9999]},
+        content_type="application/json",
+    )
+
+    body = resp.json()
+    assert sorted(body["approved"]) == sorted([ok1.pk, ok2.pk])
+    assert set(body["failed"]) == {str(clash.pk), str(rejected.pk), str(foreign.pk), "9999"}
+    assert "already has an active lease" in body["failed"][str(clash.pk)]
+    clash.refresh_from_db()
+    assert clash.status == "PENDING"
+
+    assert Lease.objects.filter(application__in=[ok1, ok2]).count() == 2
+    assert not Lease.objects.filter(application=foreign).exists()
+    for lease in Lease.objects.all():
+        assert lease.payments.count() == lease.months
+
+    for ids in (5, "12", {"id": 1}):
+        resp = client.post(reverse("rentals:applications_bulk_approve"), data={"ids": ids}, content_type="application/json")
+        assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_inbox_filters_and_rejects_competing(client):
+    from rentals.counters import compute
+    from rentals.models import DashboardCounter
+
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+
+    def make_property(title):
+        return Property.objects.create(
+            title=title, address="X", monthly_rent=1200, bedrooms=2, bathrooms=1, sqft=500, landlord=landlord,
+        )
+
+    first, second = make_property("First"), make_property("Second")
+    winner = Application.objects.create(rental_property=first, tenant=tenant, message="win")
+    loser = Application.objects.create(rental_property=first, tenant=tenant, message="lose")
+    elsewhere = Application.objects.create(rental_property=second, tenant=tenant, message="other")
+    Application.objects.create(rental_property=second, tenant=tenant, message="old", status="REJECTED")
+
+    client.login(username="l", password="x")
+    inbox = reverse("rentals:applications")
+
+    # Pending only by default; decided ones need an explicit status.
+    assert [a.pk for a in client.get(inbox).context["applications"]] == [elsewhere.pk, loser.pk, winner.pk]
+    assert len(client.get(inbox, {"status": "ALL"}).context["applications"]) == 4
+    assert [a.pk for a in client.get(inbox, {"property": first.pk}).context["applications"]] == [loser.pk, winner.pk]
+
+    client.post(reverse("rentals:application_approve", args=[winner.pk]), {"reject_competing": "1"})
+
+    statuses = dict(Application.objects.values_list("pk", "status"))
+    assert statuses[winner.pk] == "APPROVED"
+    assert statuses[loser.pk] == "REJECTED"
+    assert statuses[elsewhere.pk] == "PENDING"
+    counters = DashboardCounter.objects.filter(landlord=landlord).values("pending_applications").get()
+    assert counters["pending_applications"] == compute()[landlord.pk]["pending_applications"] == 1
+
+
+@pytest.mark.django_db
+def test_bulk_approve_can_reject_competing(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+    prop = Property.objects.create(
+        title="A", address="X", monthly_rent=1200, bedrooms=2, bathrooms=1, sqft=500, landlord=landlord,
+    )
+    chosen = Application.objects.create(rental_property=prop, tenant=tenant, message="a")
+    others = [Application.objects.create(rental_property=prop, tenant=tenant, message=str(i)) for i in range(3)]
+
+    client.login(username="l", password="x")
+    # Rejecting the other applicants is opt-in in both the bulk form and the modal.
+    page = client.get(reverse("rentals:applications")).content.decode()
+    boxes = re.findall(r'<input[^>]*name="reject_competing"[^>]*>', page)
+    assert len(boxes) == 2 and not any("checked" in box for box in boxes)
+
+    body = client.post(
+        reverse("rentals:applications_bulk_approve"),
+        data={"ids": [chosen.pk], "reject_competing": True},
+        content_type="application/json",
+    ).json()
+
+    assert body["approved"] == [chosen.pk]
+    assert body["rejected"] == 3
+    assert not Application.objects.filter(pk__in=[o.pk for o in others]).exclude(status="REJECTED").exists()
+
+
+@pytest.mark.django_db
+def test_lease_dashboard_progress_in_constant_queries(client, django_assert_max_num_queries):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+    apps = []
+    for i in range(5):
+        prop = Property.objects.create(
+            title="Harbor View",
+            address="X",
+            monthly_rent=1000,
+            bedrooms=2,
+            bathrooms=1,
+            sqft=500,
+            landlord=landlord
+        )
+        apps.append(Application.objects.create(rental_property=prop, tenant=tenant, message=str(i)))
+    leases = approve_applications(apps)
+
+    first = leases[-1].payments.order_by("due_date").first()
+    first.status = "PAID"
+    first.save()
+    MaintenanceTicket.objects.create(lease=leases[-1], created_by=tenant, title="Leak", description="d")
+    MaintenanceTicket.objects.create(
+        lease=leases[-1], created_by=tenant, title="Old", description="d", status="RESOLVED",
+    )
+
+    client.login(username="l", password="x")
+    with django_assert_max_num_queries(4):
+        resp = client.get(reverse("rentals:lease_dashboard"))
+
+    assert resp.status_code == 200
+    assert b"Harbor View" in resp.content
+    newest = resp.context["leases"][0]
+    assert newest.pk == leases[-1].pk
+    assert newest.paid_installments == 1
+    assert newest.remaining_installments == newest.months - 1
+    assert newest.open_tickets == 1
+    assert newest.balance.paid == 1000
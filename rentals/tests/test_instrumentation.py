@@ -0,0 +1,39 @@
+import pytest
+from django.urls import reverse
+from django.contrib.auth.models import User
+from prometheus_client import REGISTRY
+from rentals.middleware import QueryBudgetExceeded
+from rentals.models import Property
+
+
+def sample(name, view):
+    return REGISTRY.get_sample_value(name, {"view": view}) or 0
+
+
+@pytest.mark.django_db
+def test_view_metrics_are_recorded(client):
+    before = sample("rentals_view_queries_count", "rentals:listings")
+    client.get(reverse("rentals:listings"))
+    assert sample("rentals_view_queries_count", "rentals:listings") == before + 1
+    assert sample("rentals_view_template_seconds_sum", "rentals:listings") > 0
+
+
+@pytest.mark.django_db
+def test_query_budget_raises(client, settings):
+    landlord = User.objects.create_user("l", password="x")
+    Property.objects.create(
+        title="A",
+        address="X",
+        monthly_rent=1000,
+        bedrooms=2,
+        bathrooms=1,
+        sqft=500,
+        landlord=landlord
+    )
+    settings.QUERY_BUDGETS = {"rentals:listings": {"queries": 1}}
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(reverse("rentals:listings"))
+
+    settings.QUERY_BUDGET_MODE = "log"
+    assert client.get(reverse("rentals:listings")).status_code == 200
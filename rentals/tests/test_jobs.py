@@ -0,0 +1,109 @@
+import pytest
+from datetime import date, timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rentals import jobs
+from rentals.models import Application, Job, Payment, Property, PropertyImage, approve_applications
+from rentals.tests.test_file_uploads import make_jpeg
+
+CALLS = []
+
+
+@jobs.task("test_flaky")
+def flaky(fail_times=0):
+    CALLS.append(fail_times)
+    if len(CALLS) <= fail_times:
+        raise RuntimeError("boom")
+
+
+@jobs.task("test_long")
+def long_running():
+    # Pretend the job has been running for an hour, then report progress.
+    Job.objects.filter(status="RUNNING").update(locked_at=timezone.now() - timedelta(hours=1))
+    jobs.report_progress(step=1)
+    CALLS.append(jobs.requeue_stale())
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+
+
+@pytest.mark.django_db
+def test_jobs_dedupe_retry_with_backoff_and_fail(settings):
+    settings.JOB_RETRY_BASE_SECONDS = 60
+    first = jobs.enqueue("test_flaky", key="k")
+    assert jobs.enqueue("test_flaky", key="k") == first
+    assert Job.objects.count() == 1
+    with pytest.raises(ValueError):
+        jobs.enqueue("no_such_task")
+
+    ok = jobs.enqueue("test_flaky", {"fail_times": 0})
+    assert jobs.run_pending() == 2
+    ok.refresh_from_db()
+    assert ok.status == "DONE" and ok.attempts == 1
+
+    retried = jobs.enqueue("test_flaky", {"fail_times": 5}, max_attempts=2)
+    CALLS.clear()
+    assert jobs.run_pending() == 1
+    retried.refresh_from_db()
+    assert retried.status == "QUEUED" and "boom" in retried.last_error
+    # Backoff: 60s * 2**0 with +/-50% jitter.
+    delay = (retried.run_at - timezone.now()).total_seconds()
+    assert 25 < delay < 95
+    assert jobs.run_pending() == 0  # not due yet
+
+    Job.objects.filter(pk=retried.pk).update(run_at=timezone.now())
+    assert jobs.run_pending() == 1
+    retried.refresh_from_db()
+    assert retried.status == "FAILED" and retried.attempts == 2
+
+    # A job whose worker vanished is put back in the queue.
+    stale = jobs.enqueue("test_flaky")
+    [claimed] = jobs.claim("gone")
+    Job.objects.filter(pk=claimed.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+    assert jobs.requeue_stale() == 1
+    assert Job.objects.get(pk=stale.pk).status == "QUEUED"
+    assert jobs.update_metrics()["QUEUED"] == 1
+
+
+@pytest.mark.django_db
+def test_progress_reports_keep_a_long_job_from_being_requeued():
+    job = jobs.enqueue("test_long")
+    assert jobs.run_pending() == 1
+    assert CALLS == [0]
+    job.refresh_from_db()
+    assert job.status == "DONE" and job.attempts == 1
+    assert job.progress == {"step": 1}
+
+
+@pytest.mark.django_db
+def test_uploads_and_overdue_sweep_run_in_the_worker(client):
+    landlord = User.objects.create_user("l", password="x")
+    landlord.profile.role = "LANDLORD"
+    landlord.profile.save()
+    tenant = User.objects.create_user("t", password="x")
+
+    client.login(username="l", password="x")
+    client.post(reverse("rentals:property_create"), {
+        "title": "House", "address": "X", "monthly_rent": 1000, "bedrooms": 2, "bathrooms": 1,
+        "sqft": 900, "description": "Nice", "images": make_jpeg(),
+    })
+    prop = Property.objects.get()
+    assert PropertyImage.objects.get().variants == {}
+    assert Job.objects.filter(task="generate_image_variants", status="QUEUED").count() == 1
+
+    app = Application.objects.create(rental_property=prop, tenant=tenant, message="m")
+    [lease] = approve_applications([app], start=date.today() - timedelta(days=60))
+    client.get(reverse("rentals:payments"))
+    client.get(reverse("rentals:payments"))
+    assert Job.objects.filter(task="sweep_overdue_payments").count() == 1
+    assert not Payment.objects.filter(status="OVERDUE").exists()
+
+    call_command("run_jobs", "--once", "--concurrency", "1")
+
+    assert set(PropertyImage.objects.get().variants) == {"card", "detail"}
+    assert Payment.objects.filter(lease=lease, status="OVERDUE").count() == 2
+    assert set(Job.objects.values_list("status", flat=True)) == {"DONE"}
@@ -0,0 +1,82 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.models import Property, PropertyImage
+
+
+def make_property(landlord, title="A"):
+    return Property.objects.create(
+        title=title,
+        address="X",
+        monthly_rent=1000,
+        bedrooms=2,
+        bathrooms=1,
+        sqft=500,
+        landlord=landlord
+    )
+
+
+def add_image(prop, name="a.jpg"):
+    return PropertyImage.objects.create(
+        property=prop,
+        image=SimpleUploadedFile(name, b"filecontent", content_type="image/jpeg"),
+    )
+
+
+@pytest.mark.django_db
+def test_image_summary_tracks_creates_and_deletes():
+    landlord = User.objects.create_user("l", password="x")
+    prop = make_property(landlord)
+
+    first = add_image(prop, "one.jpg")
+    add_image(prop, "two.jpg")
+    prop.refresh_from_db()
+    assert prop.image_count == 2
+    assert prop.cover_image.name == first.image.name
+
+    first.delete()
+    prop.refresh_from_db()
+    assert prop.image_count == 1
+    assert prop.cover_image.name != first.image.name
+
+
+@pytest.mark.django_db
+def test_listings_query_count_is_constant(client, django_assert_max_num_queries):
+    landlord = User.objects.create_user("l", password="x")
+    for i in range(10):
+        prop = make_property(landlord, title=f"P{i}")
+        add_image(prop, f"{i}-a.jpg")
+        add_image(prop, f"{i}-b.jpg")
+
+    # page version + properties + prefetched images (cold page cache)
+    with django_assert_max_num_queries(3):
+        resp = client.get(reverse("rentals:listings"))
+    assert resp.status_code == 200
+    assert resp.content.count(b'class="counter-total">2<') == 10
+
+
+@pytest.mark.django_db
+def test_listings_search_filters(client):
+    landlord = User.objects.create_user("l", password="x")
+    cheap = make_property(landlord, title="Cozy studio")
+    cheap.monthly_rent = 600
+    cheap.bedrooms = 1
+    cheap.save()
+    make_property(landlord, title="Family house")
+    Property.objects.create(
+        title="Big loft", address="Harbour street", monthly_rent=2500,
+        bedrooms=3, bathrooms=2, sqft=1400, landlord=landlord,
+    )
+
+    resp = client.get(reverse("rentals:listings_search"), {"max_rent": 1000, "bedrooms": 2})
+    assert [r["title"] for r in resp.json()["results"]] == ["Family house"]
+
+    resp = client.get(reverse("rentals:listings_search"), {"q": "harbour", "min_rent": 2000})
+    assert [r["title"] for r in resp.json()["results"]] == ["Big loft"]
+
+    resp = client.get(reverse("rentals:listings"), {"q": "studio"})
+    assert list(resp.context["properties"]) == [cheap]
+
+    resp = client.get(reverse("rentals:listings_search"), {"min_rent": "abc"})
+    assert resp.status_code == 400
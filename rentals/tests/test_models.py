@@ -1,6 +1,7 @@
 import pytest
 from datetime import date, timedelta
-from rentals.models import Payment, Lease, Application, Property, generate_payment_schedule
+from django.core.management import call_command
+from rentals.models import Payment, Lease, Application, Property, generate_payment_schedule, sweep_overdue_payments
 from django.contrib.auth.models import User
 
 
@@ -79,3 +80,89 @@ def test_generate_payment_schedule_creates_correct_number():
     generate_payment_schedule(lease)
 
     assert lease.payments.count() == lease.months
+
+
+@pytest.mark.django_db
+def test_sweep_overdue_payments_applies_fee_once():
+    user = User.objects.create(username="s")
+    prop = Property.objects.create(
+        title="A",
+        address="X",
+        monthly_rent=1000,
+        bedrooms=2,
+        bathrooms=1,
+        sqft=500,
+        landlord=user
+    )
+
+    app = Application.objects.create(
+        rental_property=prop,
+        tenant=user,
+        message="test"
+    )
+
+    lease = Lease.objects.create(
+        application=app,
+        tenant=user,
+        rental_property=prop,
+        start_date=date.today(),
+        end_date=date.today(),
+        monthly_rent=1000,
+        security_deposit=1000
+    )
+
+    late = Payment.objects.create(lease=lease, due_date=date.today() - timedelta(days=10), amount=1000)
+    grace = Payment.objects.create(lease=lease, due_date=date.today() - timedelta(days=2), amount=1000)
+
+    assert sweep_overdue_payments() == 1
+    call_command("sweep_overdue")  # running again must not add a second fee
+
+    late.refresh_from_db()
+    grace.refresh_from_db()
+    assert late.status == "OVERDUE"
+    assert late.late_fee_applied
+    assert late.amount == 1050
+    assert grace.status == "DUE"
+    assert grace.amount == 1000
+
+
+@pytest.mark.django_db
+def test_expire_leases_deactivates_and_renews():
+    from rentals.counters import compute
+    from rentals.models import DashboardCounter, expire_leases
+
+    landlord = User.objects.create(username="l")
+    tenant = User.objects.create(username="t")
+    def make_lease(end, auto_renew=False):
+        # Active leases on one property can't overlap, so each gets its own.
+        prop = Property.objects.create(
+            title="A", address="X", monthly_rent=1000, bedrooms=2, bathrooms=1, sqft=500, landlord=landlord,
+        )
+        app = Application.objects.create(rental_property=prop, tenant=tenant, message="m", status="APPROVED")
+        return Lease.objects.create(
+            application=app, tenant=tenant, rental_property=prop, start_date=date(2024, 1, 1),
+            end_date=end, monthly_rent=1000, auto_renew=auto_renew,
+        )
+
+    ended = make_lease(date(2024, 12, 1))
+    renewing = make_lease(date(2024, 12, 1), auto_renew=True)
+    running = make_lease(date(2025, 6, 1))
+
+    assert expire_leases(today=date(2025, 1, 15), batch_size=1) == (2, 1)
+    assert expire_leases(today=date(2025, 1, 15)) == (0, 0)
+
+    assert set(Lease.objects.filter(is_active=True).values_list("pk", flat=True)) == {running.pk, renewing.renewal.pk}
+    renewal = renewing.renewal
+    assert renewal.start_date == date(2025, 1, 1)
+    assert renewal.auto_renew and renewal.application is None
+    assert renewal.payments.count() == renewal.months == 12
+    assert not Lease.objects.filter(renewal_of=ended).exists()
+
+    stored = DashboardCounter.objects.filter(landlord=landlord).values("active_leases", "due_payments").get()
+    actual = compute()[landlord.pk]
+    assert stored == {"active_leases": actual["active_leases"], "due_payments": actual["due_payments"]}
+
+    call_command("expire_leases", date="2026-01-15")
+    renewal.refresh_from_db()
+    assert not renewal.is_active
+    assert renewal.renewal.start_date == date(2026, 1, 1)
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from django.utils import timezone
+from rentals import object_cache
+from rentals.models import Property
+from rentals.tests.test_listings import add_image, make_property
+
+
+def lookups(kind, result):
+    return REGISTRY.get_sample_value(
+        "rentals_object_cache_requests_total", {"kind": kind, "result": result},
+    ) or 0
+
+
+@pytest.mark.django_db
+def test_detail_reads_come_from_the_cache_until_the_property_changes(client):
+    landlord = User.objects.create_user("l", password="x")
+    prop = make_property(landlord, title="Before")
+    add_image(prop)
+    api_url = reverse("rentals:api_property_detail", args=[prop.pk])
+    page_url = reverse("rentals:property_detail", args=[prop.pk])
+
+    assert client.get(api_url).json()["title"] == "Before"
+    hits = lookups("property_api", "hit")
+    with CaptureQueriesContext(connection) as ctx:
+        cached = client.get(api_url).json()
+    # Only the generation lookup: the property's updated_at by primary key.
+    assert len(ctx.captured_queries) == 1
+    assert "updated_at" in ctx.captured_queries[0]["sql"]
+    assert len(cached["images"]) == 1
+    assert lookups("property_api", "hit") == hits + 1
+
+    client.login(username="l", password="x")
+    client.get(page_url)
+    with CaptureQueriesContext(connection) as ctx:
+        page = client.get(page_url).content
+    assert b"Before" in page and b"Edit Property" in page
+    assert f'src="{prop.images.get().image.url}"'.encode() in page
+    # The session, the user and the generation lookup; no landlord or image queries.
+    assert sum("rentals_property" in q["sql"] for q in ctx.captured_queries) == 1
+    assert not any("rentals_propertyimage" in q["sql"] for q in ctx.captured_queries)
+    # Plain values only: no Property or landlord User (and password hash) is pickled.
+    cached_page = object_cache.cached("property_detail", prop.pk, lambda: None)
+    assert cached_page["landlord_id"] == landlord.pk and "landlord" not in cached_page
+
+    User.objects.create_user("t", password="x")
+    client.login(username="t", password="x")
+    assert b"Edit Property" not in client.get(page_url).content
+    client.login(username="l", password="x")
+
+    prop.title = "After"
+    prop.save()
+    assert client.get(api_url).json()["title"] == "After"
+    assert b"After" in client.get(page_url).content
+
+    add_image(prop)
+    assert len(client.get(api_url).json()["images"]) == 2
+
+    prop.is_active = False
+    prop.save()
+    assert client.get(api_url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_one_rebuild_per_key_and_no_stale_rebuilds():
+    calls = []
+
+    def slow_build():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"title": "x"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(object_cache.cached("test", 1, slow_build)))
+        for _ in range(5)
+    ]
+    waits = lookups("test", "wait")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"title": "x"}] * 5
+    assert lookups("test", "wait") == waits + 4
+
+    # A value built from rows read before a write is never served afterwards.
+    prop = make_property(User.objects.create_user("l", password="x"))
+
+    def racing_build():
+        Property.objects.filter(pk=prop.pk).update(updated_at=timezone.now())
+        return "stale"
+
+    assert object_cache.cached("test", prop.pk, racing_build) == "stale"
+    assert object_cache.cached("test", prop.pk, lambda: "fresh") == "fresh"
+
+
+@pytest.mark.django_db
+def test_writes_reach_workers_with_their_own_cache(settings):
+    # Each worker process has its own LocMemCache; a write handled by one must
+    # not leave another serving its old copy.
+    def worker(name):
+        settings.CACHES = {
+            **settings.CACHES, "objects": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": name},
+        }
+
+    prop = make_property(User.objects.create_user("l", password="x"), title="Before")
+    worker("a")
+    assert object_cache.cached("test", prop.pk, lambda: "Before") == "Before"
+    worker("b")
+    prop.title = "After"
+    prop.save()
+    worker("a")
+    assert object_cache.cached("test", prop.pk, lambda: "After") == "After"
+
+
+@pytest.mark.django_db
+def test_async_waiters_leave_the_sync_thread_free():
+    cache = object_cache._cache()
+    key, _, locked = object_cache._lookup("test", 3, cache)
+    assert locked  # another worker is rebuilding
+
+    async def main():
+        waiter = asyncio.ensure_future(object_cache.acached("test", 3, lambda: "rebuilt"))
+        await asyncio.sleep(0.1)
+        # Runs on the thread-sensitive sync thread while the waiter polls.
+        await sync_to_async(cache.set)(key, "built elsewhere")
+        return await waiter
+
+    waits = lookups("test", "wait")
+    assert async_to_sync(main)() == "built elsewhere"
+    assert lookups("test", "wait") == waits + 1
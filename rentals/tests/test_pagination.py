@@ -0,0 +1,51 @@
+import pytest
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rentals.models import Property
+
+
+@pytest.fixture
+def properties(db):
+    landlord = User.objects.create_user("l", password="x")
+    return [
+        Property.objects.create(
+            title=f"P{i}",
+            address="X",
+            monthly_rent=1000,
+            bedrooms=2,
+            bathrooms=1,
+            sqft=500,
+            landlord=landlord
+        )
+        for i in range(7)
+    ]
+
+
+def test_cursor_walks_every_listing_once(client, properties):
+    url = reverse("rentals:listings")
+    seen = []
+    params = {"page_size": 3}
+    while True:
+        resp = client.get(url, params)
+        page = resp.context["page"]
+        seen += [p.pk for p in page.items]
+        if not page.has_next:
+            break
+        params["cursor"] = page.next_cursor
+
+    # newest first, each property exactly once
+    assert seen == sorted((p.pk for p in properties), reverse=True)
+
+
+def test_load_more_fragment(client, properties):
+    resp = client.get(reverse("rentals:listings"), {"page_size": 5, "fragment": 1})
+    assert resp.status_code == 200
+    assert b"<html" not in resp.content
+    assert resp.content.count(b'class="property-card"') == 5
+    assert "cursor=" in resp["X-Next-Url"]
+    assert "fragment" not in resp["X-Next-Url"]
+
+
+def test_tampered_cursor_is_rejected(client, properties):
+    resp = client.get(reverse("rentals:listings"), {"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
@@ -0,0 +1,75 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from prometheus_client import REGISTRY
+from rentals.models import Application, Property
+from rentals.routers import STICKY_COOKIE
+
+
+@pytest.fixture
+def replica(settings):
+    # A second connection to the test database stands in for a replica.
+    connections.settings["replica"] = dict(connections["default"].settings_dict)
+    settings.READ_REPLICAS = ["replica"]
+    yield connections["replica"]
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.settings["replica"]
+
+
+def routed(reason, database):
+    return REGISTRY.get_sample_value(
+        "rentals_db_routes_total", {"operation": "read", "database": database, "reason": reason},
+    ) or 0
+
+
+def get(client, url, **params):
+    """Fetches url and returns the number of queries run on (primary, replica)."""
+    with CaptureQueriesContext(connections["default"]) as primary, \
+            CaptureQueriesContext(connections["replica"]) as replica:
+        resp = client.get(url, params)
+        assert resp.status_code == 200
+        if resp.streaming:
+            b"".join(resp.streaming_content)
+    return len(primary), len(replica)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_use_the_replica_until_the_client_writes(client, replica):
+    landlord = User.objects.create_user("l", password="x")
+    User.objects.create_user("t", password="x")
+    prop = Property.objects.create(
+        title="House", address="X", monthly_rent=1000, bedrooms=2, bathrooms=1, sqft=900, landlord=landlord,
+    )
+
+    before = routed("replica", "replica")
+    assert get(client, reverse("rentals:listings"))[0] == 0
+    assert routed("replica", "replica") > before
+
+    # Object cache entries are built from the primary; the generation lookup
+    # (the property's updated_at) is the only query a cached one costs.
+    detail_url = reverse("rentals:api_property_detail", args=[prop.pk])
+    assert get(client, detail_url) == (2, 1)
+    assert get(client, detail_url) == (0, 1)
+
+    client.login(username="t", password="x")
+    primary, on_replica = get(client, reverse("rentals:lease_dashboard"))
+    assert primary and not on_replica  # not a replica view
+
+    resp = client.post(reverse("rentals:apply", args=[prop.pk]), {"message": "Hi"})
+    assert Application.objects.filter(rental_property=prop).exists()
+    assert resp.cookies[STICKY_COOKIE]["max-age"] == 10
+
+    # Reads stick to the primary while the cookie lasts.
+    sticky = routed("sticky", "default")
+    primary, on_replica = get(client, reverse("rentals:property_detail", args=[prop.pk]))
+    assert primary and not on_replica
+    assert routed("sticky", "default") > sticky
+
+    # Exports stream after the view returns and still read from the replica.
+    del client.cookies[STICKY_COOKIE]
+    client.login(username="l", password="x")
+    primary, on_replica = get(client, reverse("rentals:export", args=["leases", "csv"]))
+    assert on_replica and not primary
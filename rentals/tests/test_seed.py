@@ -0,0 +1,37 @@
+import json
+import pytest
+from django.core.management import call_command
+from rentals.counters import compute
+from rentals.models import DashboardCounter, Lease, Payment, Property, PropertyImage
+
+
+@pytest.mark.django_db
+def test_seed_data_is_deterministic_and_consistent():
+    opts = {"landlords": 2, "tenants": 5, "properties": 3, "images": 2, "applications": 2, "lease_ratio": 1.0}
+    call_command("seed_data", prefix="a", **opts)
+    first = list(Property.objects.order_by("pk").values_list("title", "monthly_rent"))
+
+    call_command("seed_data", prefix="b", **opts)
+    second = list(Property.objects.order_by("pk").values_list("title", "monthly_rent"))[len(first):]
+
+    assert first == second
+    assert PropertyImage.objects.count() == 2 * 2 * 3 * 2
+    assert Payment.objects.count() == sum(lease.months for lease in Lease.objects.all())
+    # bulk inserts skip signals, so the command reconciles the counters itself
+    stored = {c.pop("landlord_id"): c for c in DashboardCounter.objects.values()}
+    for landlord_id, totals in compute().items():
+        assert {k: v for k, v in stored[landlord_id].items() if k != "id"} == totals
+
+
+@pytest.mark.django_db
+def test_benchmark_writes_and_checks_baseline(tmp_path):
+    call_command("seed_data", landlords=1, tenants=3, properties=2, images=1, applications=1, lease_ratio=1.0)
+    baseline = tmp_path / "baseline.json"
+
+    call_command("benchmark_views", iterations=1, warmup=0, baseline=str(baseline), write_baseline=True)
+    results = json.loads(baseline.read_text())["results"]
+    assert results["payments:tenant"]["status"] == 200
+    assert results["admin_dashboard:landlord"]["queries"] > 0
+
+    # Generous tolerance: only query-count regressions could fail here.
+    call_command("benchmark_views", iterations=1, warmup=0, baseline=str(baseline), tolerance=100)
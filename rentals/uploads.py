@@ -0,0 +1,71 @@
+"""
+Multi-image ingestion for property_create/property_update.
+
+Files are content-hashed so a photo already attached to the property is
+skipped; (property, content_hash) is unique, and a concurrent upload of the
+same photo loses the insert and has its stored copy removed. Dedup stays
+within one property, so each property owns its files and deleting one never
+touches another's. New files are written to storage in parallel (bounded by
+IMAGE_UPLOAD_WORKERS) and all rows are inserted with one bulk_create, so a
+batch of uploads takes about as long as the slowest write.
+"""
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+from .images import schedule_variants
+from .models import PropertyImage
+
+
+def content_hash(f):
+    digest = hashlib.sha256()
+    for chunk in f.chunks():
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def _store(f):
+    field = PropertyImage._meta.get_field("image")
+    name = field.generate_filename(None, f.name)
+    return field.storage.save(name, f, max_length=field.max_length)
+
+
+def ingest_images(prop, files):
+    """Attaches uploaded files to prop. Returns the PropertyImage rows created."""
+    if not files:
+        return []
+
+    # Deduplicate within the batch first.
+    by_hash = {}
+    for f in files:
+        by_hash.setdefault(content_hash(f), f)
+
+    attached = set(
+        PropertyImage.objects.filter(property=prop, content_hash__in=list(by_hash)).values_list("content_hash", flat=True)
+    )
+    to_write = {h: f for h, f in by_hash.items() if h not in attached}
+    if not to_write:
+        return []
+
+    workers = int(getattr(settings, "IMAGE_UPLOAD_WORKERS", 4))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(to_write)))) as pool:
+        stored = dict(zip(to_write, pool.map(_store, to_write.values())))
+
+    # A concurrent upload may have attached some of these since the check above.
+    PropertyImage.objects.bulk_create(
+        [PropertyImage(property=prop, image=name, content_hash=h) for h, name in stored.items()],
+        ignore_conflicts=True,
+    )
+    created = list(PropertyImage.objects.filter(property=prop, image__in=list(stored.values())).order_by("pk"))
+    lost = set(stored.values()) - {img.image.name for img in created}
+    if lost:
+        storage = PropertyImage._meta.get_field("image").storage
+        transaction.on_commit(lambda: [storage.delete(name) for name in lost])
+
+    # bulk_create skips post_save, so do what the signal handlers would.
+    prop.refresh_image_summary()
+    schedule_variants([img.pk for img in created])
+    return created
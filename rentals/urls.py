@@ -1,14 +1,35 @@
 
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, views
+
+# Under ASGI (ASYNC_VIEWS=1) the read-heavy public views are served by their async versions.
+if settings.ASYNC_VIEWS:
+    from . import async_views
+    reads = {
+        "listings": async_views.listings,
+        "listings_search": async_views.listings_search,
+        "property_detail": async_views.property_detail,
+        "api_properties": async_views.api_property_list,
+        "api_property_detail": async_views.api_property_detail,
+    }
+else:
+    reads = {
+        "listings": views.listings,
+        "listings_search": views.listings_search,
+        "property_detail": views.property_detail,
+        "api_properties": api.property_list,
+        "api_property_detail": api.property_detail,
+    }
 
 app_name = "rentals" 
 
 urlpatterns = [
     
     # Property Browsing 
-    path("", views.listings, name="listings"),
-    path("property/<int:pk>/", views.property_detail, name="property_detail"),
+    path("", reads["listings"], name="listings"),
+    path("search.json", reads["listings_search"], name="listings_search"),
+    path("property/<int:pk>/", reads["property_detail"], name="property_detail"),
 
     path("property/new/", views.property_create, name="property_create"),
 
@@ -17,6 +38,7 @@ urlpatterns = [
 
 
     path("property/<int:pk>/delete/", views.property_delete, name="property_delete"),
+    path("property/<int:pk>/delete/status/", views.property_deletion, name="property_deletion"),
 
 
     # Applications
@@ -25,6 +47,8 @@ urlpatterns = [
 
     path("applications/", views.applications_inbox, name="applications"),
 
+    path("applications/bulk-approve/", views.applications_bulk_approve, name="applications_bulk_approve"),
+
  
     path("application/<int:pk>/approve/", views.application_approve, name="application_approve"),
 
@@ -51,6 +75,17 @@ urlpatterns = [
     path("ticket/<int:pk>/edit/", views.maintenance_update, name="maintenance_update"),
 
 
+    # Exports (payments/leases/tickets as csv or jsonl)
+    path("export/<slug:kind>.<slug:fmt>", views.export_data, name="export"),
+
+
+    # Read-only JSON API
+    path("api/v1/properties/", reads["api_properties"], name="api_properties"),
+    path("api/v1/properties/<int:pk>/", reads["api_property_detail"], name="api_property_detail"),
+    path("api/v1/properties/<int:pk>/availability/", api.property_availability, name="api_property_availability"),
+    path("api/v1/leases/", api.lease_list, name="api_leases"),
+
+
     # Admin Dashboard 
     path("dashboard/", views.admin_dashboard, name="admin_dashboard"),
 ]
@@ -0,0 +1,76 @@
+"""
+Global data versions for conditional GET and the page cache.
+
+Listings and the API property list are validated by the "properties"
+DataVersion row plus the querystring, a primary-key lookup, instead of
+aggregating over every matching property on each request. Any write that can
+change what a property list shows bumps the row in the writer's transaction:
+Property/PropertyImage post_save and post_delete do it here, and the bulk and
+queryset writes that skip those signals call bump() themselves.
+
+Lists filtered by availability (available_from/available_to) also read Lease
+rows, so they are validated by the "leases" row too, which Lease post_save
+and post_delete bump, as do approve_applications and expire_leases.
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import DataVersion, Lease, Property, PropertyImage
+
+
+PROPERTIES = "properties"
+LEASES = "leases"
+
+
+def bump(name=PROPERTIES):
+    """
+    Increments the named version in the caller's transaction. Migration 0022
+    seeds the rows, so this is one UPDATE. That UPDATE holds the row lock
+    until the caller commits, so concurrent writers of the same kind (any
+    landlord's property or image, any lease) queue behind each other's
+    transactions; keep the transactions that call it short.
+    """
+    versions = DataVersion.objects.filter(pk=name)
+    if not versions.update(version=F("version") + 1, updated_at=timezone.now()):
+        # The row was removed (e.g. a flushed table): recreate it, then count
+        # this write, so concurrent first writers still end up distinct.
+        DataVersion.objects.bulk_create([DataVersion(name=name)], ignore_conflicts=True)
+        versions.update(version=F("version") + 1, updated_at=timezone.now())
+
+
+def _combine(names, rows):
+    found = {name: (version, updated_at) for name, version, updated_at in rows}
+    stamps = [found[name][1] for name in names if name in found]
+    return tuple(found.get(name, (0, None))[0] for name in names), max(stamps, default=None)
+
+
+def current(*names):
+    """
+    (versions of names in order, latest updated_at) in one query; names
+    default to PROPERTIES. A row not written yet counts as version 0.
+    """
+    names = names or (PROPERTIES,)
+    return _combine(names, DataVersion.objects.filter(pk__in=names).values_list("name", "version", "updated_at"))
+
+
+async def acurrent(*names):
+    names = names or (PROPERTIES,)
+    qs = DataVersion.objects.filter(pk__in=names).values_list("name", "version", "updated_at")
+    return _combine(names, [row async for row in qs])
+
+
+def properties_changed(sender, **kwargs):
+    bump(PROPERTIES)
+
+
+def leases_changed(sender, **kwargs):
+    bump(LEASES)
+
+
+post_save.connect(properties_changed, sender=Property, dispatch_uid="versions_property_saved")
+post_delete.connect(properties_changed, sender=Property, dispatch_uid="versions_property_deleted")
+post_save.connect(properties_changed, sender=PropertyImage, dispatch_uid="versions_image_saved")
+post_delete.connect(properties_changed, sender=PropertyImage, dispatch_uid="versions_image_deleted")
+post_save.connect(leases_changed, sender=Lease, dispatch_uid="versions_lease_saved")
+post_delete.connect(leases_changed, sender=Lease, dispatch_uid="versions_lease_deleted")
@@ -1,26 +1,145 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Prefetch, Q, Sum
+from django.db.models.functions import Coalesce
+from django.http import Http404, JsonResponse
+from django.core.files.storage import default_storage
+from django.views.decorators.http import require_POST
 from datetime import date
-
-from .models import Property, Application, Lease, Payment, MaintenanceTicket, generate_payment_schedule, PropertyImage
-from .forms import PropertyForm, ApplicationForm, MaintenanceForm, PaymentMarkPaidForm
+import json
+
+from .models import (
+    Property, Application, Lease, Payment, MaintenanceTicket, PropertyImage, DashboardCounter, Job,
+    approve_applications, overdue_candidates, reject_competing_applications,
+)
+from .counters import COUNTER_FIELDS
+from .forms import (
+    PropertyForm, ApplicationForm, ApplicationFilterForm, MaintenanceForm, PaymentMarkPaidForm,
+    PropertySearchForm, ExportFilterForm,
+)
+from .exports import EXPORTS, CONTENT_TYPES, streaming_export
 from .decorators import role_required
+from .search import search_properties
+from .pagination import paginate, render_page
+from .conditional import cache_anonymous_page, data_version, make_etag
+from .uploads import ingest_images
+from .availability import is_overlap_error
+from .jobs import enqueue
+from .deletion import soft_delete_property
+from . import object_cache
 from django.conf import settings
 from django.urls import reverse
 
 
 # Listings 
-def listings(request):
+SEARCH_JSON_LIMIT = 50
+SEARCH_JSON_FIELDS = (
+    "id", "title", "address", "monthly_rent", "bedrooms", "bathrooms", "sqft",
+    "cover_image", "image_count", "created_at",
+)
+DETAIL_PAGE_FIELDS = (
+    "id", "title", "address", "description", "monthly_rent", "bedrooms", "bathrooms", "sqft",
+    "image_count", "landlord_id", "updated_at",
+)
+
+# The listing/detail querysets and validators below are shared with rentals.async_views.
+
+
+def listing_queryset(form):
     # All active properties and sorting by newest first.
-    qs = Property.objects.filter(is_active=True).order_by("-created_at")
-    return render(request, "listings.html", {"properties": qs})
+    # Slider images come from a single prefetch; counts/covers are stored on Property.
+    qs = Property.objects.filter(is_active=True)
+
+    # Search mode kicks in when any filter is present in the query string.
+    if form.is_search():
+        return search_properties(qs, form.cleaned_data)
+    return qs.order_by("-created_at")
+
+
+def with_images(qs):
+    return qs.prefetch_related(Prefetch("images", queryset=PropertyImage.objects.order_by("pk")))
+
+
+def listing_context(form, page):
+    return {"properties": page.items, "page": page, "search_form": form}
+
+
+def detail_version(pk, updated_at):
+    if updated_at is None:
+        raise Http404("No Property matches the given query.")
+    return make_etag("property_detail", pk, updated_at.isoformat()), updated_at
+
+
+def search_results(rows):
+    results = []
+    for row in rows:
+        row["url"] = reverse("rentals:property_detail", args=[row["id"]])
+        row["cover_image"] = default_storage.url(row["cover_image"]) if row["cover_image"] else None
+        results.append(row)
+    return {"results": results}
+
+
+def listings(request):
+    form = PropertySearchForm(request.GET or None)
+    qs = listing_queryset(form)
+
+    def build():
+        page = paginate(request, with_images(qs))
+        return render_page(request, "listings.html", "partials/listing_cards.html", listing_context(form, page))
+
+    # Every property and image write bumps the version (lease writes bump the
+    # leases one, which availability filters add), so this covers the whole page.
+    def version():
+        return data_version("listings", request.GET.urlencode(), leases=form.filters_availability())
+
+    return cache_anonymous_page(request, version, build)
+
+
+def listings_search(request):
+    # JSON variant of the listings search.
+    form = PropertySearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    qs = search_properties(Property.objects.filter(is_active=True), form.cleaned_data)
+    return JsonResponse(search_results(qs.values(*SEARCH_JSON_FIELDS)[:SEARCH_JSON_LIMIT]))
+
+
+def detail_context(pk):
+    """
+    The detail page's property as plain values (None if missing). No model
+    instances, so nothing beyond what the page shows (e.g. the landlord's
+    user row) ends up in the cache.
+    """
+    row = Property.objects.filter(pk=pk, deleted_at__isnull=True).values(*DETAIL_PAGE_FIELDS).first()
+    if row is None:
+        return None
+    row["pk"] = row["id"]
+    images = PropertyImage.objects.filter(property_id=pk).order_by("pk").values("image", "variants")
+    row["images"] = [{"url": default_storage.url(img["image"]), "variants": img["variants"]} for img in images]
+    return row
+
+
+def cached_detail(pk):
+    """The property's detail page context (None if missing), from the object cache."""
+    return object_cache.cached("property_detail", pk, lambda: detail_context(pk))
+
+
+async def acached_detail(pk):
+    return await object_cache.acached("property_detail", pk, lambda: detail_context(pk))
 
 
 def property_detail(request, pk):
-    obj = get_object_or_404(Property, pk=pk)
-    return render(request, "property_detail.html", {"property": obj})
+    obj = cached_detail(pk)
+    if obj is None:
+        raise Http404("No Property matches the given query.")
+
+    def build():
+        return render(request, "property_detail.html", {"property": obj})
+
+    return cache_anonymous_page(request, lambda: detail_version(pk, obj["updated_at"]), build)
 
 
 @login_required
@@ -36,9 +155,8 @@ def property_create(request):
             p.landlord = request.user
             p.save()
 
-            # Looping through uploaded images.
-            for f in files:
-                PropertyImage.objects.create(property=p, image=f)
+            # Stores uploaded images in parallel, skipping duplicates.
+            ingest_images(p, files)
 
             messages.success(request, "Property created successfully.")
             return redirect("rentals:listings")
@@ -52,7 +170,7 @@ def property_create(request):
 @login_required
 @role_required("LANDLORD", "ADMIN")
 def property_update(request, pk):
-    p = get_object_or_404(Property, pk=pk, landlord=request.user)
+    p = get_object_or_404(Property, pk=pk, landlord=request.user, deleted_at__isnull=True)
 
     if request.method == "POST":
         form = PropertyForm(request.POST, request.FILES, instance=p)
@@ -61,9 +179,8 @@ def property_update(request, pk):
         if form.is_valid():
             form.save()  
 
-            # Append newly uploaded images.
-            for f in files:
-                PropertyImage.objects.create(property=p, image=f)
+            # Append newly uploaded images (duplicates are skipped).
+            ingest_images(p, files)
 
             messages.success(request, "Property updated.")
             return redirect("rentals:property_detail", pk=p.pk)
@@ -77,16 +194,27 @@ def property_update(request, pk):
 @login_required
 @role_required("LANDLORD", "ADMIN")
 def property_delete(request, pk):
-    p = get_object_or_404(Property, pk=pk, landlord=request.user)
-    p.delete()
-    messages.info(request, "Property deleted.")
+    p = get_object_or_404(Property, pk=pk, landlord=request.user, deleted_at__isnull=True)
+    # Hidden right away; its leases, payments, images etc. are purged by a background job.
+    soft_delete_property(p)
+    messages.info(request, "Property deleted. Its records are being removed in the background.")
     return redirect("rentals:listings")
 
 
+@login_required
+@role_required("LANDLORD", "ADMIN")
+def property_deletion(request, pk):
+    # Progress of the background purge started by property_delete.
+    job = Job.objects.filter(task="purge_property", key=f"property:{pk}").order_by("-pk").first()
+    if job is None or (not request.user.is_staff and job.payload.get("landlord_id") != request.user.pk):
+        raise Http404("No deletion found for this property.")
+    return JsonResponse({"status": job.status, "progress": job.progress})
+
+
 # Applications 
 @login_required
 def apply_for_property(request, pk):
-    prop = get_object_or_404(Property, pk=pk)
+    prop = get_object_or_404(Property, pk=pk, deleted_at__isnull=True)
     if request.method == "POST":
         form = ApplicationForm(request.POST)
         if form.is_valid():
@@ -110,63 +238,154 @@ def apply_for_property(request, pk):
 @login_required
 @role_required("LANDLORD", "ADMIN")
 def applications_inbox(request):
-    # Getting newest applications first.
+    form = ApplicationFilterForm(request.GET or None)
+
+    # Getting newest applications first, only the columns the rows show.
     qs = (
         Application.objects
         .select_related("rental_property", "tenant")
+        .only(
+            "status", "message", "submitted_at",
+            "rental_property__title", "rental_property__landlord_id", "tenant__username",
+        )
+        .filter(rental_property__deleted_at__isnull=True, **form.filters())
         .order_by("-submitted_at")
     )
 
     # Non-staff landlords should only see their own properties' applications.
+    # Staff filter by property id instead of picking from every property.
+    properties = None
     if not request.user.is_staff:
         qs = qs.filter(rental_property__landlord=request.user)
+        properties = Property.objects.filter(landlord=request.user, deleted_at__isnull=True).order_by("title").values_list("id", "title")
+
+    page = paginate(request, qs)
+    return render_page(
+        request, "applications.html", "partials/application_rows.html",
+        {"applications": page.items, "page": page, "filter_form": form, "properties": properties},
+    )
 
-    for app in qs:
-        app.approve_url = reverse("rentals:application_approve", args=[app.pk])
-        app.reject_url  = reverse("rentals:application_reject",  args=[app.pk])
 
-    return render(request, "applications.html", {"applications": qs})
+LEASE_OVERLAP_MESSAGE = "The property already has an active lease for these dates."
 
 
 @login_required
 @role_required("LANDLORD", "ADMIN")
 @transaction.atomic  
 def application_approve(request, pk):
-    app = get_object_or_404(Application, pk=pk, status="PENDING")
+    # Applications of a property awaiting purge are gone as far as landlords are concerned.
+    app = get_object_or_404(Application, pk=pk, status="PENDING", rental_property__deleted_at__isnull=True)
 
 
     if not request.user.is_staff and app.rental_property.landlord != request.user:
         messages.error(request, "Not allowed.")
         return redirect("rentals:applications")
 
-    # Marking app as approved before generating lease.
-    app.status = "APPROVED"
-    app.save()
+    # Marks the app approved, creates the lease and all monthly payments. The
+    # database refuses a lease overlapping an active one on the same property.
+    try:
+        approve_applications([app])
+    except IntegrityError as exc:
+        if not is_overlap_error(exc):
+            raise
+        messages.error(request, LEASE_OVERLAP_MESSAGE)
+        return redirect("rentals:applications")
+    messages.success(request, "Application approved and lease generated.")
 
-    # Generating lease dates.
-    months = int(getattr(settings, "DEFAULT_LEASE_MONTHS", 12))
-    start = date.today()
-    end_month = (start.month - 1 + (months - 1)) % 12 + 1  
-    end_year = start.year + ((start.month - 1 + (months - 1)) // 12)
-    end_day = min(start.day, 28)  # avoiding 30/31 overflow
-    end = date(end_year, end_month, end_day)
-
-
-    lease = Lease.objects.create(
-        application=app,
-        tenant=app.tenant,
-        rental_property=app.rental_property,
-        start_date=start,
-        end_date=end,
-        monthly_rent=app.rental_property.monthly_rent,
-        security_deposit=app.rental_property.monthly_rent,  # using same as rent
-        is_active=True,
-    )
+    # Optionally closes the other pending applications on the property in one UPDATE.
+    if request.POST.get("reject_competing") == "1":
+        rejected = reject_competing_applications([app.rental_property_id], keep=[app.pk])
+        if rejected:
+            messages.info(request, f"{rejected} competing application(s) rejected.")
+    return redirect("rentals:applications")
 
-    # This generates all monthly payments.
-    generate_payment_schedule(lease)
 
-    messages.success(request, "Application approved and lease generated.")
+@login_required
+@role_required("LANDLORD", "ADMIN")
+@require_POST
+@transaction.atomic
+def applications_bulk_approve(request):
+    # Accepts a form post (ids=1&ids=2) or a JSON body ({"ids": [1, 2]}).
+    is_json = request.content_type == "application/json"
+    if is_json:
+        try:
+            body = json.loads(request.body or b"{}")
+            raw_ids = body.get("ids", [])
+        except (ValueError, AttributeError):
+            return JsonResponse({"error": "Invalid JSON body."}, status=400)
+        if not isinstance(raw_ids, list):
+            return JsonResponse({"error": '"ids" must be a list.'}, status=400)
+        reject_competing = body.get("reject_competing") is True
+    else:
+        raw_ids = request.POST.getlist("ids")
+        reject_competing = request.POST.get("reject_competing") == "1"
+
+    failed = {}
+    ids = []
+    for raw in raw_ids:
+        try:
+            ids.append(int(raw))
+        except (TypeError, ValueError):
+            failed[str(raw)] = "Invalid id."
+
+    found = {
+        app.pk: app
+        for app in Application.objects
+        .select_for_update(of=("self",))
+        .select_related("rental_property")
+        .filter(pk__in=ids, rental_property__deleted_at__isnull=True)
+    }
+
+    to_approve = []
+    for pk in dict.fromkeys(ids):
+        app = found.get(pk)
+        if app is None:
+            failed[str(pk)] = "Not found."
+        elif not request.user.is_staff and app.rental_property.landlord_id != request.user.pk:
+            failed[str(pk)] = "Not allowed."
+        elif app.status != "PENDING":
+            failed[str(pk)] = f"Already {app.get_status_display().lower()}."
+        else:
+            to_approve.append(app)
+
+    try:
+        leases = approve_applications(to_approve)
+    except IntegrityError as exc:
+        if not is_overlap_error(exc):
+            raise
+        # Some property is already leased for these dates (or twice in this
+        # batch): approve one at a time so only the clashing ones fail.
+        leases, approved = [], []
+        for app in to_approve:
+            try:
+                leases += approve_applications([app])
+                approved.append(app)
+            except IntegrityError as exc:
+                if not is_overlap_error(exc):
+                    raise
+                failed[str(app.pk)] = LEASE_OVERLAP_MESSAGE
+        to_approve = approved
+    rejected = 0
+    if reject_competing and to_approve:
+        rejected = reject_competing_applications(
+            {app.rental_property_id for app in to_approve},
+            keep=[app.pk for app in to_approve],
+        )
+
+    if is_json:
+        return JsonResponse({
+            "approved": [app.pk for app in to_approve],
+            "leases": [lease.pk for lease in leases],
+            "rejected": rejected,
+            "failed": failed,
+        })
+
+    if to_approve:
+        messages.success(request, f"{len(to_approve)} application(s) approved and leases generated.")
+    if rejected:
+        messages.info(request, f"{rejected} competing application(s) rejected.")
+    for pk, reason in failed.items():
+        messages.error(request, f"Application {pk}: {reason}")
     return redirect("rentals:applications")
 
 
@@ -174,7 +393,7 @@ def application_approve(request, pk):
 @role_required("LANDLORD", "ADMIN")
 def application_reject(request, pk):
 
-    app = get_object_or_404(Application, pk=pk, status="PENDING")
+    app = get_object_or_404(Application, pk=pk, status="PENDING", rental_property__deleted_at__isnull=True)
 
     if not request.user.is_staff and app.rental_property.landlord != request.user:
         messages.error(request, "Not allowed.")
@@ -187,42 +406,83 @@ def application_reject(request, pk):
     return redirect("rentals:applications")
 
 
+# Role scoping shared by the list views and the exports.
+def _scoped_leases(user):
+    qs = Lease.objects.select_related("tenant", "rental_property").filter(rental_property__deleted_at__isnull=True)
+    if user.is_staff:
+        return qs.all()
+    profile = user.profile  # roles stored here
+    if profile.role == "LANDLORD":
+        return qs.filter(rental_property__landlord=user)
+    return qs.filter(tenant=user)
+
+
+def _scoped_payments(user):
+    qs = (
+        Payment.objects.select_related("lease", "lease__tenant", "lease__rental_property")
+        .filter(lease__rental_property__deleted_at__isnull=True)
+    )
+    if user.is_staff:
+        return qs.all()
+    if user.profile.role == "LANDLORD":
+        return qs.filter(lease__rental_property__landlord=user)
+    return qs.filter(lease__tenant=user)
+
+
+def _scoped_tickets(user):
+    qs = (
+        MaintenanceTicket.objects.select_related("lease", "lease__tenant", "lease__rental_property")
+        .filter(lease__rental_property__deleted_at__isnull=True)
+    )
+    if user.is_staff:
+        return qs.all()
+    if user.profile.role == "LANDLORD":
+        return qs.filter(lease__rental_property__landlord=user)
+    return qs.filter(lease__tenant=user)
+
+
 # Lease & Payments
 @login_required
 def lease_dashboard(request):
+    # One grouped query per page: installment and ticket counts are annotated,
+    # money totals (arrears, late fees) come from the joined balance row.
+    leases = (
+        _scoped_leases(request.user)
+        .select_related("balance")
+        .annotate(
+            paid_installments=Count("payments", filter=Q(payments__status="PAID"), distinct=True),
+            remaining_installments=Count(
+                "payments", filter=Q(payments__status__in=["DUE", "OVERDUE"]), distinct=True,
+            ),
+            open_tickets=Count("tickets", filter=Q(tickets__status__in=["OPEN", "IN_PROGRESS"]), distinct=True),
+        )
+    )
 
-    if request.user.is_staff:
-        leases = Lease.objects.select_related("tenant", "rental_property").all()
-    else:
-        profile = request.user.profile  # roles stored here
-        if profile.role == "LANDLORD":
-            leases = Lease.objects.filter(rental_property__landlord=request.user)
-        else:
-            leases = Lease.objects.filter(tenant=request.user)
-
-    return render(request, "lease_dashboard.html", {"leases": leases})
+    page = paginate(request, leases.order_by("-created_at"))
+    return render_page(
+        request, "lease_dashboard.html", "partials/lease_cards.html",
+        {"leases": page.items, "page": page},
+    )
 
 
 @login_required
 def payment_list(request):
-    
-    for p in Payment.objects.all():
-        p.apply_overdue_logic()
+    qs = _scoped_payments(request.user)
 
-    
-    if request.user.is_staff:
-        qs = Payment.objects.select_related("lease", "lease__tenant", "lease__rental_property").all()
-    else:
-        profile = request.user.profile
-        if profile.role == "LANDLORD":
-            qs = Payment.objects.filter(lease__rental_property__landlord=request.user)
-        else:
-            qs = Payment.objects.filter(lease__tenant=request.user)
+    # Marking overdue payments (and charging late fees) runs in the job
+    # worker; the request only checks whether there is anything to mark.
+    if overdue_candidates(qs).exists():
+        enqueue("sweep_overdue_payments", key="all")
 
-    return render(request, "payments.html", {"payments": qs})
+    page = paginate(request, qs.order_by("due_date"))
+    return render_page(
+        request, "payments.html", "partials/payment_rows.html",
+        {"payments": page.items, "page": page},
+    )
 
 
 @login_required
+@transaction.atomic
 def payment_mark_paid(request, pk):
     
     payment = get_object_or_404(Payment, pk=pk)
@@ -256,17 +516,13 @@ def payment_mark_paid(request, pk):
 # Maintenance 
 @login_required
 def maintenance_list(request):
-    
-    if request.user.is_staff:
-        qs = MaintenanceTicket.objects.select_related("lease", "lease__tenant", "lease__rental_property").all()
-    else:
-        profile = request.user.profile
-        if profile.role == "LANDLORD":
-            qs = MaintenanceTicket.objects.filter(lease__rental_property__landlord=request.user)
-        else:
-            qs = MaintenanceTicket.objects.filter(lease__tenant=request.user)
+    qs = _scoped_tickets(request.user)
 
-    return render(request, "maintenance_list.html", {"tickets": qs})
+    page = paginate(request, qs.order_by("-created_at"))
+    return render_page(
+        request, "maintenance_list.html", "partials/ticket_rows.html",
+        {"tickets": page.items, "page": page},
+    )
 
 
 @login_required
@@ -323,23 +579,49 @@ def maintenance_update(request, pk):
     return render(request, "maintenance_form.html", {"form": form, "ticket": t})
 
 
+# Exports
+@login_required
+def export_data(request, kind, fmt):
+    if kind not in EXPORTS or fmt not in CONTENT_TYPES:
+        raise Http404("Unknown export.")
+
+    form = ExportFilterForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    scoped = {
+        "payments": _scoped_payments,
+        "leases": _scoped_leases,
+        "tickets": _scoped_tickets,
+    }[kind](request.user)
+
+    return streaming_export(kind, fmt, scoped, form.cleaned_data["start"], form.cleaned_data["end"])
+
+
 # Admin Dashboard
 @login_required
 @role_required("LANDLORD", "ADMIN")
 def admin_dashboard(request):
 
-    total_props = Property.objects.count()
-    pending_apps = Application.objects.filter(status="PENDING").count()
-    active_leases = Lease.objects.filter(is_active=True).count()
-    due_payments = Payment.objects.filter(status__in=["DUE", "OVERDUE"]).count()
-    open_tickets = MaintenanceTicket.objects.filter(status__in=["OPEN", "IN_PROGRESS"]).count()
+    # One indexed lookup: the landlord's own counter row, or the sum of all rows for staff.
+    if request.user.is_staff:
+        totals = DashboardCounter.objects.aggregate(
+            **{field: Coalesce(Sum(field), 0) for field in COUNTER_FIELDS}
+        )
+    else:
+        totals = (
+            DashboardCounter.objects
+            .filter(landlord=request.user)
+            .values(*COUNTER_FIELDS)
+            .first()
+        ) or dict.fromkeys(COUNTER_FIELDS, 0)
 
     context = {
-        "total_props": total_props,
-        "pending_apps": pending_apps,
-        "active_leases": active_leases,
-        "due_payments": due_payments,
-        "open_tickets": open_tickets,
+        "total_props": totals["total_properties"],
+        "pending_apps": totals["pending_applications"],
+        "active_leases": totals["active_leases"],
+        "due_payments": totals["due_payments"],
+        "open_tickets": totals["open_tickets"],
     }
 
     return render(request, "admin_dashboard.html", context)